@@ -0,0 +1,115 @@
+from collections import OrderedDict
+from PyQt6.QtCore import Qt, QTimer, pyqtSignal
+from PyQt6.QtGui import QStandardItem, QStandardItemModel
+from PyQt6.QtWidgets import QCompleter, QLineEdit
+from database import DatabaseManager
+from async_query import AsyncQueryExecutor
+from event_bus import EventBus
+from config import SECICI_BEKLEME_MS, SECICI_ONBELLEK_BOYUTU
+
+class AnimalPicker(QLineEdit):
+    """Küpe numarası yazıldıkça eşleşen hayvanları öneren seçici.
+
+    Sürü listeye yüklenmez: yazma durunca en fazla SECICI_EN_FAZLA_SONUC
+    eşleşme DatabaseManager.find_animals ile arka planda okunur ve
+    QCompleter ile önerilir; son aramaların sonuçları hayvanlar tablosu
+    değişene kadar saklanır. Hayvan, öneri listeden seçildiğinde ya da
+    yazılan küpe bir eşleşmeyle aynı olduğunda seçilmiş olur.
+    """
+
+    # Seçilen hayvanın id'si; seçim kalkınca None
+    selection_changed = pyqtSignal(object)
+
+    def __init__(self, condition='1', parent=None):
+        """condition önerilecek hayvanları süzen SQL koşuludur (queries.DISI_KOSULU gibi)"""
+        super().__init__(parent)
+        self.condition = condition
+        self.executor = AsyncQueryExecutor.instance()
+        self._selected = None
+        self._ids = {}  # önerilen küpe -> hayvan id
+        self._cache = OrderedDict()  # arama metni -> satırlar, en son kullanılan sonda
+        self.setPlaceholderText("Küpe numarası yazın...")
+        self.setClearButtonEnabled(True)
+
+        # Süzme veritabanında yapıldığından öneriler olduğu gibi gösterilir
+        self.matches = QStandardItemModel(self)
+        completer = QCompleter(self.matches, self)
+        completer.setCompletionMode(QCompleter.CompletionMode.UnfilteredPopupCompletion)
+        completer.activated.connect(self._chosen)
+        self.setCompleter(completer)
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(SECICI_BEKLEME_MS)
+        self.timer.timeout.connect(self._search)
+        self.textEdited.connect(self._edited)
+        EventBus.instance().table_changed.connect(self._table_changed)
+
+    def selected_id(self):
+        """Seçili hayvanın id'sini, seçim yoksa None döndürür"""
+        return self._selected
+
+    def clear_selection(self):
+        """Yazılan metni ve seçimi temizler"""
+        self.timer.stop()
+        self.executor.cancel((id(self), 'ara'))
+        self.clear()
+        self.matches.clear()
+        self._select(None)
+
+    def _select(self, row_id):
+        if row_id != self._selected:
+            self._selected = row_id
+            self.selection_changed.emit(row_id)
+
+    def _edited(self, text):
+        # Elle değiştirilen metin önceki seçimi geçersiz kılar
+        self._select(None)
+        self.timer.start()
+
+    def _search(self):
+        text = self.text().strip()
+        if not text:
+            self.executor.cancel((id(self), 'ara'))
+            self._show(text, [])
+            return
+        rows = self._cache.get(text)
+        if rows is not None:
+            self._cache.move_to_end(text)
+            self._show(text, rows)
+            return
+        self.executor.submit((id(self), 'ara'), DatabaseManager.find_animals, text, self.condition,
+                             on_result=lambda rows: self._loaded(text, rows))
+
+    def _loaded(self, text, rows):
+        if rows is None:
+            return
+        self._cache[text] = rows
+        if len(self._cache) > SECICI_ONBELLEK_BOYUTU:
+            self._cache.popitem(last=False)
+        if text == self.text().strip():
+            self._show(text, rows)
+
+    def _show(self, text, rows):
+        self.matches.clear()
+        self._ids = {}
+        for row in rows:
+            item = QStandardItem(row['kulak_kupesi'])
+            item.setData(row['id'], Qt.ItemDataRole.UserRole)
+            self.matches.appendRow(item)
+            self._ids[row['kulak_kupesi']] = row['id']
+        exact = [row['id'] for row in rows if row['kulak_kupesi'].casefold() == text.casefold()]
+        if exact:
+            self._select(exact[0])
+        if rows and self.hasFocus():
+            self.completer().complete()
+        else:
+            self.completer().popup().hide()
+
+    def _chosen(self, text):
+        self._select(self._ids.get(text))
+
+    def _table_changed(self, change):
+        # Eklenen, silinen ya da cinsiyeti/durumu değişen hayvanlar önceki sonuçları bozar
+        if change.table == 'hayvanlar':
+            self._cache.clear()
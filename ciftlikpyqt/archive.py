@@ -0,0 +1,268 @@
+import os
+import sys
+import threading
+from datetime import date, timedelta
+from config import ARSIV_UFKU_GUN
+from database import DatabaseManager, get_pool
+from migrations import SEARCH_TABLES
+
+# Arşiv dosyası bağlantılara bu şema adıyla bağlanır
+ARCHIVE_SCHEMA = 'arsiv'
+
+# Arşive taşınabilen tablolar ve arşivdeki en yeni kaydı belirleyen tarih sütunu
+ARCHIVED_TABLES = {
+    'hayvanlar': 'dogum_tarihi',
+    'hayvan_ozet': None,
+    'tohumlama': 'tohumlama_tarihi',
+    'gebelik': 'tespit_tarihi',
+    'dogum': 'dogum_tarihi',
+    'saglik': 'islem_tarihi',
+}
+
+# Arşiv arama dizininin (arsiv.arama) sütunlarının kaynak tablolardaki karşılıkları;
+# dizin ana dizinle aynı rowid düzenini kullanır (kaynak id * 4 + tablo kodu)
+SEARCH_COLUMNS = {
+    'hayvanlar': {'notlar': 'notlar'},
+    'saglik': {'notlar': 'notlar', 'islem': 'islem_adi', 'ilac': 'ilac_bilgisi'},
+    'tohumlama': {'notlar': 'notlar', 'boga': 'boga_bilgisi'},
+    'gebelik': {'notlar': 'notlar'},
+}
+
+# Veritabanı başına (arşiv dosyasının damgası, tablo -> (satır sayısı, en yeni tarih))
+_bounds = {}
+_bounds_lock = threading.Lock()
+
+# (veritabanı, tablo) -> source() birleşiminde kullanılan sütun listesi
+_source_columns = {}
+
+def archive_path(database):
+    """Veritabanı dosyasının yanındaki arşiv dosyasının yolunu döndürür"""
+    root, ext = os.path.splitext(database)
+    return f"{root}_arsiv{ext or '.db'}"
+
+def _columns(conn, schema, table):
+    return [row[1] for row in conn.execute(f'PRAGMA {schema}.table_info({table})')]
+
+def _sync_schema(conn, database):
+    """Arşivde eksik tabloları ana şemadan kopyalar, eksik sütunları ekler"""
+    for table in ARCHIVED_TABLES:
+        main_columns = _columns(conn, 'main', table)
+        with _bounds_lock:
+            _source_columns[(database, table)] = ', '.join(main_columns)
+        archive_columns = _columns(conn, ARCHIVE_SCHEMA, table)
+        if not archive_columns:
+            sql = conn.execute("SELECT sql FROM main.sqlite_master WHERE type = 'table' AND name = ?",
+                               (table,)).fetchone()[0]
+            conn.execute(sql.replace(f'CREATE TABLE {table}', f'CREATE TABLE {ARCHIVE_SCHEMA}.{table}', 1)
+                            .replace(f'CREATE TABLE IF NOT EXISTS {table}',
+                                     f'CREATE TABLE IF NOT EXISTS {ARCHIVE_SCHEMA}.{table}', 1))
+            if table != 'hayvan_ozet':
+                key = 'id' if table in ('hayvanlar', 'dogum') else 'hayvan_id'
+                conn.execute(f'CREATE INDEX IF NOT EXISTS {ARCHIVE_SCHEMA}.idx_{table}_{key} ON {table} ({key})')
+            continue
+        for column in main_columns:
+            if column not in archive_columns:
+                conn.execute(f'ALTER TABLE {ARCHIVE_SCHEMA}.{table} ADD COLUMN {column}')
+    conn.execute(f'''
+        CREATE TABLE IF NOT EXISTS {ARCHIVE_SCHEMA}.arsiv_bilgi (
+            tablo TEXT PRIMARY KEY,
+            satir_sayisi INTEGER NOT NULL,
+            en_yeni_tarih DATE
+        )
+    ''')
+    exists = conn.execute(f"SELECT 1 FROM {ARCHIVE_SCHEMA}.sqlite_master WHERE type = 'table' AND name = 'arama'")
+    if exists.fetchone() is None:
+        sql = conn.execute("SELECT sql FROM main.sqlite_master WHERE type = 'table' AND name = 'arama'").fetchone()[0]
+        conn.execute(sql.replace('CREATE VIRTUAL TABLE IF NOT EXISTS arama',
+                                 f'CREATE VIRTUAL TABLE IF NOT EXISTS {ARCHIVE_SCHEMA}.arama', 1)
+                        .replace('CREATE VIRTUAL TABLE arama', f'CREATE VIRTUAL TABLE {ARCHIVE_SCHEMA}.arama', 1))
+        # Dizinden önce oluşturulmuş arşivlerdeki kayıtlar da aranabilsin
+        for code, table in enumerate(SEARCH_TABLES):
+            columns = SEARCH_COLUMNS[table]
+            conn.execute(f'''
+                INSERT INTO {ARCHIVE_SCHEMA}.arama (rowid, {', '.join(columns)})
+                SELECT id * 4 + {code}, {', '.join(columns.values())} FROM {ARCHIVE_SCHEMA}.{table}
+            ''')
+        _record_search_count(conn)
+
+def _record_search_count(conn):
+    conn.execute(f'''
+        INSERT OR REPLACE INTO {ARCHIVE_SCHEMA}.arsiv_bilgi (tablo, satir_sayisi, en_yeni_tarih)
+        SELECT 'arama', COUNT(*), NULL FROM {ARCHIVE_SCHEMA}.arama
+    ''')
+
+def _archive_stamp(path):
+    """Arşiv dosyasının (ve varsa WAL dosyasının) değişiklik zamanı ve boyutu; dosya yoksa None"""
+    stamp = []
+    for name in (path, f'{path}-wal'):
+        try:
+            info = os.stat(name)
+        except FileNotFoundError:
+            if name == path:
+                return None
+            continue
+        stamp.append((info.st_mtime_ns, info.st_size))
+    return tuple(stamp)
+
+def _load_bounds(conn, database):
+    rows = conn.execute(f'SELECT tablo, satir_sayisi, en_yeni_tarih FROM {ARCHIVE_SCHEMA}.arsiv_bilgi').fetchall()
+    stamp = _archive_stamp(archive_path(database))
+    with _bounds_lock:
+        _bounds[database] = (stamp, {row[0]: (row[1], row[2]) for row in rows})
+
+def enable_archive():
+    """Etkin veritabanının arşiv dosyası varsa havuza bağlar; bağlandıysa True döndürür.
+
+    Sınırlar arşiv dosyasının damgasıyla saklanır; dosya sonradan başka bir
+    süreçte (archive.py, komut satırı) oluşturulur ya da değişirse yeniden okunur.
+    """
+    pool = get_pool()
+    path = archive_path(pool.database)
+    stamp = _archive_stamp(path)
+    with _bounds_lock:
+        cached = _bounds.get(pool.database)
+        if cached is not None and cached[0] == stamp:
+            return stamp is not None and pool.attached(ARCHIVE_SCHEMA) is not None
+    if stamp is None:
+        with _bounds_lock:
+            _bounds[pool.database] = (None, {})
+        return False
+    pool.attach(ARCHIVE_SCHEMA, path)
+    with pool.connection() as conn:
+        _sync_schema(conn, pool.database)
+        conn.commit()
+        _load_bounds(conn, pool.database)
+    return True
+
+def needs_archive(table, since=None):
+    """Sorgunun table için arşivi de okuması gerekip gerekmediğini döndürür.
+
+    since verilirse (YYYY-MM-DD) yalnızca arşivde bu tarihten yeni ya da
+    aynı günlü kayıt varsa True döner; arşiv yoksa ya da boşsa her zaman False.
+    """
+    enable_archive()
+    with _bounds_lock:
+        bounds = _bounds.get(get_pool().database, (None, {}))[1].get(table)
+    if not bounds or not bounds[0]:
+        return False
+    latest = bounds[1]
+    return since is None or latest is None or str(since) <= latest
+
+def source(table, include_archive):
+    """FROM/JOIN içinde kullanılacak kaynağı döndürür: tablo adı ya da ana ve arşiv birleşimi"""
+    if not include_archive:
+        return table
+    database = get_pool().database
+    with _bounds_lock:
+        columns = _source_columns.get((database, table))
+    if columns is None:
+        with get_pool().connection() as conn:
+            columns = ', '.join(_columns(conn, 'main', table))
+        with _bounds_lock:
+            _source_columns[(database, table)] = columns
+    return (f'(SELECT {columns} FROM main.{table} '
+            f'UNION ALL SELECT {columns} FROM {ARCHIVE_SCHEMA}.{table})')
+
+def archive_old_records(horizon_days=ARSIV_UFKU_GUN):
+    """Etkin olmayan hayvanları ve ufuktan eski sağlık geçmişini arşive taşır.
+
+    Etkin olmayan bir hayvan, ufuktan sonra hiçbir kaydı yoksa ve ana
+    tabloda kalan bir hayvanın atası değilse tüm geçmişiyle taşınır;
+    böylece soy sorguları arşive hiç ihtiyaç duymaz. Etkin hayvanların
+    ufuktan eski sağlık kayıtları da taşınır, maliyetleri hayvan_ozet'te
+    kalır. Taşınan kayıtların arama dizini satırları arşivin kendi arama
+    dizinine geçer. Tablo başına taşınan satır sayısını döndürür.
+    """
+    pool = get_pool()
+    pool.attach(ARCHIVE_SCHEMA, archive_path(pool.database))
+    cutoff = (date.today() - timedelta(days=horizon_days)).isoformat()
+    moved = {}
+
+    with pool.connection() as conn:
+        # ATTACH ve şema eşitlemesi işlem dışında yapılır
+        _sync_schema(conn, pool.database)
+        conn.commit()
+
+        # Yardımcı tablolar ve arşiv yazmaları değişiklik olayı üretmesin diye
+        # doğrudan bağlantıda çalıştırılır; ana tablolardaki silmeler kaydedilir
+        with DatabaseManager.transaction() as tx:
+            tx.conn.execute('DROP TABLE IF EXISTS temp.arsiv_hayvan')
+            tx.conn.execute('''
+                CREATE TEMP TABLE arsiv_hayvan AS
+                WITH RECURSIVE aday(id) AS (
+                    SELECT h.id FROM hayvanlar h
+                    WHERE h.durum != 'Aktif' AND h.dogum_tarihi < :sinir
+                    AND NOT EXISTS (SELECT 1 FROM saglik WHERE hayvan_id = h.id AND islem_tarihi >= :sinir)
+                    AND NOT EXISTS (SELECT 1 FROM tohumlama WHERE hayvan_id = h.id AND tohumlama_tarihi >= :sinir)
+                    AND NOT EXISTS (SELECT 1 FROM gebelik WHERE hayvan_id = h.id AND tespit_tarihi >= :sinir)
+                ),
+                -- Ana tabloda kalan hayvanların tüm ataları da ana tabloda kalır
+                kalan(id) AS (
+                    SELECT id FROM hayvanlar WHERE id NOT IN aday
+                    UNION
+                    SELECT p.ebeveyn FROM kalan k
+                    JOIN (SELECT id, anne_id AS ebeveyn FROM hayvanlar WHERE anne_id IS NOT NULL
+                          UNION ALL
+                          SELECT id, baba_id FROM hayvanlar WHERE baba_id IS NOT NULL) p ON p.id = k.id
+                )
+                SELECT id FROM aday WHERE id NOT IN kalan
+            ''', {'sinir': cutoff})
+
+            # Etkin hayvanların taşınan sağlık maliyetleri özet tabloya geri eklenecek
+            tx.conn.execute('DROP TABLE IF EXISTS temp.arsiv_maliyet')
+            tx.conn.execute('''
+                CREATE TEMP TABLE arsiv_maliyet AS
+                SELECT hayvan_id, SUM(COALESCE(maliyet, 0)) AS toplam FROM saglik
+                WHERE islem_tarihi < ? AND hayvan_id NOT IN (SELECT id FROM temp.arsiv_hayvan)
+                GROUP BY hayvan_id
+            ''', (cutoff,))
+
+            conditions = [
+                ('hayvan_ozet', 'hayvan_id IN (SELECT id FROM temp.arsiv_hayvan)', ()),
+                ('dogum', 'gebelik_id IN (SELECT id FROM main.gebelik WHERE hayvan_id IN '
+                          '(SELECT id FROM temp.arsiv_hayvan))', ()),
+                ('gebelik', 'hayvan_id IN (SELECT id FROM temp.arsiv_hayvan)', ()),
+                ('tohumlama', 'hayvan_id IN (SELECT id FROM temp.arsiv_hayvan)', ()),
+                ('saglik', 'hayvan_id IN (SELECT id FROM temp.arsiv_hayvan) OR islem_tarihi < ?', (cutoff,)),
+                ('hayvanlar', 'id IN (SELECT id FROM temp.arsiv_hayvan)', ()),
+            ]
+            for table, condition, parameters in conditions:
+                columns = ', '.join(_columns(tx.conn, 'main', table))
+                tx.conn.execute(f'INSERT OR REPLACE INTO {ARCHIVE_SCHEMA}.{table} ({columns}) '
+                                 f'SELECT {columns} FROM main.{table} WHERE {condition}', parameters)
+                if table in SEARCH_TABLES:
+                    # Silme tetikleyicisi ana dizindeki satırı kaldırmadan önce arşiv dizinine kopyalanır
+                    rowids = (f'SELECT id * 4 + {SEARCH_TABLES.index(table)} '
+                              f'FROM main.{table} WHERE {condition}')
+                    search_columns = ', '.join(_columns(tx.conn, 'main', 'arama'))
+                    tx.conn.execute(f'DELETE FROM {ARCHIVE_SCHEMA}.arama WHERE rowid IN ({rowids})', parameters)
+                    tx.conn.execute(f'INSERT INTO {ARCHIVE_SCHEMA}.arama (rowid, {search_columns}) '
+                                     f'SELECT rowid, {search_columns} FROM main.arama WHERE rowid IN ({rowids})',
+                                     parameters)
+                moved[table] = tx.conn.execute(f'DELETE FROM main.{table} WHERE {condition}', parameters).rowcount
+                if table != 'hayvan_ozet':
+                    tx.pool.record_write(table, 'delete')
+
+            tx.conn.execute('''
+                UPDATE hayvan_ozet SET saglik_maliyeti = saglik_maliyeti +
+                    (SELECT toplam FROM temp.arsiv_maliyet m WHERE m.hayvan_id = hayvan_ozet.hayvan_id)
+                WHERE hayvan_id IN (SELECT hayvan_id FROM temp.arsiv_maliyet)
+            ''')
+
+            for table, date_column in ARCHIVED_TABLES.items():
+                latest = f'MAX({date_column})' if date_column else 'NULL'
+                tx.conn.execute(f'''
+                    INSERT OR REPLACE INTO {ARCHIVE_SCHEMA}.arsiv_bilgi (tablo, satir_sayisi, en_yeni_tarih)
+                    SELECT ?, COUNT(*), {latest} FROM {ARCHIVE_SCHEMA}.{table}
+                ''', (table,))
+            _record_search_count(tx.conn)
+            tx.conn.execute('DROP TABLE temp.arsiv_hayvan')
+            tx.conn.execute('DROP TABLE temp.arsiv_maliyet')
+
+        _load_bounds(conn, pool.database)
+    return moved
+
+if __name__ == '__main__':
+    ufuk = int(sys.argv[1]) if len(sys.argv) > 1 else ARSIV_UFKU_GUN
+    sonuc = archive_old_records(ufuk)
+    print(f"Arşive taşınan kayıtlar ({archive_path(get_pool().database)}): {sonuc}")
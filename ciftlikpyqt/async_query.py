@@ -0,0 +1,195 @@
+import threading
+from itertools import count, islice
+from PyQt6 import sip
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal, pyqtSlot
+from config import DB_HAVUZ_BOYUTU, SORGU_PARCA_BOYUTU
+from database import DatabaseManager, get_pool, use_pool
+from profiling import profiler
+
+class _TaskSignals(QObject):
+    """İş parçacığından ana iş parçacığına sonuç taşıyan sinyaller"""
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(object)
+    batch = pyqtSignal(object, object, bool)
+
+class QueryTask(QRunnable):
+    """Verilen fonksiyonu QThreadPool üzerinde çalıştıran görev"""
+
+    def __init__(self, key, token, fn, args, kwargs, on_result, on_error):
+        super().__init__()
+        self.key = key
+        self.token = token
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.on_result = on_result
+        self.on_error = on_error
+        self.result = None
+        self.error = None
+        self.cancelled = threading.Event()
+        self.signals = _TaskSignals()
+        # Sorgu profilinde görev, gönderildiği yere yazılır
+        self.site = profiler.current_site() if profiler.enabled else None
+        # Görev, gönderildiği andaki çiftliğin havuzunda çalışır
+        self.pool = get_pool()
+
+    def run(self):
+        with profiler.attributed_to(self.site), use_pool(self.pool):
+            self._run()
+
+    def _run(self):
+        if self.cancelled.is_set():
+            return
+        try:
+            self.result = self.fn(*self.args, **self.kwargs)
+        except Exception as e:
+            self.error = e
+            if not self.cancelled.is_set():
+                self.signals.failed.emit(self)
+            return
+        if not self.cancelled.is_set():
+            self.signals.finished.emit(self)
+
+class StreamTask(QueryTask):
+    """Sonuçları parça parça arayüze ileten görev.
+
+    fn bir iterable döndürmelidir; iptal edilen görev bir sonraki parçayı
+    okumadan durur. İlk parça (boş olsa bile) first=True ile gönderilir.
+    """
+
+    def __init__(self, key, token, fn, args, kwargs, on_batch, on_error, batch_size):
+        super().__init__(key, token, fn, args, kwargs, None, on_error)
+        self.on_batch = on_batch
+        self.batch_size = batch_size
+
+    def _run(self):
+        if self.cancelled.is_set():
+            return
+        try:
+            iterator = iter(self.fn(*self.args, **self.kwargs))
+            first = True
+            while not self.cancelled.is_set():
+                rows = list(islice(iterator, self.batch_size))
+                if rows or first:
+                    self.signals.batch.emit(self, rows, first)
+                first = False
+                if len(rows) < self.batch_size:
+                    break
+            # Üreteci kapatarak bağlantının havuza dönmesini sağla
+            close = getattr(iterator, 'close', None)
+            if close is not None:
+                close()
+        except Exception as e:
+            self.error = e
+            if not self.cancelled.is_set():
+                self.signals.failed.emit(self)
+            return
+        if not self.cancelled.is_set():
+            self.signals.finished.emit(self)
+
+class AsyncQueryExecutor(QObject):
+    """Veritabanı işlerini arayüz iş parçacığı dışında çalıştırır.
+
+    Her istek bir anahtarla gönderilir; aynı anahtarla yeni bir istek
+    geldiğinde önceki istek iptal edilir ve sonucu arayüze ulaşmaz.
+    """
+
+    _instance = None
+
+    @classmethod
+    def instance(cls):
+        """Uygulama genelinde paylaşılan yürütücüyü döndürür"""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.thread_pool = QThreadPool(self)
+        # Arayüzdeki kayıt işlemleri için havuzda bir bağlantı boş bırakılır
+        self.thread_pool.setMaxThreadCount(max(1, DB_HAVUZ_BOYUTU - 1))
+        # Jetonlar tüm anahtarlar için tekildir; teslim edilen isteğin kaydı silinir
+        self._token_counter = count(1)
+        self._tokens = {}
+        self._tasks = {}
+
+    def submit(self, key, fn, *args, on_result=None, on_error=None, **kwargs):
+        """fn(*args, **kwargs) çağrısını arka planda çalıştırır"""
+        task = QueryTask(key, self._next_token(key), fn, args, kwargs, on_result, on_error)
+        return self._start(task)
+
+    def query(self, key, query, parameters=None, on_result=None, on_error=None):
+        """DatabaseManager.execute_query çağrısını arka planda çalıştırır"""
+        return self.submit(key, DatabaseManager.execute_query, query, parameters,
+                           on_result=on_result, on_error=on_error)
+
+    def cached_query(self, key, query, parameters=None, on_result=None, on_error=None):
+        """DatabaseManager.cached_query çağrısını arka planda çalıştırır"""
+        return self.submit(key, DatabaseManager.cached_query, query, parameters,
+                           on_result=on_result, on_error=on_error)
+
+    def stream(self, key, query, parameters=None, on_batch=None, on_error=None,
+               batch_size=SORGU_PARCA_BOYUTU):
+        """Sorgu sonuçlarını iter_query ile okuyup parça parça on_batch'e iletir"""
+        task = StreamTask(key, self._next_token(key), DatabaseManager.iter_query,
+                          (query, parameters, batch_size), {}, on_batch, on_error, batch_size)
+        task.signals.batch.connect(self._on_batch)
+        return self._start(task)
+
+    def cancel(self, key):
+        """Anahtara ait bekleyen ya da çalışan isteği geçersiz kılar"""
+        task = self._tasks.pop(key, None)
+        if task is None:
+            return
+        task.cancelled.set()
+        # Henüz başlamamışsa kuyruktan çıkar; çalışıp bitmiş görevi Qt silmiş olabilir
+        if not sip.isdeleted(task):
+            try:
+                self.thread_pool.tryTake(task)
+            except RuntimeError:
+                pass
+        self._tokens.pop(key, None)
+
+    def is_pending(self, key):
+        """Anahtara ait henüz teslim edilmemiş bir istek olup olmadığını döndürür"""
+        return key in self._tasks
+
+    def _next_token(self, key):
+        self.cancel(key)
+        token = next(self._token_counter)
+        self._tokens[key] = token
+        return token
+
+    def _start(self, task):
+        task.signals.finished.connect(self._on_finished)
+        task.signals.failed.connect(self._on_failed)
+        self._tasks[task.key] = task
+        self.thread_pool.start(task)
+        return task.token
+
+    def _is_current(self, task):
+        if self._tokens.get(task.key) != task.token:
+            return False
+        self._tasks.pop(task.key, None)
+        self._tokens.pop(task.key, None)
+        return True
+
+    @pyqtSlot(object, object, bool)
+    def _on_batch(self, task, rows, first):
+        # Parçalar görev bitmeden gelir; görev burada kayıttan düşürülmez
+        if self._tokens.get(task.key) == task.token and task.on_batch is not None:
+            task.on_batch(rows, first)
+
+    @pyqtSlot(object)
+    def _on_finished(self, task):
+        if self._is_current(task) and task.on_result is not None:
+            task.on_result(task.result)
+
+    @pyqtSlot(object)
+    def _on_failed(self, task):
+        if not self._is_current(task):
+            return
+        if task.on_error is not None:
+            task.on_error(task.error)
+        else:
+            print(f"Arka plan sorgu hatası: {str(task.error)}")
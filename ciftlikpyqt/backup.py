@@ -0,0 +1,172 @@
+import argparse
+import os
+import re
+import sqlite3
+import sys
+import time
+from datetime import datetime
+from config import (YEDEK_DIZINI, YEDEK_SAYFA_ADIMI, YEDEK_ADIM_BEKLEMESI, YEDEK_SAKLAMA_SAYISI,
+                    YEDEK_ARALIGI_SAAT, DB_PRAGMALARI)
+from database import get_pool
+from migrations import apply_migrations
+
+_ZAMAN_BICIMI = '%Y%m%d_%H%M%S'
+
+def _backup_name(database, label=None):
+    root = os.path.splitext(os.path.basename(database))[0]
+    stamp = datetime.now().strftime(_ZAMAN_BICIMI)
+    return f"{root}_{label}_{stamp}.db" if label else f"{root}_{stamp}.db"
+
+def list_backups(directory=YEDEK_DIZINI, database=None):
+    """Zamanlanmış yedeklerin yollarını yeniden eskiye doğru döndürür"""
+    database = database or get_pool().database
+    root = re.escape(os.path.splitext(os.path.basename(database))[0])
+    pattern = re.compile(rf'^{root}_\d{{8}}_\d{{6}}\.db$')
+    if not os.path.isdir(directory):
+        return []
+    names = sorted((name for name in os.listdir(directory) if pattern.match(name)), reverse=True)
+    return [os.path.join(directory, name) for name in names]
+
+def verify_backup(path):
+    """Yedek dosyasında PRAGMA integrity_check çalıştırır; sorun yoksa True döndürür"""
+    try:
+        conn = sqlite3.connect(f'file:{path}?mode=ro', uri=True)
+        try:
+            result = conn.execute('PRAGMA integrity_check').fetchall()
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        print(f"Yedek doğrulanamadı ({path}): {str(e)}")
+        return False
+    if result != [('ok',)]:
+        print(f"Yedek bozuk ({path}): {'; '.join(row[0] for row in result[:5])}")
+        return False
+    return True
+
+def _copy(source, target, progress, pages, pause):
+    """source'u target'a sayfa adımlarıyla kopyalar; kopyalanan bayt sayısını döndürür"""
+    total_pages = 0
+
+    def step(status, remaining, total):
+        nonlocal total_pages
+        total_pages = total
+        if progress is not None:
+            progress(total - remaining, total)
+        if remaining and pause:
+            # Adımlar arasında disk arayüzdeki yazmalara bırakılır
+            time.sleep(pause)
+
+    source.backup(target, pages=pages, progress=step)
+    page_size = source.execute('PRAGMA page_size').fetchone()[0]
+    return total_pages * page_size
+
+def create_backup(directory=YEDEK_DIZINI, progress=None, pages=YEDEK_SAYFA_ADIMI,
+                  pause=YEDEK_ADIM_BEKLEMESI, keep=YEDEK_SAKLAMA_SAYISI, label=None):
+    """Etkin veritabanının çevrimiçi yedeğini alır, doğrular ve eski yedekleri siler.
+
+    Kopya, kaynak bağlantıda açık tutulan tek bir okuma işleminin anlık
+    görüntüsünden alınır: WAL kipinde yazmalar engellenmez ve arada yapılan
+    yazmalar kopyayı baştan başlatmaz. progress(kopyalanan, toplam) sayfa
+    sayılarıyla her adımda çağrılır. Yol, boyut, süre ve hızı döndürür.
+    """
+    database = get_pool().database
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, _backup_name(database, label))
+    partial = path + '.part'
+    start = time.perf_counter()
+
+    source = sqlite3.connect(database, timeout=DB_PRAGMALARI['busy_timeout'] / 1000)
+    target = sqlite3.connect(partial)
+    try:
+        source.execute('BEGIN')
+        source.execute('SELECT COUNT(*) FROM sqlite_master').fetchone()
+        size = _copy(source, target, progress, pages, pause)
+        source.rollback()
+        # Kopya, yanında -wal dosyası olmadan tek başına taşınabilsin
+        target.execute('PRAGMA journal_mode = DELETE')
+    finally:
+        target.close()
+        source.close()
+
+    if not verify_backup(partial):
+        os.remove(partial)
+        raise sqlite3.DatabaseError(f"Yedek bütünlük denetiminden geçemedi: {path}")
+    os.replace(partial, path)
+    elapsed = time.perf_counter() - start
+
+    if label is None and keep:
+        for old in list_backups(directory, database)[keep:]:
+            try:
+                os.remove(old)
+            except OSError as e:
+                print(f"Eski yedek silinemedi ({old}): {str(e)}")
+
+    return {
+        'path': path,
+        'bytes': size,
+        'seconds': elapsed,
+        'bytes_per_second': size / elapsed if elapsed else None,
+    }
+
+def backup_due(directory=YEDEK_DIZINI, interval_hours=YEDEK_ARALIGI_SAAT):
+    """Son zamanlanmış yedek interval_hours saatten eskiyse True döndürür"""
+    backups = list_backups(directory)
+    if not backups:
+        return True
+    return time.time() - os.path.getmtime(backups[0]) >= interval_hours * 3600
+
+def restore_backup(path, progress=None, pages=YEDEK_SAYFA_ADIMI):
+    """Yedeği etkin veritabanının üzerine geri yükler.
+
+    Yedek önce doğrulanır, geçerli veritabanının da bir güvenlik yedeği
+    alınır. Geri yüklenen dosya eski bir şema sürümündeyse göçler
+    uygulanır; ardından tüm tablolar için değişiklik olayı yayınlanır,
+    böylece açık ekranlar ve önbellekler yeniden yüklenir.
+    """
+    if not verify_backup(path):
+        raise sqlite3.DatabaseError(f"Geri yüklenecek yedek bozuk: {path}")
+    safety = create_backup(os.path.dirname(path) or '.', label='geri_yukleme_oncesi')
+
+    pool = get_pool()
+    source = sqlite3.connect(f'file:{path}?mode=ro', uri=True)
+    target = sqlite3.connect(pool.database, timeout=DB_PRAGMALARI['busy_timeout'] / 1000)
+    try:
+        _copy(source, target, progress, pages, 0)
+        target.execute(f"PRAGMA journal_mode = {DB_PRAGMALARI['journal_mode']}")
+        apply_migrations(target)
+    finally:
+        target.close()
+        source.close()
+
+    pool.publish_reload()
+    return safety['path']
+
+def _ilerleme_yazdir(kopyalanan, toplam):
+    print(f"\r  {kopyalanan}/{toplam} sayfa (%{100 * kopyalanan / toplam if toplam else 100:.0f})",
+          end='', file=sys.stderr)
+
+def main():
+    parser = argparse.ArgumentParser(description="Çiftlik veritabanını çalışırken yedekler ve geri yükler")
+    parser.add_argument('--dizin', default=YEDEK_DIZINI, help="yedek dizini")
+    parser.add_argument('--listele', action='store_true', help="mevcut yedekleri listeler")
+    parser.add_argument('--dogrula', metavar='DOSYA', help="yedeğin bütünlüğünü denetler")
+    parser.add_argument('--geri-yukle', metavar='DOSYA', help="yedeği veritabanının üzerine yükler")
+    args = parser.parse_args()
+
+    if args.listele:
+        for path in list_backups(args.dizin):
+            print(f"{path}  {os.path.getsize(path) / 1e6:.1f} MB")
+    elif args.dogrula:
+        sonuc = verify_backup(args.dogrula)
+        print("Yedek sağlam." if sonuc else "Yedek bozuk!")
+        sys.exit(0 if sonuc else 1)
+    elif args.geri_yukle:
+        guvenlik = restore_backup(args.geri_yukle, progress=_ilerleme_yazdir)
+        print(f"\nGeri yüklendi. Önceki veritabanının yedeği: {guvenlik}")
+    else:
+        sonuc = create_backup(args.dizin, progress=_ilerleme_yazdir)
+        print(f"\nYedek alındı: {sonuc['path']} ({sonuc['bytes'] / 1e6:.1f} MB, "
+              f"{sonuc['seconds']:.2f} s, {sonuc['bytes_per_second'] / 1e6:.1f} MB/s)")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,433 @@
+"""Sentetik sürü üzerinde sıcak yolların süre ölçümü.
+
+Örnek:
+    python benchmark.py --hayvan 100000 --saglik 1000000 --cikti sonuc.json
+    python benchmark.py --karsilastir onceki.json
+
+Veritabanı çalışma dizininde boyutlara göre adlandırılır ve tekrar
+kullanılır; --yeniden ile baştan üretilir. Sonuçlar JSON olarak yazılır.
+"""
+import argparse
+import bisect
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import subprocess
+import sys
+import time
+from datetime import date, datetime
+
+# Karşılaştırmanın varsayılan dizini, uygulamanın veritabanına dokunmamak için ayrıdır
+VARSAYILAN_DIZIN = 'benchmark_calisma'
+
+IRKLAR = ['Holstein', 'Simental', 'Montofon', 'Jersey', 'Yerli Kara']
+SAGLIK_ISLEMLERI = [
+    ('Aşı', 'Şap Aşısı', 180),
+    ('Aşı', 'Brusella Aşısı', 365),
+    ('Aşı', 'Şarbon Aşısı', 365),
+    ('Tedavi', 'Mastitis Tedavisi', None),
+    ('Tedavi', 'Topallık Tedavisi', None),
+    ('Muayene', 'Genel Muayene', None),
+    ('Parazit', 'İç Parazit Uygulaması', 120),
+]
+VETERINERLER = ['Dr. Yılmaz', 'Dr. Kaya', 'Dr. Demir', None]
+
+def _tarih(gun):
+    return date.fromordinal(gun).isoformat()
+
+def uret_veritabani(hayvan_sayisi, saglik_sayisi, tohum=42):
+    """Etkin havuzun veritabanına soy bağlantılı sentetik bir sürü yazar.
+
+    Kurucu hayvanlardan sonra doğan her buzağı için annesine başarılı bir
+    tohumlama, gebelik ve doğum zinciri eklenir; bir kısmına başarısız
+    tohumlamalar öncelik eder. Hayatta olan ineklerin bir bölümünde bekleyen
+    tohumlama ya da devam eden gebelik bulunur.
+    """
+    from database import DatabaseManager
+
+    rng = random.Random(tohum)
+    bugun = date.today().toordinal()
+    ilk_dogum = bugun - 12 * 365
+    kurucu_sayisi = max(10, hayvan_sayisi // 10)
+
+    # Doğum tarihleri artan sırada üretilir; ebeveynler öncekiler arasından seçilir
+    dogumlar = sorted(rng.randint(ilk_dogum, ilk_dogum + 3 * 365) for _ in range(kurucu_sayisi))
+    dogumlar += sorted(rng.randint(ilk_dogum + 3 * 365, bugun) for _ in range(hayvan_sayisi - kurucu_sayisi))
+
+    hayvanlar, tohumlamalar, gebelikler, dogum_kayitlari = [], [], [], []
+    disiler, disi_dogumlari, erkekler, erkek_dogumlari = [], [], [], []
+    for hayvan_id, dogum_gunu in enumerate(dogumlar, 1):
+        cinsiyet = 'Dişi' if rng.random() < 0.6 else 'Erkek'
+        anne_id = baba_id = None
+        if hayvan_id > kurucu_sayisi:
+            # En az iki yaşındaki dişiler anne, bir yaşındaki erkekler baba olabilir
+            uygun_anne = bisect.bisect_right(disi_dogumlari, dogum_gunu - 730)
+            uygun_baba = bisect.bisect_right(erkek_dogumlari, dogum_gunu - 365)
+            if uygun_anne:
+                anne_id = disiler[rng.randrange(uygun_anne)]
+            if uygun_baba:
+                baba_id = erkekler[rng.randrange(uygun_baba)]
+        if anne_id is not None:
+            tohumlama_gunu = dogum_gunu - 280 - rng.randint(0, 10)
+            for deneme in range(rng.choice([0, 0, 1, 2])):
+                tohumlamalar.append({
+                    'id': len(tohumlamalar) + 1, 'hayvan_id': anne_id,
+                    'tohumlama_tarihi': _tarih(tohumlama_gunu - 21 * (deneme + 1)),
+                    'boga_bilgisi': f'BOGA-{rng.randint(1, 200)}', 'yontem': 'Suni Tohumlama',
+                    'veteriner': rng.choice(VETERINERLER), 'basari_durumu': 'Başarısız',
+                })
+            tohumlama_id = len(tohumlamalar) + 1
+            tohumlamalar.append({
+                'id': tohumlama_id, 'hayvan_id': anne_id,
+                'tohumlama_tarihi': _tarih(tohumlama_gunu),
+                'boga_bilgisi': f'BOGA-{baba_id}' if baba_id else 'BOGA-DIS',
+                'yontem': rng.choice(['Suni Tohumlama', 'Doğal Aşım']),
+                'veteriner': rng.choice(VETERINERLER), 'basari_durumu': 'Başarılı',
+            })
+            gebelik_id = len(gebelikler) + 1
+            gebelikler.append({
+                'id': gebelik_id, 'hayvan_id': anne_id, 'tohumlama_id': tohumlama_id,
+                'tespit_tarihi': _tarih(tohumlama_gunu + 35),
+                'tahmini_dogum_tarihi': _tarih(tohumlama_gunu + 280),
+                'durum': 'Doğum Yaptı',
+            })
+            dogum_kayitlari.append({
+                'id': len(dogum_kayitlari) + 1, 'gebelik_id': gebelik_id,
+                'dogum_tarihi': _tarih(dogum_gunu), 'yavru_id': hayvan_id,
+                'dogum_tipi': 'Normal' if rng.random() < 0.9 else 'Güç Doğum',
+            })
+        yas = bugun - dogum_gunu
+        durum = 'Aktif'
+        if yas > 3 * 365 and rng.random() < 0.15:
+            durum = rng.choice(['Satıldı', 'Öldü'])
+        hayvanlar.append({
+            'id': hayvan_id, 'kulak_kupesi': f'TR{hayvan_id:010d}',
+            'dogum_tarihi': _tarih(dogum_gunu), 'cinsiyet': cinsiyet,
+            'irk': rng.choice(IRKLAR), 'anne_id': anne_id, 'baba_id': baba_id, 'durum': durum,
+        })
+        if cinsiyet == 'Dişi':
+            disiler.append(hayvan_id)
+            disi_dogumlari.append(dogum_gunu)
+        else:
+            erkekler.append(hayvan_id)
+            erkek_dogumlari.append(dogum_gunu)
+
+    # Güncel üreme durumu: bekleyen tohumlamalar ve devam eden gebelikler
+    for hayvan_id in disiler:
+        hayvan = hayvanlar[hayvan_id - 1]
+        if hayvan['durum'] != 'Aktif' or bugun - dogumlar[hayvan_id - 1] < 450:
+            continue
+        secim = rng.random()
+        if secim < 0.05:
+            tohumlamalar.append({
+                'id': len(tohumlamalar) + 1, 'hayvan_id': hayvan_id,
+                'tohumlama_tarihi': _tarih(bugun - rng.randint(0, 30)),
+                'boga_bilgisi': f'BOGA-{rng.randint(1, 200)}', 'yontem': 'Suni Tohumlama',
+                'veteriner': rng.choice(VETERINERLER), 'basari_durumu': 'Beklemede',
+            })
+        elif secim < 0.10:
+            tohumlama_gunu = bugun - rng.randint(40, 280)
+            tohumlamalar.append({
+                'id': len(tohumlamalar) + 1, 'hayvan_id': hayvan_id,
+                'tohumlama_tarihi': _tarih(tohumlama_gunu),
+                'boga_bilgisi': f'BOGA-{rng.randint(1, 200)}', 'yontem': 'Suni Tohumlama',
+                'veteriner': rng.choice(VETERINERLER), 'basari_durumu': 'Başarılı',
+            })
+            gebelikler.append({
+                'id': len(gebelikler) + 1, 'hayvan_id': hayvan_id, 'tohumlama_id': len(tohumlamalar),
+                'tespit_tarihi': _tarih(tohumlama_gunu + 35),
+                'tahmini_dogum_tarihi': _tarih(tohumlama_gunu + 280),
+                'durum': 'Devam Ediyor',
+            })
+
+    def saglik_satirlari():
+        for saglik_id in range(1, saglik_sayisi + 1):
+            hayvan_id = rng.randint(1, hayvan_sayisi)
+            islem_turu, islem_adi, tekrar = rng.choice(SAGLIK_ISLEMLERI)
+            islem_gunu = rng.randint(max(dogumlar[hayvan_id - 1], bugun - 6 * 365), bugun)
+            yield {
+                'id': saglik_id, 'hayvan_id': hayvan_id,
+                'islem_tarihi': _tarih(islem_gunu), 'islem_turu': islem_turu,
+                'islem_adi': islem_adi, 'veteriner': rng.choice(VETERINERLER),
+                'ilac_bilgisi': None, 'doz': None,
+                'tekrar_tarihi': _tarih(islem_gunu + tekrar) if tekrar else None,
+                'maliyet': round(rng.uniform(50, 2500), 2),
+            }
+
+    sayilar = {}
+    for tablo, satirlar in (('hayvanlar', hayvanlar), ('tohumlama', tohumlamalar),
+                            ('gebelik', gebelikler), ('dogum', dogum_kayitlari),
+                            ('saglik', saglik_satirlari())):
+        sonuc = DatabaseManager.insert_many(tablo, satirlar)
+        if sonuc.errors:
+            raise RuntimeError(f"{tablo} yazılamadı: {sonuc.errors[:3]}")
+        sayilar[tablo] = sonuc.rowcount
+    DatabaseManager.execute_query('ANALYZE')
+    return sayilar
+
+def olc(ad, fn, tekrar):
+    """fn'i tekrar kez çalıştırıp süre istatistiklerini döndürür.
+
+    fn ölçülen işin ürettiği satır/kayıt sayısını döndürmelidir.
+    """
+    sureler, satir = [], None
+    for _ in range(tekrar):
+        baslangic = time.perf_counter()
+        try:
+            satir = fn()
+        except Exception as e:
+            print(f"{ad}: hata: {str(e)}", file=sys.stderr)
+            return {'error': str(e)}
+        sureler.append(time.perf_counter() - baslangic)
+    sonuc = {
+        'min': min(sureler),
+        'median': statistics.median(sureler),
+        'max': max(sureler),
+        'rows': satir,
+    }
+    print(f"{ad:40s} {sonuc['median'] * 1000:10.1f} ms  ({satir} satır)", file=sys.stderr)
+    return sonuc
+
+def _tuket(query, parameters=None):
+    from database import DatabaseManager
+    return sum(1 for _ in DatabaseManager.iter_query(query, parameters))
+
+def _rapor_satiri(dosya_yolu):
+    """CSV raporundaki veri satırı sayısını döndürür (PDF için None)"""
+    if not dosya_yolu.endswith('.csv'):
+        return None
+    with open(dosya_yolu, encoding='utf-8') as f:
+        return sum(1 for _ in f) - 1
+
+def calistir(tekrar=3, yazma_sayisi=2000, pdf=False):
+    """Tüm sıcak yolları ölçer ve ad -> istatistik sözlüğü döndürür"""
+    from database import DatabaseManager
+    from queries import EKRAN_SORGULARI
+    from reports import ReportGenerator
+    from notifications import NotificationManager
+
+    sonuclar = {}
+
+    # Ekranların açılış sorguları, ekranın yaptığı gibi sonuna kadar okunur;
+    # tablolar (sorgu, parametreler) olarak yalnızca ilk sayfayı okur
+    for ad, query in EKRAN_SORGULARI.items():
+        sorgu = query if isinstance(query, tuple) else (query,)
+        sonuclar[f'ekran.{ad}'] = olc(f'ekran.{ad}', lambda s=sorgu: _tuket(*s), tekrar)
+
+    # Liste ekranlarında süzülmüş ve başlıktan sıralanmış ilk ve son sayfa;
+    # keyset sayfalamayla son sayfa da ilki kadar sürmelidir
+    from queries import keyset_page, SAGLIK_TABLOSU, SAGLIK_SAYFALAMA, HAYVAN_TABLOSU
+    from config import TABLO_SAYFA_BOYUTU
+    listeler = {
+        'liste.saglik.asi': (SAGLIK_TABLOSU, SAGLIK_SAYFALAMA, [('s.islem_turu = ?', ['Aşı'])]),
+        'liste.hayvan.irk': (HAYVAN_TABLOSU, ('h', 'irk', False), []),
+    }
+    for ad, (query, paging, filters) in listeler.items():
+        for sayfa, backward in (('ilk', False), ('son', True)):
+            sorgu = keyset_page(query, paging, None, TABLO_SAYFA_BOYUTU + 1, filters, backward)
+            sonuclar[f'{ad}.{sayfa}'] = olc(f'{ad}.{sayfa}', lambda s=sorgu: _tuket(*s), tekrar)
+
+    # Anasayfa göstergeleri; önbellek eskiyen göstergeyi bu sorguyla yeniden okur
+    from queries import GOSTERGELER, kpi_parameters
+    parametreler = kpi_parameters(date.today())
+    for ad, (query, _) in GOSTERGELER.items():
+        sonuclar[f'gosterge.{ad}'] = olc(f'gosterge.{ad}', lambda q=query: _tuket(q, parametreler), tekrar)
+
+    # Hayvan seçicinin tuş başına araması: küpe öneki ve önek bulunamayınca içerik
+    from queries import DISI_KOSULU
+    for ad, metin in (('secici.onek', 'tr00000001'), ('secici.icerik', '123')):
+        sonuclar[ad] = olc(ad, lambda m=metin: len(DatabaseManager.find_animals(m, DISI_KOSULU)), tekrar)
+
+    # Soy ağacı sorguları; örnek hayvanlar sabit tohumla seçilir
+    from pedigree import PedigreeManager
+    son_id = DatabaseManager.execute_query('SELECT MAX(id) FROM hayvanlar')[0][0] or 0
+    ornek = random.Random(1).sample(range(1, son_id + 1), min(100, son_id))
+    for ad, sorgu in (('soy.atalar', PedigreeManager.ancestors), ('soy.torunlar', PedigreeManager.descendants)):
+        sonuclar[ad] = olc(ad, lambda s=sorgu: sum(len(s(i)) for i in ornek), tekrar)
+
+    # Raporlar (CSV dosyası yazımı dahil)
+    rapor = ReportGenerator()
+    baslangic, bitis = _tarih(date.today().toordinal() - 365), date.today().isoformat()
+    raporlar = {
+        'hayvan_listesi': lambda f: rapor.hayvan_listesi_raporu(f),
+        'saglik': lambda f: rapor.saglik_raporu(baslangic, bitis, f),
+        'maliyet': lambda f: rapor.maliyet_raporu(baslangic, bitis, f),
+    }
+    for format in (['excel', 'pdf'] if pdf else ['excel']):
+        for ad, uret in raporlar.items():
+            sonuclar[f'rapor.{ad}.{format}'] = olc(
+                f'rapor.{ad}.{format}', lambda u=uret, f=format: _rapor_satiri(u(f)), tekrar)
+
+    # Bildirim kontrolleri; Telegram'a gönderim yerine yalnızca sayılır
+    bildirim = NotificationManager()
+    gonderilen = []
+
+    async def gonder(message):
+        gonderilen.append(message)
+        return True
+    bildirim.send_telegram_message = gonder
+
+    def bildirim_kontrolu(kontrol, tablo):
+        DatabaseManager.execute_query('DELETE FROM bildirimler')
+        gonderilen.clear()
+        kontrol()
+        if tablo == 'gonderilen':
+            return len(gonderilen)
+        return DatabaseManager.execute_query('SELECT COUNT(*) FROM bildirimler')[0][0]
+
+    sonuclar['bildirim.gebelik'] = olc(
+        'bildirim.gebelik', lambda: bildirim_kontrolu(bildirim.check_gebelik_bildirimleri, 'bildirimler'), tekrar)
+    sonuclar['bildirim.asi'] = olc(
+        'bildirim.asi', lambda: bildirim_kontrolu(bildirim.check_asi_bildirimleri, 'bildirimler'), tekrar)
+
+    def gonderim():
+        DatabaseManager.execute_query("UPDATE bildirimler SET durum = 'Beklemede'")
+        gonderilen.clear()
+        bildirim.check_notifications()
+        return len(gonderilen)
+    sonuclar['bildirim.gonderim'] = olc('bildirim.gonderim', gonderim, tekrar)
+    DatabaseManager.execute_query('DELETE FROM bildirimler')
+
+    # Komut satırı aracının soğuk başlangıcı: yeni süreçte boş tabloyu dışa aktarır,
+    # böylece süre neredeyse tamamen içe aktarma ve veritabanı açılışıdır
+    from database import get_pool
+    cli = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cli.py')
+    komut = [sys.executable, cli, '--veritabani', get_pool().database, 'disa-aktar', 'bildirimler']
+
+    def soguk_baslangic():
+        subprocess.run(komut, check=True, capture_output=True)
+        return 0
+    sonuclar['cli.soguk_baslangic'] = olc('cli.soguk_baslangic', soguk_baslangic, tekrar)
+
+    # Masaüstü uygulamasının ilk pencereyi çizene kadar geçen süresi; pencere
+    # ekransız platformda açılır ve ilk çizimden sonra kapanır
+    import importlib.util
+    if importlib.util.find_spec('PyQt6') is not None:
+        arayuz = [sys.executable, os.path.join(os.path.dirname(cli), 'main.py'),
+                  '--veritabani', get_pool().database]
+        ortam = dict(os.environ, QT_QPA_PLATFORM='offscreen', CIFTLIK_ACILIS_ZAMANLAMASI='cik')
+
+        def ilk_pencere():
+            subprocess.run(arayuz, check=True, capture_output=True, env=ortam)
+            return 0
+        sonuclar['arayuz.ilk_pencere'] = olc('arayuz.ilk_pencere', ilk_pencere, tekrar)
+
+    # Yazma hızı; eklenen satırlar ölçümden sonra silinir
+    def saglik_kaydi(i):
+        return {'hayvan_id': i % 1000 + 1, 'islem_tarihi': date.today().isoformat(),
+                'islem_turu': 'Muayene', 'islem_adi': 'Karşılaştırma', 'maliyet': 0}
+
+    def tekli_yazma():
+        for i in range(yazma_sayisi):
+            DatabaseManager.insert_data('saglik', saglik_kaydi(i))
+        return yazma_sayisi
+
+    def toplu_yazma():
+        return DatabaseManager.insert_many('saglik', (saglik_kaydi(i) for i in range(yazma_sayisi))).rowcount
+
+    for ad, fn in (('yazma.insert_data', tekli_yazma), ('yazma.insert_many', toplu_yazma)):
+        sonuc = olc(ad, fn, tekrar)
+        if 'median' in sonuc:
+            sonuc['rows_per_second'] = sonuc['rows'] / sonuc['median']
+        sonuclar[ad] = sonuc
+        DatabaseManager.execute_query("DELETE FROM saglik WHERE islem_adi = 'Karşılaştırma'")
+
+    return sonuclar
+
+def _git_surumu():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+def karsilastir(onceki, simdiki, esik=0.10):
+    """İki sonuç dosyasının medyanlarını karşılaştırır; eşikten fazla yavaşlayanları döndürür"""
+    gerilemeler = []
+    for ad, sonuc in simdiki['results'].items():
+        eski = onceki['results'].get(ad)
+        if not eski or 'median' not in eski or 'median' not in sonuc:
+            continue
+        oran = sonuc['median'] / eski['median'] if eski['median'] else float('inf')
+        isaret = '!' if oran > 1 + esik else ' '
+        print(f"{isaret} {ad:40s} {eski['median'] * 1000:10.1f} ms -> {sonuc['median'] * 1000:10.1f} ms"
+              f"  x{oran:.2f}", file=sys.stderr)
+        if oran > 1 + esik:
+            gerilemeler.append(ad)
+    return gerilemeler
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sentetik sürü üzerinde sorgu karşılaştırması")
+    parser.add_argument('--hayvan', type=int, default=100000, help="hayvan sayısı")
+    parser.add_argument('--saglik', type=int, default=1000000, help="sağlık kaydı sayısı")
+    parser.add_argument('--tohum', type=int, default=42, help="rastgele üreteç tohumu")
+    parser.add_argument('--tekrar', type=int, default=3, help="her ölçümün tekrar sayısı")
+    parser.add_argument('--yazma', type=int, default=2000, help="yazma ölçümündeki satır sayısı")
+    parser.add_argument('--pdf', action='store_true', help="PDF raporlarını da ölç")
+    parser.add_argument('--dizin', default=VARSAYILAN_DIZIN, help="veritabanı ve raporların dizini")
+    parser.add_argument('--yeniden', action='store_true', help="veritabanını baştan üret")
+    parser.add_argument('--cikti', help="sonuç JSON dosyası (verilmezse standart çıktı)")
+    parser.add_argument('--karsilastir', help="gerilemeleri bulmak için önceki sonuç dosyası")
+    parser.add_argument('--esik', type=float, default=0.10, help="gerileme sayılan yavaşlama oranı")
+    args = parser.parse_args(argv)
+
+    # Sonuç dosyaları çağıranın dizinine göre verilir; dizin değişmeden çözülür
+    for ad in ('cikti', 'karsilastir'):
+        if getattr(args, ad):
+            setattr(args, ad, os.path.abspath(getattr(args, ad)))
+    os.makedirs(args.dizin, exist_ok=True)
+    os.chdir(args.dizin)
+
+    from database import configure_pool, create_database
+
+    veritabani = f'bench_{args.hayvan}_{args.saglik}_{args.tohum}.db'
+    if args.yeniden:
+        for ek in ('', '-wal', '-shm'):
+            if os.path.exists(veritabani + ek):
+                os.remove(veritabani + ek)
+    yeni = not os.path.exists(veritabani)
+    configure_pool(veritabani)
+    create_database()
+
+    uretim = None
+    if yeni:
+        print(f"{veritabani} üretiliyor...", file=sys.stderr)
+        baslangic = time.perf_counter()
+        sayilar = uret_veritabani(args.hayvan, args.saglik, args.tohum)
+        uretim = {'seconds': time.perf_counter() - baslangic, 'rows': sayilar}
+        print(f"Üretildi: {sayilar} ({uretim['seconds']:.1f} s)", file=sys.stderr)
+
+    sonuc = {
+        'meta': {
+            'date': datetime.now().isoformat(timespec='seconds'),
+            'commit': _git_surumu(),
+            'python': platform.python_version(),
+            'sqlite': sqlite3.sqlite_version,
+            'platform': platform.platform(),
+            'database': veritabani,
+            'herd': {'hayvan': args.hayvan, 'saglik': args.saglik, 'tohum': args.tohum},
+            'repeat': args.tekrar,
+        },
+        'generate': uretim,
+        'results': calistir(args.tekrar, args.yazma, args.pdf),
+    }
+
+    metin = json.dumps(sonuc, ensure_ascii=False, indent=2)
+    if args.cikti:
+        with open(args.cikti, 'w', encoding='utf-8') as f:
+            f.write(metin)
+    else:
+        print(metin)
+
+    if args.karsilastir:
+        with open(args.karsilastir, encoding='utf-8') as f:
+            onceki = json.load(f)
+        if karsilastir(onceki, sonuc, args.esik):
+            return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,101 @@
+import re
+import threading
+from collections import OrderedDict
+from config import ONBELLEK_EN_FAZLA_KAYIT, ONBELLEK_EN_FAZLA_SATIR
+
+_READ_TABLES = re.compile(r'\b(?:FROM|JOIN)\s+([A-Za-z_]\w*)', re.IGNORECASE)
+_WRITE_TARGET = re.compile(
+    r'^\s*(INSERT(?:\s+OR\s+\w+)?\s+INTO|REPLACE\s+INTO|UPDATE(?:\s+OR\s+\w+)?|DELETE\s+FROM)\s+([A-Za-z_]\w*)',
+    re.IGNORECASE)
+
+def tables_read_by(query):
+    """Sorgunun okuduğu tablo adlarını döndürür"""
+    return frozenset(name.lower() for name in _READ_TABLES.findall(query))
+
+def write_target(query):
+    """Sorgu bir yazma komutuysa (işlem, tablo) çiftini, değilse None döndürür"""
+    match = _WRITE_TARGET.match(query)
+    if not match:
+        return None
+    verb = match.group(1).split()[0].lower()
+    operation = 'insert' if verb in ('insert', 'replace') else verb
+    return operation, match.group(2).lower()
+
+class LookupCache:
+    """Sorgu ve parametrelerle anahtarlanan, boyutu sınırlı LRU önbellek.
+
+    Her kayıt okuduğu tablolarla etiketlenir; bir tabloya yazıldığında o
+    tabloyu okuyan kayıtlar silinir. Yazma ile eşzamanlı çalışan bir okuma
+    eski veriyi önbelleğe koyamasın diye her geçersiz kılma bir nesil
+    sayacını artırır ve okumaya başlamadan alınan nesil eskiyse put yok sayılır.
+    """
+
+    def __init__(self, max_entries=ONBELLEK_EN_FAZLA_KAYIT, max_rows=ONBELLEK_EN_FAZLA_SATIR):
+        self.max_entries = max_entries
+        self.max_rows = max_rows
+        self._entries = OrderedDict()
+        self._rows = 0
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'invalidations': 0}
+
+    def generation(self):
+        """Okumaya başlamadan önce alınacak nesil numarasını döndürür"""
+        with self._lock:
+            return self._generation
+
+    def get(self, key):
+        """Kayıt varsa satırları, yoksa None döndürür"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats['hits'] += 1
+            return entry[1]
+
+    def put(self, key, tables, rows, generation):
+        """Okuma sırasında geçersiz kılma olmadıysa sonucu önbelleğe koyar"""
+        rows = tuple(rows)
+        with self._lock:
+            if generation != self._generation or len(rows) > self.max_rows:
+                return rows
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._rows -= len(old[1])
+            self._entries[key] = (tables, rows)
+            self._rows += len(rows)
+            while self._entries and (len(self._entries) > self.max_entries or self._rows > self.max_rows):
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._rows -= len(evicted)
+                self._stats['evictions'] += 1
+        return rows
+
+    def invalidate(self, tables):
+        """Verilen tablolardan okuyan kayıtları siler"""
+        tables = {table.lower() for table in tables}
+        with self._lock:
+            self._generation += 1
+            stale = [key for key, (read, _) in self._entries.items() if read & tables]
+            for key in stale:
+                self._rows -= len(self._entries.pop(key)[1])
+            self._stats['invalidations'] += len(stale)
+
+    def clear(self):
+        """Önbelleği tamamen boşaltır"""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._rows = 0
+
+    def stats(self):
+        """Önbellek istatistiklerini sözlük olarak döndürür"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = len(self._entries)
+            stats['rows'] = self._rows
+        return stats
+
+# Tüm pencerelerin paylaştığı önbellek
+lookup_cache = LookupCache()
@@ -0,0 +1,169 @@
+"""Zamanlanmış işler (cron, Görev Zamanlayıcı) için komut satırı aracı.
+
+Örnek:
+    python cli.py gunluk-kontrol
+    python cli.py rapor saglik --baslangic 2024-01-01 --bitis 2024-12-31
+    python cli.py disa-aktar hayvanlar --bicim json --cikti hayvanlar.jsonl
+    python cli.py sikistir
+
+Modül düzeyinde yalnızca standart kütüphane yüklenir; veritabanı ve
+alt komutun ihtiyaç duyduğu modüller komut çalışırken içe aktarılır. Qt
+hiçbir komutta, reportlab yalnızca PDF raporunda, telegram yalnızca
+gönderilecek bildirim varsa yüklenir.
+"""
+import argparse
+import sys
+from datetime import date, timedelta
+
+def _open_database(args):
+    """Komutun çalışacağı veritabanının havuzunu uygulama geneli havuz yapar"""
+    from database import create_database, configure_pool, set_pool
+    if args.veritabani:
+        create_database(args.veritabani)
+        configure_pool(args.veritabani)
+    else:
+        from farms import active_farm, farm_pool
+        set_pool(farm_pool(args.ciftlik or active_farm()))
+
+def gunluk_kontrol(args):
+    from notifications import NotificationManager
+    bildirim = NotificationManager()
+    if args.gonderme:
+        bildirim.check_gebelik_bildirimleri()
+        bildirim.check_asi_bildirimleri()
+    else:
+        bildirim.run_daily_checks()
+    return 0
+
+def rapor(args):
+    from reports import ReportGenerator
+    generator = ReportGenerator()
+    if args.tur == 'hayvan-listesi':
+        path = generator.hayvan_listesi_raporu(format=args.format)
+    elif args.tur == 'saglik':
+        path = generator.saglik_raporu(args.baslangic, args.bitis, format=args.format)
+    else:
+        path = generator.maliyet_raporu(args.baslangic, args.bitis, format=args.format)
+    print(path)
+    return 0
+
+def _data_tables():
+    """Dışa aktarılabilecek veri tablolarını döndürür.
+
+    SQLite'ın iç tabloları, sanal tablolar (arama dizini) ve onların
+    <ad>_* gölge tabloları dışarıda bırakılır.
+    """
+    from database import DatabaseManager
+    rows = DatabaseManager.execute_query(
+        "SELECT name, sql FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'") or []
+    virtual = [row['name'] for row in rows if (row['sql'] or '').upper().startswith('CREATE VIRTUAL')]
+    return {row['name'] for row in rows
+            if row['name'] not in virtual and not any(row['name'].startswith(f'{v}_') for v in virtual)}
+
+def _primary_key(table):
+    """Tablonun birincil anahtar sütunlarını anahtardaki sırasıyla döndürür"""
+    from database import DatabaseManager
+    columns = DatabaseManager.execute_query(f'PRAGMA table_info({table})') or []
+    return [row['name'] for row in sorted(columns, key=lambda row: row['pk']) if row['pk']]
+
+def disa_aktar(args):
+    import csv
+    import json
+    import sqlite3
+    from database import DatabaseManager
+    if args.tablo not in _data_tables():
+        print(f"Bilinmeyen tablo: {args.tablo}", file=sys.stderr)
+        return 1
+
+    # Satırlar okundukça yazılır; büyük tablolar belleğe alınmaz. WITHOUT
+    # ROWID tablolarda rowid olmadığından birincil anahtara göre sıralanır.
+    order = ', '.join(_primary_key(args.tablo)) or 'rowid'
+    rows = DatabaseManager.iter_query(f'SELECT * FROM {args.tablo} ORDER BY {order}')
+    out = open(args.cikti, 'w', newline='', encoding='utf-8') if args.cikti else sys.stdout
+    try:
+        count = 0
+        if args.bicim == 'json':
+            for row in rows:
+                out.write(json.dumps(dict(row), ensure_ascii=False) + '\n')
+                count += 1
+        else:
+            writer = None
+            for row in rows:
+                if writer is None:
+                    writer = csv.writer(out)
+                    writer.writerow(row.keys())
+                writer.writerow(row)
+                count += 1
+    except sqlite3.Error as e:
+        print(f"Dışa aktarma hatası: {str(e)}", file=sys.stderr)
+        return 1
+    finally:
+        if args.cikti:
+            out.close()
+    print(f"{count} satır dışa aktarıldı", file=sys.stderr)
+    return 0
+
+def sikistir(args):
+    import os
+    import sqlite3
+    from config import DB_PRAGMALARI
+    from database import get_pool
+    database = get_pool().database
+    before = os.path.getsize(database)
+
+    # VACUUM işlem içinde çalışamaz; havuzdan bağımsız, otomatik commit'li bir bağlantı kullanılır
+    conn = sqlite3.connect(database, timeout=DB_PRAGMALARI['busy_timeout'] / 1000, isolation_level=None)
+    try:
+        conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+        conn.execute('VACUUM')
+        if args.analiz:
+            conn.execute('ANALYZE')
+        conn.execute('PRAGMA optimize')
+        conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+    except sqlite3.Error as e:
+        print(f"Sıkıştırma hatası: {str(e)}", file=sys.stderr)
+        return 1
+    finally:
+        conn.close()
+    after = os.path.getsize(database)
+    print(f"{database}: {before / 1e6:.1f} MB -> {after / 1e6:.1f} MB")
+    return 0
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Çiftlik Yönetim Sistemi komut satırı aracı")
+    secim = parser.add_mutually_exclusive_group()
+    secim.add_argument('--ciftlik', help="çalışılacak çiftlik (varsayılan: etkin çiftlik)")
+    secim.add_argument('--veritabani', metavar='DOSYA', help="çiftlik kaydı yerine doğrudan veritabanı dosyası")
+    komutlar = parser.add_subparsers(dest='komut', required=True)
+
+    komut = komutlar.add_parser('gunluk-kontrol', help="gebelik ve aşı bildirimlerini oluşturur, bekleyenleri gönderir")
+    komut.add_argument('--gonderme', action='store_true', help="bildirimleri oluştur, Telegram'a gönderme")
+    komut.set_defaults(fn=gunluk_kontrol)
+
+    bugun = date.today()
+    komut = komutlar.add_parser('rapor', help="rapor dosyası üretir ve yolunu yazar")
+    komut.add_argument('tur', choices=['hayvan-listesi', 'saglik', 'maliyet'])
+    komut.add_argument('--baslangic', default=(bugun - timedelta(days=30)).isoformat(),
+                       help="başlangıç tarihi (varsayılan: 30 gün önce)")
+    komut.add_argument('--bitis', default=bugun.isoformat(), help="bitiş tarihi (varsayılan: bugün)")
+    komut.add_argument('--format', choices=['excel', 'pdf'], default='excel', help="excel (CSV) ya da pdf")
+    komut.set_defaults(fn=rapor)
+
+    komut = komutlar.add_parser('disa-aktar', help="bir tabloyu CSV ya da JSON satırları olarak yazar")
+    komut.add_argument('tablo')
+    komut.add_argument('--bicim', choices=['csv', 'json'], default='csv')
+    komut.add_argument('--cikti', metavar='DOSYA', help="çıktı dosyası (varsayılan: standart çıktı)")
+    komut.set_defaults(fn=disa_aktar)
+
+    komut = komutlar.add_parser('sikistir', help="VACUUM ile boş sayfaları geri verir, sorgu planlayıcıyı günceller")
+    komut.add_argument('--analiz', action='store_true', help="tüm tablolar için ANALYZE da çalıştır")
+    komut.set_defaults(fn=sikistir)
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    _open_database(args)
+    return args.fn(args)
+
+if __name__ == '__main__':
+    sys.exit(main())
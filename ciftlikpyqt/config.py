@@ -1,3 +1,5 @@
+import os
+
 # Telegram Bot Ayarları
 TELEGRAM_BOT_TOKEN = "YOUR_BOT_TOKEN_HERE"
 TELEGRAM_CHAT_ID = "YOUR_CHAT_ID_HERE"
@@ -5,10 +7,79 @@ TELEGRAM_CHAT_ID = "YOUR_CHAT_ID_HERE"
 # Veritabanı Ayarları
 DATABASE_NAME = "ciftlik.db"
 
+# Çoklu Çiftlik Ayarları
+CIFTLIK_KAYIT_DOSYASI = "ciftlikler.json"  # çiftlik adı -> veritabanı dosyası kaydı
+VARSAYILAN_CIFTLIK = "Ana Çiftlik"  # kayıt dosyası yokken DATABASE_NAME bu adla kullanılır
+
+# Bağlantı Havuzu Ayarları
+DB_HAVUZ_BOYUTU = 4  # eşzamanlı açık tutulacak en fazla bağlantı
+DB_BEKLEME_SURESI = 30  # saniye, boş bağlantı beklerken zaman aşımı
+DB_PRAGMALARI = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'temp_store': 'MEMORY',
+    'cache_size': -16000,  # KiB (negatif değer), yaklaşık 16 MB
+    'mmap_size': 134217728,  # 128 MB
+    'busy_timeout': 5000,  # milisaniye
+}
+
+# Toplu Yazma Ayarları
+TOPLU_YAZMA_PARCA_BOYUTU = 500  # tek executemany çağrısındaki satır sayısı
+TOPLU_YAZMA_COMMIT_BOYUTU = 5000  # kaç satırda bir commit edileceği (None: tek commit)
+SORGU_PARCA_BOYUTU = 500  # iter_query'nin her fetchmany çağrısında okuduğu satır
+TABLO_SAYFA_BOYUTU = 200  # liste ekranlarında bir sayfada gösterilen kayıt sayısı
+
+# Sorgu Önbelleği Ayarları
+ONBELLEK_EN_FAZLA_KAYIT = 64  # önbellekte tutulacak en fazla sorgu sonucu
+ONBELLEK_EN_FAZLA_SATIR = 200000  # tüm sonuçlardaki toplam satır sınırı
+
+# Sorgu Profili Ayarları
+SORGU_PROFILI_ACIK = os.environ.get('CIFTLIK_SORGU_PROFILI') == '1'  # süre ve plan kaydı, varsayılan kapalı
+YAVAS_SORGU_ESIGI_MS = 100  # bu süreyi aşan sorgular plan ile birlikte kaydedilir
+YAVAS_SORGU_DOSYASI = "yavas_sorgular.log"
+
+# Açılış Ayarları
+SAYFA_ON_ISITMA = True  # ilk çizimden sonra açılmamış ekranlar boşta, sırayla kurulur
+ACILIS_ZAMANLAMASI = os.environ.get('CIFTLIK_ACILIS_ZAMANLAMASI', '')  # '1': adım sürelerini yazdırır; 'cik': ayrıca ilk çizimden sonra çıkar (karşılaştırma için)
+
+# Arama Ayarları
+ARAMA_SAYFA_BOYUTU = 50  # arama sonuçlarında sayfa başına kayıt
+
+# Hayvan Seçici Ayarları
+SECICI_EN_FAZLA_SONUC = 20  # her aramada önerilen en fazla hayvan
+SECICI_BEKLEME_MS = 150  # yazma bu kadar durunca aranır
+SECICI_ONBELLEK_BOYUTU = 32  # sonucu saklanan son arama sayısı
+
+# Gösterge Paneli Ayarları
+GOSTERGE_BEKLEME_MS = 300  # art arda gelen yazmalar bu kadar durunca göstergeler yenilenir
+GOSTERGE_YOKLAMA_MS = 5000  # anasayfa açıkken başka süreçlerin yazmaları bu aralıkla denetlenir
+
+# Yedekleme Ayarları
+YEDEK_DIZINI = "yedekler/"
+YEDEK_SAYFA_ADIMI = 256  # her adımda kopyalanan sayfa sayısı
+YEDEK_ADIM_BEKLEMESI = 0.002  # saniye; adımlar arasında disk diğer yazmalara bırakılır
+YEDEK_SAKLAMA_SAYISI = 7  # en yeni bu kadar zamanlanmış yedek saklanır
+YEDEK_ARALIGI_SAAT = 24  # otomatik yedekler arasındaki süre
+
+# Arşiv Ayarları
+ARSIV_UFKU_GUN = 1095  # bundan eski geçmiş ve etkin olmayan hayvanlar arşive taşınır (3 yıl)
+
+# API Sunucusu Ayarları
+SUNUCU_ADRESI = "127.0.0.1"  # ahırdaki tabletler için yerel ağ adresi ya da "0.0.0.0" verilir
+SUNUCU_PORTU = 8765
+API_SAYFA_BOYUTU = 100  # liste isteklerinde varsayılan kayıt sayısı
+API_EN_FAZLA_SAYFA = 1000  # limit parametresinin üst sınırı
+API_YAZMA_GRUBU = 64  # yazma kuyruğunda tek commit'te birleştirilen en fazla istek
+
 # Bildirim Ayarları
 GEBELIK_KONTROL_SURESI = 280  # gün
 TOHUMLAMA_KONTROL_SURESI = 21  # gün
 ASI_HATIRLATMA_SURESI = 7  # gün
+BILDIRIM_ISARETLEME_GRUBU = 20  # gönderilen kaç bildirimde bir durumlarının Gönderildi yapıldığı
+
+# Tohumlama Ayarları
+AKRABALIK_UYARI_ESIGI = 0.0625  # yavrunun akrabalık katsayısı bunu aşarsa uyarı rengiyle gösterilir
 
 # Raporlama Ayarları
-RAPOR_DIZINI = "raporlar/" 
\ No newline at end of file
+RAPOR_DIZINI = "raporlar/" 
+PDF_TABLO_PARCA_BOYUTU = 500  # PDF raporunda her tablo parçasındaki satır; parçalar sayfaya yazıldıkça üretilir
\ No newline at end of file
@@ -1,158 +1,680 @@
+import queue
+import re
 import sqlite3
+import threading
+import time
+from collections import namedtuple
+from contextlib import contextmanager
 from datetime import datetime
-from config import DATABASE_NAME
+from itertools import count, islice
+from config import (DATABASE_NAME, DB_HAVUZ_BOYUTU, DB_BEKLEME_SURESI, DB_PRAGMALARI,
+                    TOPLU_YAZMA_PARCA_BOYUTU, TOPLU_YAZMA_COMMIT_BOYUTU, SORGU_PARCA_BOYUTU,
+                    ARAMA_SAYFA_BOYUTU, SECICI_EN_FAZLA_SONUC)
+from migrations import apply_migrations, TRIGGER_TARGETS, SEARCH_TABLES
+from cache import lookup_cache, tables_read_by, write_target
+from profiling import profiler
 
-def create_database():
+def create_database(database=None):
+    """Veritabanı şemasını eksik göçleri uygulayarak günceller.
+
+    database verilirse etkin havuz yerine o dosya güncellenir.
+    """
     try:
-        conn = sqlite3.connect(DATABASE_NAME)
-        cursor = conn.cursor()
-        
-        # Hayvanlar tablosu
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS hayvanlar (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                kulak_kupesi TEXT UNIQUE NOT NULL,
-                dogum_tarihi DATE NOT NULL,
-                cinsiyet TEXT NOT NULL,
-                irk TEXT NOT NULL,
-                anne_id INTEGER,
-                baba_id INTEGER,
-                durum TEXT DEFAULT 'Aktif',
-                notlar TEXT,
-                FOREIGN KEY (anne_id) REFERENCES hayvanlar (id),
-                FOREIGN KEY (baba_id) REFERENCES hayvanlar (id)
-            )
-        ''')
-        
-        # Tohumlama tablosu
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS tohumlama (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                hayvan_id INTEGER NOT NULL,
-                tohumlama_tarihi DATE NOT NULL,
-                boga_bilgisi TEXT NOT NULL,
-                yontem TEXT NOT NULL,
-                veteriner TEXT,
-                basari_durumu TEXT DEFAULT 'Beklemede',
-                notlar TEXT,
-                FOREIGN KEY (hayvan_id) REFERENCES hayvanlar (id)
-            )
-        ''')
-        
-        # Gebelik tablosu
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS gebelik (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                hayvan_id INTEGER NOT NULL,
-                tohumlama_id INTEGER NOT NULL,
-                tespit_tarihi DATE NOT NULL,
-                tahmini_dogum_tarihi DATE NOT NULL,
-                durum TEXT DEFAULT 'Devam Ediyor',
-                notlar TEXT,
-                FOREIGN KEY (hayvan_id) REFERENCES hayvanlar (id),
-                FOREIGN KEY (tohumlama_id) REFERENCES tohumlama (id)
-            )
-        ''')
-        
-        # Doğum tablosu
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS dogum (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                gebelik_id INTEGER NOT NULL,
-                dogum_tarihi DATE NOT NULL,
-                yavru_id INTEGER NOT NULL,
-                dogum_tipi TEXT NOT NULL,
-                komplikasyonlar TEXT,
-                notlar TEXT,
-                FOREIGN KEY (gebelik_id) REFERENCES gebelik (id),
-                FOREIGN KEY (yavru_id) REFERENCES hayvanlar (id)
-            )
-        ''')
+        if database is None:
+            with get_pool().connection() as conn:
+                applied = apply_migrations(conn)
+        else:
+            conn = _configure_connection(sqlite3.connect(database))
+            try:
+                applied = apply_migrations(conn)
+            finally:
+                conn.close()
         
-        # Sağlık tablosu
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS saglik (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                hayvan_id INTEGER NOT NULL,
-                islem_tarihi DATE NOT NULL,
-                islem_turu TEXT NOT NULL,
-                islem_adi TEXT NOT NULL,
-                veteriner TEXT,
-                ilac_bilgisi TEXT,
-                doz TEXT,
-                tekrar_tarihi DATE,
-                maliyet REAL,
-                notlar TEXT,
-                FOREIGN KEY (hayvan_id) REFERENCES hayvanlar (id)
-            )
-        ''')
-        
-        # Bildirimler tablosu
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS bildirimler (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                hayvan_id INTEGER NOT NULL,
-                bildirim_turu TEXT NOT NULL,
-                bildirim_tarihi DATE NOT NULL,
-                durum TEXT DEFAULT 'Beklemede',
-                mesaj TEXT,
-                FOREIGN KEY (hayvan_id) REFERENCES hayvanlar (id)
-            )
-        ''')
-        
-        conn.commit()
-        conn.close()
-        print("Veritabanı başarıyla oluşturuldu!")
+        if applied:
+            print("Veritabanı başarıyla oluşturuldu!")
+            for version, description in applied:
+                print(f"  Şema sürümü {version}: {description}")
         
     except sqlite3.Error as e:
         print(f"Veritabanı oluşturulurken hata oluştu: {str(e)}")
 
+def _configure_connection(conn):
+    """Bağlantı açılırken satır fabrikasını ve pragmaları bir kez uygular"""
+    conn.row_factory = sqlite3.Row  # Sütun isimlerine erişim için
+    for pragma, value in DB_PRAGMALARI.items():
+        conn.execute(f"PRAGMA {pragma} = {value}")
+    return conn
+
 def get_db_connection():
     """Veritabanı bağlantısı oluşturur ve cursor döndürür"""
     conn = sqlite3.connect(DATABASE_NAME)
-    conn.row_factory = sqlite3.Row  # Sütun isimlerine erişim için
-    return conn
+    return _configure_connection(conn)
+
+class ConnectionPool:
+    """SQLite bağlantılarını açık tutup yeniden kullanan küçük bağlantı havuzu.
+
+    Aynı iş parçacığı içindeki iç içe çağrılar aynı bağlantıyı paylaşır;
+    farklı iş parçacıkları boştaki bağlantıları sırayla devralır.
+    """
+
+    def __init__(self, database=DATABASE_NAME, max_size=DB_HAVUZ_BOYUTU, timeout=DB_BEKLEME_SURESI):
+        self.database = database
+        self.max_size = max_size
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._open_count = 0
+        self._closed = False
+        self._stats = {'hits': 0, 'opens': 0, 'waits': 0, 'wait_time': 0.0}
+        # Bağlantılara eklenecek ek veritabanları (şema adı -> dosya yolu)
+        self._attachments = {}
+        self._attach_version = 0
+        self._attached_versions = {}  # id(conn) -> uygulanan ek sürümü
+        self._borrowers = {}  # id(conn) -> bağlantıyı hâlâ kullanan blok sayısı
+
+    def _open(self):
+        conn = sqlite3.connect(self.database, timeout=self.timeout, check_same_thread=False)
+        return _configure_connection(conn)
+
+    def _checkout(self):
+        try:
+            conn = self._idle.get_nowait()
+            with self._lock:
+                self._stats['hits'] += 1
+            return conn
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            if self._closed:
+                raise sqlite3.ProgrammingError("Bağlantı havuzu kapatıldı")
+            can_open = self._open_count < self.max_size
+            if can_open:
+                # Yer kilit altında ayrılır, bağlantı kilit dışında açılır
+                self._open_count += 1
+                self._stats['opens'] += 1
+
+        if can_open:
+            try:
+                return self._open()
+            except sqlite3.Error:
+                with self._lock:
+                    self._open_count -= 1
+                raise
+
+        # Havuz dolu; bir bağlantının geri bırakılmasını bekle
+        start = time.perf_counter()
+        try:
+            conn = self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise sqlite3.OperationalError("Boş veritabanı bağlantısı beklerken zaman aşımı")
+        with self._lock:
+            self._stats['waits'] += 1
+            self._stats['wait_time'] += time.perf_counter() - start
+        return conn
+
+    def _apply_attachments(self, conn):
+        """Havuza sonradan eklenen veritabanlarını bağlantıya bağlar"""
+        version = self._attach_version
+        if self._attached_versions.get(id(conn), 0) == version:
+            return
+        with self._lock:
+            attachments = dict(self._attachments)
+        attached = {row[1] for row in conn.execute('PRAGMA database_list')}
+        for schema, path in attachments.items():
+            if schema not in attached:
+                conn.execute(f'ATTACH DATABASE ? AS {schema}', (path,))
+        self._attached_versions[id(conn)] = version
+
+    def attach(self, schema, path):
+        """path dosyasını tüm bağlantılara schema adıyla bağlar.
+
+        Bağlantılar ATTACH komutunu bir sonraki ödünç verilişlerinde,
+        açık işlem yokken çalıştırır.
+        """
+        with self._lock:
+            if self._attachments.get(schema) == path:
+                return
+            self._attachments[schema] = path
+            self._attach_version += 1
+
+    def attached(self, schema):
+        """schema adıyla bağlanmış dosyanın yolunu (yoksa None) döndürür"""
+        with self._lock:
+            return self._attachments.get(schema)
+
+    def _checkin(self, conn):
+        if conn.in_transaction:
+            conn.rollback()
+        with self._lock:
+            closed = self._closed
+            if closed:
+                self._open_count -= 1
+        if closed:
+            self._attached_versions.pop(id(conn), None)
+            conn.close()
+        else:
+            self._idle.put(conn)
+
+    def _release(self, conn):
+        # Bağlantı, onu kullanan son blok da bitince havuza döner
+        with self._lock:
+            self._borrowers[id(conn)] -= 1
+            last = not self._borrowers[id(conn)]
+            if last:
+                del self._borrowers[id(conn)]
+        if last:
+            self._checkin(conn)
+
+    @contextmanager
+    def connection(self):
+        """Havuzdan bir bağlantı ödünç verir, blok bitince geri alır.
+
+        Aynı iş parçacığındaki iç içe çağrılar dıştaki bağlantıyı paylaşır.
+        Dıştaki blok içteki bir bloktan (örneğin askıdaki bir generator'dan)
+        önce biterse bağlantı iş parçacığından ayrılır ve havuza ancak onu
+        kullanan son blok bitince döner.
+        """
+        local = self._local
+        conn = getattr(local, 'conn', None)
+        if conn is not None:
+            # İç içe çağrı: iş parçacığının elindeki bağlantıyı yeniden kullan
+            with self._lock:
+                self._stats['hits'] += 1
+                self._borrowers[id(conn)] += 1
+            try:
+                yield conn
+            finally:
+                self._release(conn)
+            return
+
+        conn = self._checkout()
+        with self._lock:
+            self._borrowers[id(conn)] = 1
+        local.conn = conn
+        try:
+            self._apply_attachments(conn)
+            yield conn
+        finally:
+            local.conn = None
+            # Commit edilmeden bırakılan yazmalar geri alınır, bildirilmez
+            local.pending_writes = {}
+            self._release(conn)
+
+    @contextmanager
+    def private_connection(self):
+        """İş parçacığının bağlantısına dokunmadan ayrı bir bağlantı ödünç verir.
+
+        Askıda kalabilen okumalar (generator'lar) için kullanılır; böylece
+        sonraki çağrılar bu bağlantıyı paylaşmaz.
+        """
+        conn = self._checkout()
+        try:
+            self._apply_attachments(conn)
+            yield conn
+        finally:
+            self._checkin(conn)
+
+    def in_transaction(self):
+        """Bu iş parçacığında açık bir iş birimi olup olmadığını döndürür"""
+        return getattr(self._local, 'tx_depth', 0) > 0
+
+    def commit(self, conn):
+        """Açık bir iş birimi yoksa commit eder; varsa commit'i ona bırakır"""
+        if not self.in_transaction():
+            if conn.in_transaction:
+                conn.commit()
+            self._flush_writes()
+
+    def record_write(self, table, operation, ids=None):
+        """Yazmayı commit sonrasında yayınlanmak üzere not eder.
+
+        ids bilinmiyorsa (ham SQL, id dışı koşul) None verilir; aynı tablo
+        ve işlem için biriken id'ler tek bir değişiklik olayında birleşir.
+        """
+        local = self._local
+        if getattr(local, 'pending_writes', None) is None:
+            local.pending_writes = {}
+        key = (table.lower(), operation)
+        if key in local.pending_writes and local.pending_writes[key] is None:
+            return
+        if ids is None:
+            local.pending_writes[key] = None
+        else:
+            local.pending_writes.setdefault(key, []).extend(i for i in ids if i is not None)
+
+    def _flush_writes(self):
+        pending = getattr(self._local, 'pending_writes', None)
+        self._local.pending_writes = {}
+        if pending:
+            changes = [TableChange(table, operation, tuple(ids) if ids is not None else None, self.database)
+                       for (table, operation), ids in pending.items()]
+            _publish_writes(changes)
+
+    @contextmanager
+    def transaction(self):
+        """Blok içindeki tüm komutları tek bağlantı ve tek commit ile çalıştırır"""
+        with self.connection() as conn:
+            local = self._local
+            if self.in_transaction():
+                # İç içe iş birimi dıştakinin içinde bir savepoint olur
+                local.tx_depth += 1
+                try:
+                    tx = Transaction(conn, self)
+                    with tx.savepoint():
+                        yield tx
+                finally:
+                    local.tx_depth -= 1
+                return
+
+            if not conn.in_transaction:
+                conn.execute('BEGIN IMMEDIATE')
+            local.tx_depth = 1
+            try:
+                yield Transaction(conn, self)
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                local.pending_writes = {}
+                raise
+            finally:
+                local.tx_depth = 0
+            self._flush_writes()
+
+    def stats(self):
+        """Havuz istatistiklerini sözlük olarak döndürür"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['open'] = self._open_count
+        stats['idle'] = self._idle.qsize()
+        return stats
+
+    def publish_reload(self):
+        """Dosya bütünüyle değiştiğinde tüm tablolar için id'siz güncelleme yayınlar"""
+        with self.connection() as conn:
+            rows = conn.execute(
+                "SELECT name, sql FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'").fetchall()
+        # FTS5 gölge tabloları (arama_data vb.) kendi sanal tablolarıyla birlikte bildirilir
+        virtual = [row[0] for row in rows if row[1].upper().startswith('CREATE VIRTUAL')]
+        tables = [row[0] for row in rows if not any(row[0].startswith(f'{v}_') for v in virtual)]
+        _publish_writes([TableChange(table, 'update', None, self.database) for table in tables])
+
+    def close_all(self):
+        """Boştaki bağlantıları kapatır; kullanımdakiler geri bırakılınca kapanır"""
+        with self._lock:
+            self._closed = True
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._attached_versions.pop(id(conn), None)
+            conn.close()
+            with self._lock:
+                self._open_count -= 1
+
+_pool = None
+_pool_lock = threading.Lock()
+# use_pool ile bu iş parçacığı için seçilmiş havuz (çoklu çiftlik)
+_thread_pool = threading.local()
+
+def get_pool():
+    """Etkin bağlantı havuzunu döndürür: use_pool ile seçilen ya da uygulama geneli"""
+    pool = getattr(_thread_pool, 'pool', None)
+    if pool is not None:
+        return pool
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool()
+    return _pool
+
+@contextmanager
+def use_pool(pool):
+    """Blok içinde bu iş parçacığındaki DatabaseManager çağrılarını pool'a yönlendirir.
+
+    iter_query üreteçleri havuzu ilk okunduklarında seçer; blok içinde
+    tüketilmelidir.
+    """
+    previous = getattr(_thread_pool, 'pool', None)
+    _thread_pool.pool = pool
+    try:
+        yield pool
+    finally:
+        _thread_pool.pool = previous
+
+def set_pool(pool):
+    """Uygulama geneli havuzu eskisini kapatmadan pool ile değiştirir"""
+    global _pool
+    with _pool_lock:
+        _pool = pool
+
+def configure_pool(database=DATABASE_NAME, max_size=DB_HAVUZ_BOYUTU, timeout=DB_BEKLEME_SURESI):
+    """Paylaşılan havuzu verilen veritabanı dosyası için yeniden kurar"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close_all()
+        _pool = ConnectionPool(database, max_size, timeout)
+    return _pool
+
+# Commit edilmiş bir yazma: tablo, işlem ('insert', 'update', 'delete'),
+# etkilenen satır id'leri (bilinmiyorsa None) ve veritabanı dosyası
+TableChange = namedtuple('TableChange', ['table', 'operation', 'ids', 'database'])
+
+_change_listeners = []
+
+def _publish_writes(changes):
+    """Commit edilen yazmaları önbelleğe ve dinleyicilere bildirir.
+
+    Dinleyiciler yazmayı yapan iş parçacığında çağrılır. Tetikleyicilerin
+    dolaylı yazdığı tablolar için id'siz bir güncelleme eklenir.
+    """
+    written = {change.table for change in changes}
+    derived = set().union(*(TRIGGER_TARGETS.get(table, ()) for table in written)) - written
+    changes = changes + [TableChange(table, 'update', None, changes[0].database) for table in sorted(derived)]
+    lookup_cache.invalidate(written | derived)
+    for listener in list(_change_listeners):
+        try:
+            listener(changes)
+        except Exception as e:
+            print(f"Değişiklik dinleyicisi hatası: {str(e)}")
+
+def _condition_ids(condition):
+    """Koşul yalnızca id ise id'yi liste olarak, değilse None döndürür"""
+    return [condition['id']] if list(condition.keys()) == ['id'] else None
+
+_savepoint_ids = count(1)
+
+class Transaction:
+    """DatabaseManager.transaction() bloğunda kullanılan iş birimi.
+
+    DatabaseManager'ın statik metotlarından farklı olarak hatalar yutulmaz,
+    yükseltilir; böylece blok geri alınır.
+    """
+
+    def __init__(self, conn, pool):
+        self.conn = conn
+        self.pool = pool
+
+    def execute_query(self, query, parameters=None):
+        """SQL sorgusu çalıştırır ve sonuçları döndürür"""
+        with profiler.measure(self.conn, query, parameters) as measurement:
+            result = self.conn.execute(query, parameters or ()).fetchall()
+            measurement.rows = len(result)
+        target = write_target(query)
+        if target:
+            self.pool.record_write(target[1], target[0])
+        return result
+
+    def insert_data(self, table, data):
+        """Belirtilen tabloya veri ekler ve yeni id'yi döndürür"""
+        columns = ', '.join(data.keys())
+        placeholders = ', '.join(['?' for _ in data])
+        query = f'INSERT INTO {table} ({columns}) VALUES ({placeholders})'
+        with profiler.measure(self.conn, query, list(data.values())) as measurement:
+            last_id = self.conn.execute(query, list(data.values())).lastrowid
+            measurement.rows = 1
+        self.pool.record_write(table, 'insert', [last_id])
+        return last_id
+
+    def update_data(self, table, data, condition):
+        """Belirtilen tablodaki veriyi günceller ve etkilenen satır sayısını döndürür"""
+        set_clause = ', '.join([f'{k} = ?' for k in data.keys()])
+        where_clause = ' AND '.join([f'{k} = ?' for k in condition.keys()])
+        query = f'UPDATE {table} SET {set_clause} WHERE {where_clause}'
+        values = list(data.values()) + list(condition.values())
+        with profiler.measure(self.conn, query, values) as measurement:
+            rowcount = measurement.rows = self.conn.execute(query, values).rowcount
+        self.pool.record_write(table, 'update', _condition_ids(condition))
+        return rowcount
+
+    @contextmanager
+    def savepoint(self):
+        """Blok hata verirse yalnızca bloğun değişikliklerini geri alır"""
+        name = f'sp_{next(_savepoint_ids)}'
+        self.conn.execute(f'SAVEPOINT {name}')
+        try:
+            yield self
+        except BaseException:
+            self.conn.execute(f'ROLLBACK TO {name}')
+            self.conn.execute(f'RELEASE {name}')
+            raise
+        self.conn.execute(f'RELEASE {name}')
+
+def _fts_query(text):
+    """Kullanıcı metnini, her kelimeyi önek olarak arayan güvenli bir FTS5 ifadesine çevirir"""
+    return ' '.join(f'"{word}"*' for word in re.findall(r'\w+', text))
+
+def _like_escape(text):
+    """Kullanıcı metnindeki LIKE joker karakterlerini ESCAPE '\\' için kaçırır"""
+    return text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+# Önek araması küpenin NOCASE indeksinden aralık olarak okunur; içerik
+# araması aynı indeksi sırasıyla tarar ve LIMIT dolunca durur
+_ANIMAL_PREFIX_QUERY = '''
+    SELECT id, kulak_kupesi FROM hayvanlar
+    WHERE kulak_kupesi LIKE ? ESCAPE '\\' AND {condition}
+    ORDER BY kulak_kupesi COLLATE NOCASE LIMIT ?
+'''
+_ANIMAL_SUBSTRING_QUERY = '''
+    SELECT id, kulak_kupesi FROM hayvanlar
+    WHERE kulak_kupesi LIKE ? ESCAPE '\\' AND kulak_kupesi NOT LIKE ? ESCAPE '\\' AND {condition}
+    ORDER BY kulak_kupesi COLLATE NOCASE LIMIT ?
+'''
+
+def _search_query(archive_schema=None):
+    """Arama sorgusunu kurar; archive_schema verilirse arşivin dizini ve tabloları da okunur.
+
+    Sayfadaki eşleşmeler kaynak kayıtla ve hayvanla birleştirilir; bm25 ve
+    snippet yalnızca FTS sorgusunun içinde çağrılabildiği için CTE'dedir.
+    Arşivdeki tablolar ayrı LEFT JOIN'lerle okunur ki id indeksleri kullanılsın.
+    """
+    schemas = ['main'] + ([archive_schema] if archive_schema else [])
+    matches = '\n        UNION ALL\n        '.join(f'''SELECT rowid, bm25(arama) AS skor,
+            snippet(arama, -1, '[', ']', '…', 12) AS ozet
+        FROM {schema}.arama
+        WHERE arama MATCH :metin''' for schema in schemas)
+
+    def column(alias, name):
+        if not archive_schema:
+            return f'{alias}.{name}'
+        return f'COALESCE({alias}.{name}, {alias}a.{name})'
+
+    def join(table, alias, condition):
+        joins = f'LEFT JOIN main.{table} {alias} ON {condition.format(alias=alias)}'
+        if archive_schema:
+            joins += f'\n    LEFT JOIN {archive_schema}.{table} {alias}a ON {condition.format(alias=alias + "a")}'
+        return joins
+
+    animal = (f"CASE WHEN sayfa.rowid % 4 = 0 THEN sayfa.rowid / 4 ELSE COALESCE("
+              f"{column('s', 'hayvan_id')}, {column('t', 'hayvan_id')}, {column('g', 'hayvan_id')}) END")
+    return f'''
+    WITH eslesme AS (
+        {matches}
+    ),
+    sayfa AS (
+        SELECT * FROM eslesme
+        ORDER BY skor
+        LIMIT :limit OFFSET :offset
+    )
+    SELECT
+        CASE sayfa.rowid % 4 {' '.join(f"WHEN {code} THEN '{table}'" for code, table in enumerate(SEARCH_TABLES))}
+        END AS tablo,
+        sayfa.rowid / 4 AS kayit_id,
+        {column('h', 'id')} AS hayvan_id,
+        {column('h', 'kulak_kupesi')} AS kulak_kupesi,
+        COALESCE({column('s', 'islem_tarihi')}, {column('t', 'tohumlama_tarihi')}, {column('g', 'tespit_tarihi')},
+                 CASE WHEN sayfa.rowid % 4 = 0 THEN {column('h', 'dogum_tarihi')} END) AS tarih,
+        sayfa.ozet,
+        sayfa.skor
+    FROM sayfa
+    {join('saglik', 's', '(sayfa.rowid % 4 = 1 AND {alias}.id = sayfa.rowid / 4)')}
+    {join('tohumlama', 't', '(sayfa.rowid % 4 = 2 AND {alias}.id = sayfa.rowid / 4)')}
+    {join('gebelik', 'g', '(sayfa.rowid % 4 = 3 AND {alias}.id = sayfa.rowid / 4)')}
+    {join('hayvanlar', 'h', '{alias}.id = ' + animal)}
+    ORDER BY sayfa.skor
+'''
+
+_SEARCH_QUERY = _search_query()
+_archive_search_queries = {}  # arşiv şema adı -> arama sorgusu
+
+# Toplu yazma sonucu: eklenen id'ler (hatalı satırlar için None),
+# etkilenen satır sayısı ve (satır sırası, hata mesajı) listesi
+BatchResult = namedtuple('BatchResult', ['ids', 'rowcount', 'errors'])
+
+def _batches(rows, chunk_size):
+    """Satırları, parça boyutunu ve sütun düzenini aşmayan gruplara böler"""
+    iterator = iter(rows)
+    offset = 0
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        start = 0
+        for i in range(1, len(chunk) + 1):
+            if i == len(chunk) or chunk[i].keys() != chunk[start].keys():
+                yield offset + start, chunk[start:i]
+                start = i
+        offset += len(chunk)
+
+def _write_batch(conn, query, batch, values_of):
+    """Bir grubu savepoint içinde executemany ile yazar.
+
+    Grup hata verirse geri alınır ve hatalı satırları bulmak için
+    satır satır yeniden yazılır. (lastrowid listesi, etkilenen satır,
+    hatalar) döndürür; lastrowid listesi yalnızca satır satır yazımda dolar.
+    """
+    cursor = conn.cursor()
+    cursor.execute('SAVEPOINT toplu_yazma')
+    try:
+        with profiler.measure(conn, query, values_of(batch[0])) as measurement:
+            cursor.executemany(query, [values_of(row) for row in batch])
+            rowcount = measurement.rows = cursor.rowcount
+        cursor.execute('RELEASE toplu_yazma')
+        return None, rowcount, []
+    except sqlite3.Error:
+        cursor.execute('ROLLBACK TO toplu_yazma')
+        cursor.execute('RELEASE toplu_yazma')
+
+    row_ids, rowcount, errors = [], 0, []
+    for i, row in enumerate(batch):
+        try:
+            cursor.execute(query, values_of(row))
+            row_ids.append(cursor.lastrowid)
+            rowcount += cursor.rowcount
+        except sqlite3.Error as e:
+            row_ids.append(None)
+            errors.append((i, str(e)))
+    return row_ids, rowcount, errors
 
 class DatabaseManager:
     @staticmethod
     def execute_query(query, parameters=None):
         """SQL sorgusu çalıştırır ve sonuçları döndürür"""
         try:
-            conn = get_db_connection()
-            cursor = conn.cursor()
-            
-            if parameters:
-                cursor.execute(query, parameters)
-            else:
-                cursor.execute(query)
+            pool = get_pool()
+            with pool.connection() as conn:
+                cursor = conn.cursor()
                 
-            conn.commit()
-            result = cursor.fetchall()
-            cursor.close()
-            conn.close()
-            return result
+                with profiler.measure(conn, query, parameters) as measurement:
+                    if parameters:
+                        cursor.execute(query, parameters)
+                    else:
+                        cursor.execute(query)
+                        
+                    result = cursor.fetchall()
+                    measurement.rows = len(result) if cursor.description else cursor.rowcount
+                target = write_target(query)
+                if target:
+                    pool.record_write(target[1], target[0])
+                pool.commit(conn)
+                cursor.close()
+                return result
         except sqlite3.Error as e:
             print(f"Sorgu hatası: {str(e)}")
             return None
 
+    @staticmethod
+    def cached_query(query, parameters=None):
+        """Okuma sorgusunu paylaşılan önbellekten ya da veritabanından döndürür.
+
+        Sonuç satırları tüm pencerelerce paylaşılan bir tuple'dır; sorgunun
+        okuduğu tablolara DatabaseManager üzerinden yazıldığında silinir.
+        """
+        pool = get_pool()
+        if pool.in_transaction():
+            # Commit edilmemiş veri önbelleğe girmemeli
+            return DatabaseManager.execute_query(query, parameters)
+        key = (pool.database, query, tuple(parameters or ()))
+        rows = lookup_cache.get(key)
+        if rows is not None:
+            return rows
+        generation = lookup_cache.generation()
+        rows = DatabaseManager.execute_query(query, parameters)
+        if rows is None:
+            return None
+        return lookup_cache.put(key, tables_read_by(query), rows, generation)
+
+    @staticmethod
+    def iter_query(query, parameters=None, batch_size=SORGU_PARCA_BOYUTU):
+        """Sorgu sonuçlarını fetchmany ile parça parça üreten generator.
+
+        Bağlantı yalnızca sonuçlar tüketilirken havuzdan ödünç alınır.
+        Açık bir iş birimi yoksa iş parçacığının bağlantısı değil ayrı bir
+        bağlantı kullanılır; askıda kalan generator diğer çağrılarla
+        bağlantı paylaşmaz. execute_query'den farklı olarak hatalar yutulmaz,
+        yükseltilir; aksi halde yarım kalan sonuç eksiksiz sanılırdı.
+        """
+        pool = get_pool()
+        # İş birimi içinde commit edilmemiş yazmaları görmek için onun bağlantısı kullanılır
+        borrow = pool.connection if pool.in_transaction() else pool.private_connection
+        with borrow() as conn:
+            cursor = conn.cursor()
+            # Yalnızca veritabanında geçen süre ölçülür; tüketicinin işlediği süre sayılmaz
+            elapsed, total, failed = 0.0, 0, False
+            try:
+                start = time.perf_counter()
+                cursor.execute(query, parameters or ())
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    elapsed += time.perf_counter() - start
+                    if not rows:
+                        break
+                    total += len(rows)
+                    yield from rows
+                    start = time.perf_counter()
+            except sqlite3.Error as e:
+                failed = True
+                print(f"Sorgu hatası: {str(e)}")
+                raise
+            finally:
+                cursor.close()
+                profiler.record(conn, query, parameters, elapsed, total, failed)
+
     @staticmethod
     def insert_data(table, data):
         """Belirtilen tabloya veri ekler"""
         try:
-            conn = get_db_connection()
-            cursor = conn.cursor()
-            
-            columns = ', '.join(data.keys())
-            placeholders = ', '.join(['?' for _ in data])
-            query = f'INSERT INTO {table} ({columns}) VALUES ({placeholders})'
-            
-            cursor.execute(query, list(data.values()))
-            conn.commit()
-            last_id = cursor.lastrowid
-            
-            cursor.close()
-            conn.close()
-            return last_id
+            pool = get_pool()
+            with pool.connection() as conn:
+                cursor = conn.cursor()
+                
+                columns = ', '.join(data.keys())
+                placeholders = ', '.join(['?' for _ in data])
+                query = f'INSERT INTO {table} ({columns}) VALUES ({placeholders})'
+                
+                with profiler.measure(conn, query, list(data.values())) as measurement:
+                    cursor.execute(query, list(data.values()))
+                    measurement.rows = 1
+                last_id = cursor.lastrowid
+                pool.record_write(table, 'insert', [last_id])
+                pool.commit(conn)
+                
+                cursor.close()
+                return last_id
         except sqlite3.Error as e:
             print(f"Veri ekleme hatası: {str(e)}")
             return None
@@ -161,22 +683,176 @@ class DatabaseManager:
     def update_data(table, data, condition):
         """Belirtilen tablodaki veriyi günceller"""
         try:
-            conn = get_db_connection()
-            cursor = conn.cursor()
-            
-            set_clause = ', '.join([f'{k} = ?' for k in data.keys()])
-            where_clause = ' AND '.join([f'{k} = ?' for k in condition.keys()])
-            query = f'UPDATE {table} SET {set_clause} WHERE {where_clause}'
-            
-            values = list(data.values()) + list(condition.values())
-            cursor.execute(query, values)
-            
-            conn.commit()
-            affected_rows = cursor.rowcount
-            
-            cursor.close()
-            conn.close()
-            return affected_rows
+            pool = get_pool()
+            with pool.connection() as conn:
+                cursor = conn.cursor()
+                
+                set_clause = ', '.join([f'{k} = ?' for k in data.keys()])
+                where_clause = ' AND '.join([f'{k} = ?' for k in condition.keys()])
+                query = f'UPDATE {table} SET {set_clause} WHERE {where_clause}'
+                
+                values = list(data.values()) + list(condition.values())
+                with profiler.measure(conn, query, values) as measurement:
+                    cursor.execute(query, values)
+                    measurement.rows = cursor.rowcount
+                pool.record_write(table, 'update', _condition_ids(condition))
+                
+                pool.commit(conn)
+                affected_rows = cursor.rowcount
+                
+                cursor.close()
+                return affected_rows
         except sqlite3.Error as e:
             print(f"Güncelleme hatası: {str(e)}")
-            return 0 
\ No newline at end of file
+            return 0
+
+    @staticmethod
+    def insert_many(table, rows, chunk_size=TOPLU_YAZMA_PARCA_BOYUTU, commit_size=TOPLU_YAZMA_COMMIT_BOYUTU):
+        """Birden çok satırı tek işlem içinde executemany ile ekler"""
+        ids, errors, total = [], [], 0
+        try:
+            pool = get_pool()
+            with pool.connection() as conn:
+                if not conn.in_transaction:
+                    conn.execute('BEGIN IMMEDIATE')
+                pending = 0
+                for offset, batch in _batches(rows, chunk_size):
+                    columns = list(batch[0].keys())
+                    column_list = ', '.join(columns)
+                    placeholders = ', '.join(['?' for _ in columns])
+                    query = f'INSERT INTO {table} ({column_list}) VALUES ({placeholders})'
+                    row_ids, rowcount, batch_errors = _write_batch(
+                        conn, query, batch, lambda row: [row[c] for c in columns])
+
+                    if row_ids is None:
+                        # Tek yazıcı olduğumuz için otomatik id'ler ardışıktır
+                        if 'id' in columns:
+                            row_ids = [row['id'] for row in batch]
+                        else:
+                            last_id = conn.execute('SELECT last_insert_rowid()').fetchone()[0]
+                            row_ids = list(range(last_id - len(batch) + 1, last_id + 1))
+                    ids.extend(row_ids)
+                    pool.record_write(table, 'insert', row_ids)
+                    errors.extend((offset + i, message) for i, message in batch_errors)
+                    total += rowcount
+
+                    pending += len(batch)
+                    if commit_size and pending >= commit_size and not pool.in_transaction():
+                        pool.commit(conn)
+                        conn.execute('BEGIN IMMEDIATE')
+                        pending = 0
+                pool.commit(conn)
+        except sqlite3.Error as e:
+            print(f"Toplu ekleme hatası: {str(e)}")
+            errors.append((len(ids), str(e)))
+        return BatchResult(ids, total, errors)
+
+    @staticmethod
+    def update_many(table, updates, chunk_size=TOPLU_YAZMA_PARCA_BOYUTU, commit_size=TOPLU_YAZMA_COMMIT_BOYUTU):
+        """(veri, koşul) çiftlerini tek işlem içinde executemany ile günceller"""
+        errors, total, done = [], 0, 0
+        # Veri ve koşul sütunları birlikte grup anahtarı olsun diye tek sözlüğe açılır
+        flat = ({**{f'set:{k}': v for k, v in data.items()},
+                 **{f'where:{k}': v for k, v in condition.items()}}
+                for data, condition in updates)
+        try:
+            pool = get_pool()
+            with pool.connection() as conn:
+                if not conn.in_transaction:
+                    conn.execute('BEGIN IMMEDIATE')
+                pending = 0
+                for offset, batch in _batches(flat, chunk_size):
+                    keys = list(batch[0].keys())
+                    set_clause = ', '.join([f'{k[4:]} = ?' for k in keys if k.startswith('set:')])
+                    where_clause = ' AND '.join([f'{k[6:]} = ?' for k in keys if k.startswith('where:')])
+                    query = f'UPDATE {table} SET {set_clause} WHERE {where_clause}'
+                    _, rowcount, batch_errors = _write_batch(
+                        conn, query, batch, lambda row: [row[k] for k in keys])
+
+                    errors.extend((offset + i, message) for i, message in batch_errors)
+                    total += rowcount
+                    done = offset + len(batch)
+                    where_keys = [k for k in keys if k.startswith('where:')]
+                    batch_ids = [row['where:id'] for row in batch] if where_keys == ['where:id'] else None
+                    pool.record_write(table, 'update', batch_ids)
+
+                    pending += len(batch)
+                    if commit_size and pending >= commit_size and not pool.in_transaction():
+                        pool.commit(conn)
+                        conn.execute('BEGIN IMMEDIATE')
+                        pending = 0
+                pool.commit(conn)
+        except sqlite3.Error as e:
+            print(f"Toplu güncelleme hatası: {str(e)}")
+            errors.append((done, str(e)))
+        return BatchResult([], total, errors)
+
+    @staticmethod
+    def search(text, limit=ARAMA_SAYFA_BOYUTU, offset=0):
+        """Notlar, işlem, ilaç ve boğa bilgilerinde serbest metin araması yapar.
+
+        Sonuçlar bm25 sırasıyla (en ilgili önce) döner; her satırda tablo,
+        kayit_id, hayvan_id, kulak_kupesi, tarih, ozet ve skor bulunur.
+        Sonraki sayfa için offset'i limit kadar artırın. Arşive taşınmış
+        kayıtlar da aranır.
+        """
+        match = _fts_query(text)
+        if not match:
+            return []
+        # archive bu modülü içe aktardığı için yalnızca gerektiğinde yüklenir
+        from archive import ARCHIVE_SCHEMA, needs_archive
+        query = _SEARCH_QUERY
+        if needs_archive('arama'):
+            query = _archive_search_queries.get(ARCHIVE_SCHEMA)
+            if query is None:
+                query = _archive_search_queries[ARCHIVE_SCHEMA] = _search_query(ARCHIVE_SCHEMA)
+        return DatabaseManager.execute_query(query, {'metin': match, 'limit': limit, 'offset': offset})
+
+    @staticmethod
+    def find_animals(text, condition='1', limit=SECICI_EN_FAZLA_SONUC):
+        """Küpesi text ile başlayan, yer kalırsa text'i içeren en fazla limit hayvanı döndürür.
+
+        Büyük/küçük harf duyarsızdır; satırlarda id ve kulak_kupesi bulunur.
+        condition hayvanlar tablosu üzerinde ek bir SQL koşuludur
+        (queries.DISI_KOSULU gibi). Sorgu hatasında None döner.
+        """
+        pattern = _like_escape(text)
+        rows = DatabaseManager.execute_query(_ANIMAL_PREFIX_QUERY.format(condition=condition),
+                                             (pattern + '%', limit))
+        if rows is None or len(rows) >= limit:
+            return rows
+        more = DatabaseManager.execute_query(_ANIMAL_SUBSTRING_QUERY.format(condition=condition),
+                                             ('%' + pattern + '%', pattern + '%', limit - len(rows)))
+        return list(rows) + list(more or [])
+
+    @staticmethod
+    def transaction():
+        """with DatabaseManager.transaction() as tx: bloğu için iş birimi açar"""
+        return get_pool().transaction()
+
+    @staticmethod
+    def subscribe(listener):
+        """Commit edilen her yazma grubu için listener(changes) çağrılmasını sağlar"""
+        if listener not in _change_listeners:
+            _change_listeners.append(listener)
+
+    @staticmethod
+    def unsubscribe(listener):
+        """subscribe ile eklenen dinleyiciyi kaldırır"""
+        if listener in _change_listeners:
+            _change_listeners.remove(listener)
+
+    @staticmethod
+    def cache_stats():
+        """Paylaşılan sorgu önbelleğinin istatistiklerini döndürür"""
+        return lookup_cache.stats()
+
+    @staticmethod
+    def pool_stats():
+        """Paylaşılan bağlantı havuzunun istatistiklerini döndürür"""
+        return get_pool().stats()
+
+    @staticmethod
+    def query_stats():
+        """Sorgu profilini döndürür (config.SORGU_PROFILI_ACIK kapalıysa boştur)"""
+        return profiler.summary() 
\ No newline at end of file
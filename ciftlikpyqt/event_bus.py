@@ -0,0 +1,55 @@
+from PyQt6.QtCore import QObject, pyqtSignal
+from database import DatabaseManager
+
+class EventBus(QObject):
+    """DatabaseManager yazmalarını Qt sinyali olarak yayınlayan olay yolu.
+
+    Yazma hangi iş parçacığında commit edilirse edilsin, ana iş
+    parçacığındaki pencerelere sıraya alınmış bağlantıyla ulaşır.
+    """
+
+    # database.TableChange: tablo, işlem, satır id'leri, veritabanı
+    table_changed = pyqtSignal(object)
+
+    _instance = None
+
+    @classmethod
+    def instance(cls):
+        """Uygulama genelinde paylaşılan olay yolunu döndürür"""
+        if cls._instance is None:
+            cls._instance = cls()
+            DatabaseManager.subscribe(cls._instance._publish)
+        return cls._instance
+
+    def _publish(self, changes):
+        for change in changes:
+            self.table_changed.emit(change)
+
+def id_placeholders(ids):
+    """IN (...) ifadesi için soru işareti listesi üretir"""
+    return ', '.join(['?' for _ in ids])
+
+# Bundan fazla satırı etkileyen değişikliklerde tam yükleme daha ucuzdur
+MAX_DELTA_IDS = 500
+
+def delta_applicable(change):
+    """Değişikliğin satır düzeyinde uygulanıp uygulanamayacağını döndürür"""
+    return (change.operation in ('insert', 'update') and change.ids is not None
+            and len(change.ids) <= MAX_DELTA_IDS)
+
+def apply_combo_delta(combo, ids, rows, label, prepend=False):
+    """ids için yeniden okunan satırları QComboBox'a uygular"""
+    rows_by_id = {row['id']: row for row in rows}
+    for row_id in ids:
+        index = combo.findData(row_id)
+        row = rows_by_id.get(row_id)
+        if index >= 0:
+            if row is None:
+                combo.removeItem(index)
+            else:
+                combo.setItemText(index, label(row))
+        elif row is not None:
+            if prepend:
+                combo.insertItem(0, label(row), row_id)
+            else:
+                combo.addItem(label(row), row_id)
@@ -0,0 +1,188 @@
+import json
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from heapq import merge
+from config import DATABASE_NAME, CIFTLIK_KAYIT_DOSYASI, VARSAYILAN_CIFTLIK
+from database import ConnectionPool, DatabaseManager, create_database, get_pool, set_pool, use_pool
+
+# Sorgularda ve raporlarda tüm çiftlikleri seçen ad
+ALL_FARMS = '*'
+
+_registry = None  # {'aktif': ad, 'ciftlikler': {ad: veritabanı dosyası}}
+_pools = {}  # ad -> ConnectionPool
+_lock = threading.RLock()
+
+def _load_registry():
+    global _registry
+    if _registry is not None:
+        return _registry
+    try:
+        with open(CIFTLIK_KAYIT_DOSYASI, encoding='utf-8') as f:
+            _registry = json.load(f)
+    except FileNotFoundError:
+        _registry = {'aktif': VARSAYILAN_CIFTLIK, 'ciftlikler': {VARSAYILAN_CIFTLIK: DATABASE_NAME}}
+    except (OSError, ValueError) as e:
+        print(f"Çiftlik kaydı okunamadı: {str(e)}")
+        _registry = {'aktif': VARSAYILAN_CIFTLIK, 'ciftlikler': {VARSAYILAN_CIFTLIK: DATABASE_NAME}}
+    return _registry
+
+def _save_registry():
+    try:
+        with open(CIFTLIK_KAYIT_DOSYASI, 'w', encoding='utf-8') as f:
+            json.dump(_registry, f, ensure_ascii=False, indent=2)
+    except OSError as e:
+        print(f"Çiftlik kaydı yazılamadı: {str(e)}")
+
+def list_farms():
+    """Kayıtlı çiftliklerin adlarını kayıt sırasıyla döndürür"""
+    with _lock:
+        return list(_load_registry()['ciftlikler'])
+
+def farm_path(name):
+    """Çiftliğin veritabanı dosyasını döndürür"""
+    with _lock:
+        return _load_registry()['ciftlikler'][name]
+
+def register_farm(name, path):
+    """Yeni bir çiftlik veritabanını kaydeder; dosya yoksa şemasıyla oluşturulur"""
+    if name == ALL_FARMS:
+        raise ValueError(f"'{ALL_FARMS}' çiftlik adı olarak kullanılamaz")
+    with _lock:
+        farms = _load_registry()['ciftlikler']
+        if name in farms:
+            raise ValueError(f"'{name}' adlı çiftlik zaten kayıtlı")
+        if any(os.path.abspath(p) == os.path.abspath(path) for p in farms.values()):
+            raise ValueError(f"{path} başka bir çiftliğe ait")
+        create_database(path)
+        farms[name] = path
+        _save_registry()
+
+def unregister_farm(name):
+    """Çiftliği kayıttan çıkarır ve havuzunu kapatır; veritabanı dosyası silinmez"""
+    with _lock:
+        registry = _load_registry()
+        if name == registry['aktif']:
+            raise ValueError("Etkin çiftlik kayıttan çıkarılamaz")
+        del registry['ciftlikler'][name]
+        _save_registry()
+        pool = _pools.pop(name, None)
+    if pool is not None:
+        pool.close_all()
+
+def farm_pool(name):
+    """Çiftliğin bağlantı havuzunu döndürür; ilk kullanımda açılır ve şeması güncellenir"""
+    with _lock:
+        pool = _pools.get(name)
+        if pool is None:
+            path = farm_path(name)
+            create_database(path)
+            pool = _pools[name] = ConnectionPool(path)
+        return pool
+
+def active_farm():
+    """Uygulamanın etkin çiftliğinin adını döndürür"""
+    with _lock:
+        return _load_registry()['aktif']
+
+def activate_farm(name):
+    """Uygulama geneli havuzu çiftliğin havuzuna geçirir.
+
+    Açık ekranlar ve önbellekler, tüm tablolar için yayınlanan değişiklik
+    olayıyla yeni çiftliğin verisini yükler.
+    """
+    with _lock:
+        pool = farm_pool(name)
+        registry = _load_registry()
+        changed = registry['aktif'] != name
+        registry['aktif'] = name
+        if changed:
+            _save_registry()
+        previous = get_pool()
+        set_pool(pool)
+    if previous is not pool and previous not in _pools.values():
+        previous.close_all()
+    if changed:
+        pool.publish_reload()
+    return pool
+
+@contextmanager
+def use_farm(name):
+    """Blok içinde bu iş parçacığındaki sorguları ve yazmaları çiftliğe yönlendirir"""
+    with use_pool(farm_pool(name)) as pool:
+        yield pool
+
+def _resolve(farms):
+    if farms is None or farms == ALL_FARMS:
+        return list_farms()
+    if isinstance(farms, str):
+        return [farms]
+    return list(farms)
+
+def fan_out(fn, *args, farms=None, **kwargs):
+    """fn(*args, **kwargs) çağrısını her çiftlikte paralel çalıştırır.
+
+    Her çağrı kendi iş parçacığında, use_farm içinde çalışır; sonuçlar
+    çiftlik adı -> sonuç sözlüğü olarak kayıt sırasıyla döner. Hata veren
+    çiftliğin sonucu None olur.
+    """
+    names = _resolve(farms)
+
+    def run(name):
+        try:
+            with use_farm(name):
+                return fn(*args, **kwargs)
+        except Exception as e:
+            print(f"{name} çiftliğinde hata: {str(e)}")
+            return None
+
+    if len(names) == 1:
+        return {names[0]: run(names[0])}
+    with ThreadPoolExecutor(max_workers=len(names)) as executor:
+        results = list(executor.map(run, names))
+    return dict(zip(names, results))
+
+def merge_results(results, key=None, reverse=False):
+    """fan_out sonuç listelerini (çiftlik, satır) çiftleri olarak birleştirir.
+
+    key verilirse her çiftliğin sonucu key'e göre sıralı kabul edilir
+    (sorgunun ORDER BY'ı) ve sıra bozulmadan birleştirilir; verilmezse
+    çiftlikler kayıt sırasıyla art arda gelir.
+    """
+    parts = [[(name, row) for row in rows or []] for name, rows in results.items()]
+    if key is None:
+        return [item for part in parts for item in part]
+    return list(merge(*parts, key=lambda item: key(item[1]), reverse=reverse))
+
+def federated_query(query, parameters=None, farms=None, key=None, reverse=False):
+    """Sorguyu çiftliklerde paralel çalıştırıp (çiftlik, satır) çiftlerini döndürür"""
+    return merge_results(fan_out(DatabaseManager.execute_query, query, parameters, farms=farms),
+                         key, reverse)
+
+def main():
+    komut = sys.argv[1] if len(sys.argv) > 1 else 'listele'
+    try:
+        if komut == 'ekle' and len(sys.argv) == 4:
+            register_farm(sys.argv[2], sys.argv[3])
+            print(f"'{sys.argv[2]}' kaydedildi: {sys.argv[3]}")
+        elif komut == 'sil' and len(sys.argv) == 3:
+            unregister_farm(sys.argv[2])
+            print(f"'{sys.argv[2]}' kayıttan çıkarıldı")
+        elif komut == 'etkin' and len(sys.argv) == 3:
+            activate_farm(sys.argv[2])
+            print(f"Etkin çiftlik: {sys.argv[2]}")
+        elif komut == 'listele':
+            aktif = active_farm()
+            for name in list_farms():
+                print(f"{'*' if name == aktif else ' '} {name}: {farm_path(name)}")
+        else:
+            print("Kullanım: python farms.py [listele | ekle AD DOSYA | sil AD | etkin AD]")
+            sys.exit(1)
+    except (KeyError, ValueError) as e:
+        print(f"Hata: {str(e)}")
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,181 @@
+import heapq
+import threading
+from array import array
+from database import DatabaseManager, get_pool
+
+class InbreedingEngine:
+    """Sürünün akrabalık katsayılarını Meuwissen ve Luo (1992) yöntemiyle hesaplar.
+
+    Hayvanlar ebeveynleri önce gelecek şekilde 1'den numaralanır; baba,
+    anne, akrabalık katsayısı (F) ve Mendel örnekleme varyansı (D) bu
+    numarayla dizilerde tutulur. 0 bilinmeyen ebeveyndir (F = -1). Tam
+    kardeşler bir önceki hayvanın katsayısını kullanır, olası yavruların
+    katsayıları saklanır. Yeni hayvanlar sona eklenir; ebeveyn değişikliği
+    ya da silme bir sonraki çağrıda tam yeniden yüklemeye yol açar.
+    """
+
+    def __init__(self, database):
+        self.database = database
+        self._lock = threading.Lock()
+        self._stale = True
+        self._pending = []  # yüklemeden sonra eklenen hayvanların id'leri
+        DatabaseManager.subscribe(self._on_changes)
+
+    def _on_changes(self, changes):
+        for change in changes:
+            if change.database != self.database or change.table != 'hayvanlar':
+                continue
+            with self._lock:
+                if change.operation == 'insert' and change.ids is not None:
+                    self._pending.extend(change.ids)
+                else:
+                    self._stale = True
+
+    def _reset(self):
+        self._ids = array('q', [0])
+        self._positions = {}
+        self._sire = array('l', [0])
+        self._dam = array('l', [0])
+        self._f = array('d', [-1.0])
+        self._d = array('d', [0.0])
+        self._calves = {}
+
+    def _append(self, hayvan_id, anne_id, baba_id):
+        i = len(self._ids)
+        s = self._positions.get(baba_id, 0)
+        d = self._positions.get(anne_id, 0)
+        self._ids.append(hayvan_id)
+        self._positions[hayvan_id] = i
+        self._sire.append(s)
+        self._dam.append(d)
+        if s and d and self._sire[i - 1] == s and self._dam[i - 1] == d:
+            f = self._f[i - 1]
+        else:
+            f = self._coefficient(s, d)
+        self._f.append(f)
+        self._d.append(0.5 - 0.25 * (self._f[s] + self._f[d]))
+
+    def _coefficient(self, s, d):
+        """Babası s, annesi d olan (gerçek ya da olası) yavrunun F değeri.
+
+        F = a_ii - 1 ve a_ii = sum(L_ij^2 * D_j); L satırı yavrudan
+        atalara, en büyük numaradan başlanarak yarıya bölünerek yayılır.
+        Böylece her ata, tüm torunlarının payı toplandıktan sonra işlenir.
+        """
+        if not s or not d:
+            return 0.0
+        total = 0.5 - 0.25 * (self._f[s] + self._f[d])
+        weights = {s: 0.5}
+        weights[d] = weights.get(d, 0.0) + 0.5
+        heap = [-j for j in weights]
+        heapq.heapify(heap)
+        while heap:
+            j = -heapq.heappop(heap)
+            w = weights.pop(j)
+            total += w * w * self._d[j]
+            for p in (self._sire[j], self._dam[j]):
+                if not p:
+                    continue
+                if p in weights:
+                    weights[p] += 0.5 * w
+                else:
+                    weights[p] = 0.5 * w
+                    heapq.heappush(heap, -p)
+        return total - 1.0
+
+    def _load(self):
+        rows = DatabaseManager.execute_query('SELECT id, anne_id, baba_id FROM hayvanlar ORDER BY id') or []
+        parents = {row['id']: (row['anne_id'], row['baba_id']) for row in rows}
+        self._reset()
+        # Ebeveynleri önce gelecek sıralama; kayıt sırası genellikle zaten uygundur
+        visiting = set()
+        for hayvan_id in parents:
+            stack = [hayvan_id]
+            while stack:
+                current = stack[-1]
+                if current in self._positions:
+                    stack.pop()
+                    continue
+                visiting.add(current)
+                waiting = [p for p in parents[current]
+                           if p in parents and p not in self._positions and p not in visiting]
+                if waiting:
+                    stack.extend(waiting)
+                    continue
+                stack.pop()
+                visiting.discard(current)
+                self._append(current, *parents[current])
+        self._stale = False
+        self._pending = []
+
+    def _refresh(self):
+        """Bekleyen değişiklikleri uygular; kilit tutulurken çağrılır"""
+        if self._stale:
+            self._load()
+            return
+        if not self._pending:
+            return
+        ids = self._pending
+        self._pending = []
+        placeholders = ', '.join(['?' for _ in ids])
+        rows = DatabaseManager.execute_query(
+            f'SELECT id, anne_id, baba_id FROM hayvanlar WHERE id IN ({placeholders}) ORDER BY id', ids) or []
+        for row in rows:
+            if row['id'] in self._positions:
+                continue
+            if any(p is not None and p not in self._positions for p in (row['anne_id'], row['baba_id'])):
+                # Ebeveyni henüz yüklenmemiş hayvan sıralamayı bozar
+                self._load()
+                return
+            self._append(row['id'], row['anne_id'], row['baba_id'])
+
+    def inbreeding(self, hayvan_id):
+        """Hayvanın akrabalık katsayısını döndürür (bilinmeyen hayvan için None)"""
+        with self._lock:
+            self._refresh()
+            i = self._positions.get(hayvan_id)
+            return self._f[i] if i is not None else None
+
+    def herd_inbreeding(self):
+        """Tüm sürü için id -> akrabalık katsayısı sözlüğü döndürür"""
+        with self._lock:
+            self._refresh()
+            return dict(zip(self._ids[1:], self._f[1:]))
+
+    def calf_inbreeding(self, baba_id, anne_id):
+        """Baba ve annenin olası yavrusunun akrabalık katsayısını döndürür"""
+        with self._lock:
+            self._refresh()
+            return self._calf(self._positions.get(baba_id, 0), self._positions.get(anne_id, 0))
+
+    def _calf(self, s, d):
+        key = (s, d)
+        f = self._calves.get(key)
+        if f is None:
+            f = self._calves[key] = self._coefficient(s, d)
+        return f
+
+    def rank_sires(self, anne_id):
+        """Sürüdeki etkin boğaları inekle olası yavrunun F değerine göre sıralar"""
+        sires = DatabaseManager.execute_query(
+            "SELECT id, kulak_kupesi FROM hayvanlar WHERE cinsiyet = 'Erkek' AND durum = 'Aktif'") or []
+        with self._lock:
+            self._refresh()
+            d = self._positions.get(anne_id, 0)
+            ranked = [{'id': sire['id'], 'kulak_kupesi': sire['kulak_kupesi'],
+                       'akrabalik': self._calf(self._positions.get(sire['id'], 0), d)}
+                      for sire in sires]
+        ranked.sort(key=lambda item: (item['akrabalik'], item['kulak_kupesi']))
+        return ranked
+
+_engines = {}
+_engines_lock = threading.Lock()
+
+def get_engine():
+    """Etkin veritabanının akrabalık motorunu döndürür"""
+    database = get_pool().database
+    with _engines_lock:
+        engine = _engines.get(database)
+        if engine is None:
+            engine = _engines[database] = InbreedingEngine(database)
+        return engine
@@ -0,0 +1,134 @@
+import sqlite3
+import threading
+from datetime import date
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+from database import DatabaseManager, get_pool
+from async_query import AsyncQueryExecutor
+from event_bus import EventBus
+from cache import tables_read_by
+from queries import GOSTERGELER, kpi_parameters
+from config import GOSTERGE_BEKLEME_MS, GOSTERGE_YOKLAMA_MS, DB_PRAGMALARI
+
+class KpiCache(QObject):
+    """Anasayfa göstergelerini saklayan ve yalnızca gerektiğinde yenileyen önbellek.
+
+    Her gösterge okuduğu tablolarla etiketlenir. Bu süreçteki yazmalar olay
+    yolundan gelir ve yalnızca o tabloyu okuyan göstergeleri eskitir; ardından
+    PRAGMA data_version yeniden okunup bu yazmalar sürüme işlenir. Böylece
+    yoklamada görülen her sürüm değişikliği başka bir sürecin (komut satırı,
+    API sunucusu) yazmasıdır ve tüm göstergeleri eskitir. Gün değişince
+    tarihe bağlı göstergeler de yeniden hesaplanır. Eskiyen göstergeler
+    yalnızca izleyen bir ekran varken ve arayüz iş parçacığı dışında okunur.
+    """
+
+    # Gösterge adı, yeni değeri
+    kpi_changed = pyqtSignal(str, object)
+
+    _instance = None
+
+    @classmethod
+    def instance(cls):
+        """Uygulama genelinde paylaşılan gösterge önbelleğini döndürür"""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.executor = AsyncQueryExecutor.instance()
+        self.values = {}  # gösterge adı -> son okunan değer
+        self._tables = {name: tables_read_by(query) for name, (query, _) in GOSTERGELER.items()}
+        self._stale = set(GOSTERGELER)
+        self._day = None
+        self._watchers = 0
+        self._version = None  # (veritabanı, data_version)
+        self._local_writes = False  # son denetimden beri bu süreçte yazma oldu mu
+        self._version_conn = None  # data_version için ayrı bağlantı: (veritabanı, bağlantı)
+        self._version_lock = threading.Lock()
+
+        # Toplu kayıtlarda her yazma için ayrı okuma yapılmasın
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(GOSTERGE_BEKLEME_MS)
+        self.timer.timeout.connect(self.check_version)
+        self.poll_timer = QTimer(self)
+        self.poll_timer.setInterval(GOSTERGE_YOKLAMA_MS)
+        self.poll_timer.timeout.connect(self.check_version)
+        EventBus.instance().table_changed.connect(self.table_changed)
+
+    def watch(self):
+        """Göstergeleri izleyen bir ekran açıldı; eskiyenler ve dış yazmalar denetlenir"""
+        self._watchers += 1
+        if self._watchers == 1:
+            self.poll_timer.start()
+        self.check_version()
+
+    def unwatch(self):
+        """İzleyen ekran kapandı; son izleyici gidince yoklama ve yenileme durur"""
+        self._watchers = max(0, self._watchers - 1)
+        if not self._watchers:
+            self.poll_timer.stop()
+
+    def table_changed(self, change):
+        """Bu süreçteki yazmanın okuduğu tabloya bağlı göstergeleri eskitir"""
+        if change.database != get_pool().database:
+            return
+        self._local_writes = True
+        self._stale |= {name for name, tables in self._tables.items() if change.table in tables}
+        # Ekran kapalıyken de sürüm güncel tutulur; açılınca yerel yazmalar dış yazma sanılmasın
+        self.timer.start()
+
+    def check_version(self):
+        """data_version'ı arka planda okuyup başka süreçlerin yazmalarını denetler"""
+        self.executor.submit((id(self), 'surum'), self._read_version, on_result=self._version_read,
+                             on_error=lambda e: print(f"Veritabanı sürümü okunamadı: {str(e)}"))
+
+    def _read_version(self):
+        database = get_pool().database
+        with self._version_lock:
+            if self._version_conn is None or self._version_conn[0] != database:
+                if self._version_conn is not None:
+                    self._version_conn[1].close()
+                conn = sqlite3.connect(database, timeout=DB_PRAGMALARI['busy_timeout'] / 1000,
+                                       check_same_thread=False)
+                self._version_conn = (database, conn)
+            return database, self._version_conn[1].execute('PRAGMA data_version').fetchone()[0]
+
+    def _version_read(self, version):
+        # Bu süreçteki yazmalar da sürümü değiştirir; onları olay yolu zaten bildirdi.
+        # Yerel yazmayla aynı bekleme süresinde commit edilen bir dış yazma bu yüzden
+        # göstergelere ancak bir sonraki dış yazmayla ya da ilgili tabloya yerel yazmayla yansır.
+        if self._version is not None and version != self._version and not self._local_writes:
+            self._stale |= set(GOSTERGELER)
+        self._version = version
+        self._local_writes = False
+        self.refresh()
+
+    def refresh(self):
+        """Eskiyen göstergeleri arka planda okur"""
+        if not self._watchers:
+            return
+        today = date.today()
+        if today != self._day:
+            self._day = today
+            self._stale |= set(GOSTERGELER)
+        parameters = kpi_parameters(today)
+        stale, self._stale = self._stale, set()
+        for name in stale:
+            query, many = GOSTERGELER[name]
+            # Aynı anahtarla yeni istek, okunurken eskiyen isteğin sonucunu iptal eder
+            self.executor.submit((id(self), 'gosterge', name),
+                                 lambda q=query: list(DatabaseManager.iter_query(q, parameters)),
+                                 on_result=lambda rows, n=name, m=many: self._loaded(n, m, rows),
+                                 on_error=lambda e, n=name: self._failed(n, e))
+
+    def _loaded(self, name, many, rows):
+        value = [tuple(row) for row in rows] if many else rows[0][0]
+        if name not in self.values or self.values[name] != value:
+            self.values[name] = value
+            self.kpi_changed.emit(name, value)
+
+    def _failed(self, name, error):
+        # Sonraki denetimde yeniden denenir
+        print(f"Gösterge okunamadı ({name}): {str(error)}")
+        self._stale.add(name)
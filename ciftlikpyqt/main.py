@@ -1,19 +1,44 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import time
+ACILIS = time.perf_counter()  # açılış süreleri bu andan ölçülür
+
+import argparse
+import importlib
 import sys
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QStackedWidget, 
-                            QVBoxLayout, QWidget)
+                            QVBoxLayout, QHBoxLayout, QWidget, QLineEdit, QComboBox)
+from PyQt6.QtCore import QTimer, pyqtSignal
+
+from config import SAYFA_ON_ISITMA, ACILIS_ZAMANLAMASI
+from database import create_database, configure_pool
+from farms import list_farms, active_farm, activate_farm
+from async_query import AsyncQueryExecutor
+from backup import create_backup, backup_due
+
+# Yığındaki sıralarıyla sayfalar: (öznitelik, modül, sınıf). Modüller ve
+# sayfalar ilk açıldıklarında yüklenir.
+SAYFALAR = [
+    ('anasayfa', 'ui.anasayfa', 'Anasayfa'),  # Index 0
+    ('hayvan_kayit', 'ui.hayvan_kayit', 'HayvanKayit'),  # Index 1
+    ('tohumlama', 'ui.tohumlama', 'Tohumlama'),  # Index 2
+    ('gebelik', 'ui.gebelik', 'Gebelik'),  # Index 3
+    ('saglik', 'ui.saglik', 'Saglik'),  # Index 4
+    ('raporlar', 'ui.raporlar', 'RaporlarWidget'),  # Index 5
+    ('arama', 'ui.arama', 'Arama'),  # Index 6
+]
+ARAMA_SAYFASI = 6
 
-from database import create_database
-from ui.anasayfa import Anasayfa
-from ui.hayvan_kayit import HayvanKayit
-from ui.tohumlama import Tohumlama
-from ui.gebelik import Gebelik
-from ui.saglik import Saglik
-from reports import RaporlarWidget
+def acilis_adimi(ad, baslangic=ACILIS):
+    """Açılış zamanlaması açıksa adımın baslangic'tan bu yana süresini yazdırır"""
+    if ACILIS_ZAMANLAMASI:
+        print(f"Açılış: {ad} {1000 * (time.perf_counter() - baslangic):.0f} ms", flush=True)
 
 class AnaPencere(QMainWindow):
+    # Yedekleme iş parçacığından gelen ilerleme: kopyalanan ve toplam sayfa
+    yedek_ilerleme = pyqtSignal(int, int)
+    
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Çiftlik Yönetim Sistemi")
@@ -24,46 +49,166 @@ class AnaPencere(QMainWindow):
         self.setCentralWidget(self.central_widget)
         self.layout = QVBoxLayout(self.central_widget)
         
+        # Tüm sayfalarda görünen genel arama kutusu
+        self.arama_kutusu = QLineEdit()
+        self.arama_kutusu.setPlaceholderText("Notlarda, işlemlerde, ilaçlarda ve boğa bilgilerinde ara...")
+        self.arama_kutusu.setClearButtonEnabled(True)
+        ust_layout = QHBoxLayout()
+        ust_layout.addWidget(self.arama_kutusu)
+        
+        # Birden fazla çiftlik kayıtlıysa etkin çiftlik buradan değiştirilir
+        self.ciftlik_secici = QComboBox()
+        self.ciftlik_secici.addItems(list_farms())
+        self.ciftlik_secici.setCurrentText(active_farm())
+        self.ciftlik_secici.setVisible(self.ciftlik_secici.count() > 1)
+        self.ciftlik_secici.currentTextChanged.connect(self.ciftlik_degistir)
+        ust_layout.addWidget(self.ciftlik_secici)
+        self.layout.addLayout(ust_layout)
+        
+        # Yazarken her tuşta değil, yazma durunca aranır
+        self.arama_zamanlayici = QTimer(self)
+        self.arama_zamanlayici.setSingleShot(True)
+        self.arama_zamanlayici.setInterval(300)
+        self.arama_zamanlayici.timeout.connect(self.ara)
+        self.arama_kutusu.textChanged.connect(lambda: self.arama_zamanlayici.start())
+        self.arama_kutusu.returnPressed.connect(self.ara)
+        
         # Sayfalar için StackedWidget
         self.stacked_widget = QStackedWidget()
         self.layout.addWidget(self.stacked_widget)
         
-        # Sayfaları oluştur ve ekle
-        self.anasayfa = Anasayfa(self)
-        self.hayvan_kayit = HayvanKayit(self)
-        self.tohumlama = Tohumlama(self)
-        self.gebelik = Gebelik(self)
-        self.saglik = Saglik(self)
-        self.raporlar = RaporlarWidget(self)
-        
-        # Sayfaları stack'e ekle
-        self.stacked_widget.addWidget(self.anasayfa)  # Index 0
-        self.stacked_widget.addWidget(self.hayvan_kayit)  # Index 1
-        self.stacked_widget.addWidget(self.tohumlama)  # Index 2
-        self.stacked_widget.addWidget(self.gebelik)  # Index 3
-        self.stacked_widget.addWidget(self.saglik)  # Index 4
-        self.stacked_widget.addWidget(self.raporlar)  # Index 5
+        # Sayfalar ilk açılana kadar boş yer tutucularla temsil edilir;
+        # kurulmamış sayfanın özniteliği None'dır
+        for ad, _, _ in SAYFALAR:
+            setattr(self, ad, None)
+            self.stacked_widget.addWidget(QWidget())
+        self.ilk_cizim_yapildi = False
         
         # Başlangıçta anasayfayı göster
-        self.stacked_widget.setCurrentIndex(0)
+        self.sayfa_degistir(0)
+        
+        # Zamanlanmış çevrimiçi yedek saatte bir denetlenir; ilk denetim
+        # açılışı yavaşlatmamak için bir dakika sonra yapılır
+        self.yedek_ilerleme.connect(self.yedek_ilerlemesi)
+        self.yedek_zamanlayici = QTimer(self)
+        self.yedek_zamanlayici.setInterval(60 * 60 * 1000)
+        self.yedek_zamanlayici.timeout.connect(self.yedek_kontrol)
+        self.yedek_zamanlayici.start()
+        QTimer.singleShot(60 * 1000, self.yedek_kontrol)
     
     def sayfa_degistir(self, index):
         """Belirtilen indexteki sayfaya geçiş yapar"""
         if 0 <= index < self.stacked_widget.count():
-            self.stacked_widget.setCurrentIndex(index)
+            self.stacked_widget.setCurrentWidget(self.sayfa(index))
+    
+    def sayfa(self, index):
+        """index'teki sayfayı döndürür; sayfa ilk istendiğinde kurulur"""
+        ad, modul, sinif = SAYFALAR[index]
+        widget = getattr(self, ad)
+        if widget is None:
+            baslangic = time.perf_counter()
+            widget = getattr(importlib.import_module(modul), sinif)(self)
+            setattr(self, ad, widget)
+            yer_tutucu = self.stacked_widget.widget(index)
+            self.stacked_widget.insertWidget(index, widget)
+            self.stacked_widget.removeWidget(yer_tutucu)
+            yer_tutucu.deleteLater()
+            acilis_adimi(f"sayfa {ad}", baslangic)
+        return widget
+    
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self.ilk_cizim_yapildi:
+            self.ilk_cizim_yapildi = True
+            # Çizim olayı tamamlandıktan sonra çalışır
+            QTimer.singleShot(0, self.ilk_cizimden_sonra)
+    
+    def ilk_cizimden_sonra(self):
+        """Pencere ilk kez çizildikten sonra açılmamış sayfaları kurmaya başlar"""
+        acilis_adimi("ilk çizim")
+        if ACILIS_ZAMANLAMASI == 'cik':
+            QApplication.instance().quit()
+        elif SAYFA_ON_ISITMA:
+            QTimer.singleShot(0, self.sayfa_isit)
+    
+    def sayfa_isit(self):
+        """Kurulmamış ilk sayfayı kurar; her olay döngüsü turunda bir sayfa kurulur.
+        
+        Widget'lar yalnızca arayüz iş parçacığında kurulabilir; sayfaların
+        ilk sorguları zaten arka planda çalışır. Kullanıcı olayları sayfalar
+        arasında işlenir.
+        """
+        for index, (ad, _, _) in enumerate(SAYFALAR):
+            if getattr(self, ad) is None:
+                self.sayfa(index)
+                QTimer.singleShot(0, self.sayfa_isit)
+                return
+    
+    def ara(self):
+        """Arama kutusundaki metni arar ve sonuç sayfasını gösterir"""
+        self.arama_zamanlayici.stop()
+        metin = self.arama_kutusu.text().strip()
+        arama = self.sayfa(ARAMA_SAYFASI)
+        if len(metin) < 2 or (metin == arama.metin and self.stacked_widget.currentWidget() is arama):
+            return
+        arama.ara(metin)
+        self.stacked_widget.setCurrentWidget(arama)
+    
+    def ciftlik_degistir(self, ad):
+        """Etkin çiftliği değiştirir; açık ekranlar yeni çiftliğin verisini yükler"""
+        activate_farm(ad)
+        if self.arama is not None and self.arama.metin:
+            self.arama.ara(self.arama.metin)
+    
+    def yedek_kontrol(self):
+        """Son yedeğin üzerinden yeterli süre geçtiyse arka planda yeni yedek alır"""
+        executor = AsyncQueryExecutor.instance()
+        if executor.is_pending((id(self), 'yedek')) or not backup_due():
+            return
+        executor.submit((id(self), 'yedek'), create_backup, progress=self.yedek_ilerleme.emit,
+                        on_result=self.yedek_tamamlandi, on_error=self.yedek_hatasi)
+    
+    def yedek_ilerlemesi(self, kopyalanan, toplam):
+        """Yedeğin ilerlemesini durum çubuğunda gösterir"""
+        self.statusBar().showMessage(f"Yedek alınıyor: %{100 * kopyalanan // max(toplam, 1)}")
+    
+    def yedek_tamamlandi(self, sonuc):
+        """Tamamlanan yedeğin boyutunu ve hızını durum çubuğunda gösterir"""
+        self.statusBar().showMessage(
+            f"Yedek alındı: {sonuc['path']} ({sonuc['bytes'] / 1e6:.1f} MB, "
+            f"{(sonuc['bytes_per_second'] or 0) / 1e6:.1f} MB/s)", 10000)
+    
+    def yedek_hatasi(self, hata):
+        """Yedek alınamazsa kullanıcıyı durum çubuğundan bilgilendirir"""
+        print(f"Yedek alınamadı: {str(hata)}")
+        self.statusBar().showMessage(f"Yedek alınamadı: {str(hata)}", 10000)
     
     def anasayfaya_don(self):
         """Anasayfaya dönüş yapar"""
         self.stacked_widget.setCurrentIndex(0)
 
 def main():
-    # Veritabanını oluştur
-    create_database()
+    # Qt'nin kendi seçenekleri QApplication'a bırakılır
+    parser = argparse.ArgumentParser(description="Çiftlik Yönetim Sistemi")
+    parser.add_argument('--veritabani', metavar='DOSYA', help="çiftlik kaydı yerine doğrudan veritabanı dosyası")
+    args, qt_argv = parser.parse_known_args()
+    acilis_adimi("içe aktarma")
+    
+    baslangic = time.perf_counter()
+    if args.veritabani:
+        create_database(args.veritabani)
+        configure_pool(args.veritabani)
+    else:
+        # Son kullanılan çiftliğin veritabanını aç (şeması güncellenir)
+        activate_farm(active_farm())
+    acilis_adimi("veritabanı", baslangic)
     
     # Uygulamayı başlat
-    app = QApplication(sys.argv)
+    app = QApplication(sys.argv[:1] + qt_argv)
+    baslangic = time.perf_counter()
     pencere = AnaPencere()
     pencere.show()
+    acilis_adimi("pencere", baslangic)
     sys.exit(app.exec())
 
 if __name__ == "__main__":
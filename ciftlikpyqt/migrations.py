@@ -0,0 +1,558 @@
+import sqlite3
+
+# Şema göçleri (sürüm, açıklama, komutlar) olarak sırayla tanımlanır.
+# Uygulanan son sürüm veritabanı başlığındaki PRAGMA user_version alanında
+# tutulur; şema güncelse açılışta hiçbir DDL çalıştırılmaz.
+# Komutlar SQL metni ya da bağlantı alan bir fonksiyon olabilir.
+MIGRATIONS = [
+    (1, "Temel tablolar", [
+        # Hayvanlar tablosu
+        '''
+            CREATE TABLE IF NOT EXISTS hayvanlar (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                kulak_kupesi TEXT UNIQUE NOT NULL,
+                dogum_tarihi DATE NOT NULL,
+                cinsiyet TEXT NOT NULL,
+                irk TEXT NOT NULL,
+                anne_id INTEGER,
+                baba_id INTEGER,
+                durum TEXT DEFAULT 'Aktif',
+                notlar TEXT,
+                FOREIGN KEY (anne_id) REFERENCES hayvanlar (id),
+                FOREIGN KEY (baba_id) REFERENCES hayvanlar (id)
+            )
+        ''',
+        # Tohumlama tablosu
+        '''
+            CREATE TABLE IF NOT EXISTS tohumlama (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                hayvan_id INTEGER NOT NULL,
+                tohumlama_tarihi DATE NOT NULL,
+                boga_bilgisi TEXT NOT NULL,
+                yontem TEXT NOT NULL,
+                veteriner TEXT,
+                basari_durumu TEXT DEFAULT 'Beklemede',
+                notlar TEXT,
+                FOREIGN KEY (hayvan_id) REFERENCES hayvanlar (id)
+            )
+        ''',
+        # Gebelik tablosu
+        '''
+            CREATE TABLE IF NOT EXISTS gebelik (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                hayvan_id INTEGER NOT NULL,
+                tohumlama_id INTEGER NOT NULL,
+                tespit_tarihi DATE NOT NULL,
+                tahmini_dogum_tarihi DATE NOT NULL,
+                durum TEXT DEFAULT 'Devam Ediyor',
+                notlar TEXT,
+                FOREIGN KEY (hayvan_id) REFERENCES hayvanlar (id),
+                FOREIGN KEY (tohumlama_id) REFERENCES tohumlama (id)
+            )
+        ''',
+        # Doğum tablosu
+        '''
+            CREATE TABLE IF NOT EXISTS dogum (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                gebelik_id INTEGER NOT NULL,
+                dogum_tarihi DATE NOT NULL,
+                yavru_id INTEGER NOT NULL,
+                dogum_tipi TEXT NOT NULL,
+                komplikasyonlar TEXT,
+                notlar TEXT,
+                FOREIGN KEY (gebelik_id) REFERENCES gebelik (id),
+                FOREIGN KEY (yavru_id) REFERENCES hayvanlar (id)
+            )
+        ''',
+        # Sağlık tablosu
+        '''
+            CREATE TABLE IF NOT EXISTS saglik (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                hayvan_id INTEGER NOT NULL,
+                islem_tarihi DATE NOT NULL,
+                islem_turu TEXT NOT NULL,
+                islem_adi TEXT NOT NULL,
+                veteriner TEXT,
+                ilac_bilgisi TEXT,
+                doz TEXT,
+                tekrar_tarihi DATE,
+                maliyet REAL,
+                notlar TEXT,
+                FOREIGN KEY (hayvan_id) REFERENCES hayvanlar (id)
+            )
+        ''',
+        # Bildirimler tablosu
+        '''
+            CREATE TABLE IF NOT EXISTS bildirimler (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                hayvan_id INTEGER NOT NULL,
+                bildirim_turu TEXT NOT NULL,
+                bildirim_tarihi DATE NOT NULL,
+                durum TEXT DEFAULT 'Beklemede',
+                mesaj TEXT,
+                FOREIGN KEY (hayvan_id) REFERENCES hayvanlar (id)
+            )
+        ''',
+    ]),
+    (2, "Sık kullanılan sorgular için indeksler", [
+        # Yabancı anahtarlar (JOIN ve alt sorgular)
+        'CREATE INDEX IF NOT EXISTS idx_hayvanlar_anne_id ON hayvanlar (anne_id)',
+        'CREATE INDEX IF NOT EXISTS idx_hayvanlar_baba_id ON hayvanlar (baba_id)',
+        'CREATE INDEX IF NOT EXISTS idx_tohumlama_hayvan_id ON tohumlama (hayvan_id)',
+        'CREATE INDEX IF NOT EXISTS idx_gebelik_hayvan_id ON gebelik (hayvan_id)',
+        'CREATE INDEX IF NOT EXISTS idx_gebelik_tohumlama_id ON gebelik (tohumlama_id)',
+        'CREATE INDEX IF NOT EXISTS idx_dogum_gebelik_id ON dogum (gebelik_id)',
+        'CREATE INDEX IF NOT EXISTS idx_dogum_yavru_id ON dogum (yavru_id)',
+        'CREATE INDEX IF NOT EXISTS idx_saglik_hayvan_id ON saglik (hayvan_id)',
+        'CREATE INDEX IF NOT EXISTS idx_bildirimler_hayvan_id ON bildirimler (hayvan_id)',
+        # Tarih sütunları (ORDER BY ve BETWEEN aralıkları)
+        'CREATE INDEX IF NOT EXISTS idx_tohumlama_tarihi ON tohumlama (tohumlama_tarihi)',
+        'CREATE INDEX IF NOT EXISTS idx_gebelik_tespit_tarihi ON gebelik (tespit_tarihi)',
+        'CREATE INDEX IF NOT EXISTS idx_dogum_tarihi ON dogum (dogum_tarihi)',
+        'CREATE INDEX IF NOT EXISTS idx_saglik_islem_tarihi ON saglik (islem_tarihi)',
+        'CREATE INDEX IF NOT EXISTS idx_saglik_tekrar_tarihi ON saglik (tekrar_tarihi)',
+        # Durum sütunları (WHERE durum = ... filtreleri)
+        'CREATE INDEX IF NOT EXISTS idx_hayvanlar_durum ON hayvanlar (durum)',
+        'CREATE INDEX IF NOT EXISTS idx_hayvanlar_cinsiyet ON hayvanlar (cinsiyet)',
+        'CREATE INDEX IF NOT EXISTS idx_tohumlama_basari_durumu ON tohumlama (basari_durumu)',
+        'CREATE INDEX IF NOT EXISTS idx_gebelik_durum ON gebelik (durum)',
+        'CREATE INDEX IF NOT EXISTS idx_bildirimler_durum_tarihi ON bildirimler (durum, bildirim_tarihi)',
+    ]),
+    (3, "Tetikleyicilerle güncellenen hayvan özet tablosu", [
+        # Hayvan başına sayaçlar ve son olaylar; rapor ve listeler alt sorgu yerine bunu okur
+        '''
+            CREATE TABLE IF NOT EXISTS hayvan_ozet (
+                hayvan_id INTEGER PRIMARY KEY,
+                dogum_sayisi INTEGER NOT NULL DEFAULT 0,
+                tohumlama_sayisi INTEGER NOT NULL DEFAULT 0,
+                son_tohumlama_tarihi DATE,
+                gebelik_id INTEGER,
+                gebelik_durumu TEXT,
+                saglik_maliyeti REAL NOT NULL DEFAULT 0,
+                FOREIGN KEY (hayvan_id) REFERENCES hayvanlar (id)
+            )
+        ''',
+        # Son tohumlama ve son gebeliğin yeniden hesaplanması için
+        'CREATE INDEX IF NOT EXISTS idx_tohumlama_hayvan_tarihi ON tohumlama (hayvan_id, tohumlama_tarihi)',
+        'CREATE INDEX IF NOT EXISTS idx_gebelik_hayvan_tespit ON gebelik (hayvan_id, tespit_tarihi)',
+        # Mevcut veriden ilk doldurma
+        '''
+            INSERT OR REPLACE INTO hayvan_ozet
+                (hayvan_id, dogum_sayisi, tohumlama_sayisi, son_tohumlama_tarihi,
+                 gebelik_id, gebelik_durumu, saglik_maliyeti)
+            SELECT h.id,
+                COALESCE(d.sayi, 0),
+                COALESCE(t.sayi, 0),
+                t.son_tarih,
+                (SELECT g.id FROM gebelik g WHERE g.hayvan_id = h.id
+                 ORDER BY g.tespit_tarihi DESC, g.id DESC LIMIT 1),
+                (SELECT g.durum FROM gebelik g WHERE g.hayvan_id = h.id
+                 ORDER BY g.tespit_tarihi DESC, g.id DESC LIMIT 1),
+                COALESCE(s.toplam, 0)
+            FROM hayvanlar h
+            LEFT JOIN (SELECT g.hayvan_id, COUNT(*) AS sayi FROM dogum d
+                       JOIN gebelik g ON d.gebelik_id = g.id GROUP BY g.hayvan_id) d ON d.hayvan_id = h.id
+            LEFT JOIN (SELECT hayvan_id, COUNT(*) AS sayi, MAX(tohumlama_tarihi) AS son_tarih
+                       FROM tohumlama GROUP BY hayvan_id) t ON t.hayvan_id = h.id
+            LEFT JOIN (SELECT hayvan_id, SUM(maliyet) AS toplam
+                       FROM saglik GROUP BY hayvan_id) s ON s.hayvan_id = h.id
+        ''',
+        # hayvanlar
+        '''
+            CREATE TRIGGER IF NOT EXISTS trg_ozet_hayvan_ekle AFTER INSERT ON hayvanlar
+            BEGIN
+                INSERT OR IGNORE INTO hayvan_ozet (hayvan_id) VALUES (NEW.id);
+            END
+        ''',
+        '''
+            CREATE TRIGGER IF NOT EXISTS trg_ozet_hayvan_sil AFTER DELETE ON hayvanlar
+            BEGIN
+                DELETE FROM hayvan_ozet WHERE hayvan_id = OLD.id;
+            END
+        ''',
+        # tohumlama: sayaç ve son tarih artımlı, silme/güncellemede yeniden hesaplanır
+        '''
+            CREATE TRIGGER IF NOT EXISTS trg_ozet_tohumlama_ekle AFTER INSERT ON tohumlama
+            BEGIN
+                INSERT OR IGNORE INTO hayvan_ozet (hayvan_id) VALUES (NEW.hayvan_id);
+                UPDATE hayvan_ozet SET
+                    tohumlama_sayisi = tohumlama_sayisi + 1,
+                    son_tohumlama_tarihi = MAX(COALESCE(son_tohumlama_tarihi, NEW.tohumlama_tarihi),
+                                               NEW.tohumlama_tarihi)
+                WHERE hayvan_id = NEW.hayvan_id;
+            END
+        ''',
+        '''
+            CREATE TRIGGER IF NOT EXISTS trg_ozet_tohumlama_sil AFTER DELETE ON tohumlama
+            BEGIN
+                UPDATE hayvan_ozet SET
+                    tohumlama_sayisi = tohumlama_sayisi - 1,
+                    son_tohumlama_tarihi = (SELECT MAX(tohumlama_tarihi) FROM tohumlama
+                                            WHERE hayvan_id = OLD.hayvan_id)
+                WHERE hayvan_id = OLD.hayvan_id;
+            END
+        ''',
+        '''
+            CREATE TRIGGER IF NOT EXISTS trg_ozet_tohumlama_guncelle
+            AFTER UPDATE OF hayvan_id, tohumlama_tarihi ON tohumlama
+            BEGIN
+                INSERT OR IGNORE INTO hayvan_ozet (hayvan_id) VALUES (NEW.hayvan_id);
+                UPDATE hayvan_ozet SET
+                    tohumlama_sayisi = (SELECT COUNT(*) FROM tohumlama WHERE hayvan_id = hayvan_ozet.hayvan_id),
+                    son_tohumlama_tarihi = (SELECT MAX(tohumlama_tarihi) FROM tohumlama
+                                            WHERE hayvan_id = hayvan_ozet.hayvan_id)
+                WHERE hayvan_id IN (OLD.hayvan_id, NEW.hayvan_id);
+            END
+        ''',
+        # gebelik: güncel gebelik, hayvanın en son tespit edilen gebeliğidir
+        '''
+            CREATE TRIGGER IF NOT EXISTS trg_ozet_gebelik_ekle AFTER INSERT ON gebelik
+            BEGIN
+                INSERT OR IGNORE INTO hayvan_ozet (hayvan_id) VALUES (NEW.hayvan_id);
+                -- Gebelikten önce yazılmış doğumlar da sayılır
+                UPDATE hayvan_ozet SET
+                    dogum_sayisi = dogum_sayisi + (SELECT COUNT(*) FROM dogum WHERE gebelik_id = NEW.id)
+                WHERE hayvan_id = NEW.hayvan_id;
+                UPDATE hayvan_ozet SET gebelik_id = NEW.id, gebelik_durumu = NEW.durum
+                WHERE hayvan_id = NEW.hayvan_id
+                AND NOT EXISTS (SELECT 1 FROM gebelik g WHERE g.hayvan_id = NEW.hayvan_id
+                                AND (g.tespit_tarihi > NEW.tespit_tarihi
+                                     OR (g.tespit_tarihi = NEW.tespit_tarihi AND g.id > NEW.id)));
+            END
+        ''',
+        '''
+            CREATE TRIGGER IF NOT EXISTS trg_ozet_gebelik_guncelle AFTER UPDATE ON gebelik
+            BEGIN
+                INSERT OR IGNORE INTO hayvan_ozet (hayvan_id) VALUES (NEW.hayvan_id);
+                UPDATE hayvan_ozet SET
+                    gebelik_id = (SELECT g.id FROM gebelik g WHERE g.hayvan_id = hayvan_ozet.hayvan_id
+                                  ORDER BY g.tespit_tarihi DESC, g.id DESC LIMIT 1),
+                    gebelik_durumu = (SELECT g.durum FROM gebelik g WHERE g.hayvan_id = hayvan_ozet.hayvan_id
+                                      ORDER BY g.tespit_tarihi DESC, g.id DESC LIMIT 1),
+                    dogum_sayisi = CASE WHEN OLD.hayvan_id = NEW.hayvan_id THEN dogum_sayisi
+                        ELSE (SELECT COUNT(*) FROM dogum d JOIN gebelik g ON d.gebelik_id = g.id
+                              WHERE g.hayvan_id = hayvan_ozet.hayvan_id) END
+                WHERE hayvan_id IN (OLD.hayvan_id, NEW.hayvan_id);
+            END
+        ''',
+        '''
+            CREATE TRIGGER IF NOT EXISTS trg_ozet_gebelik_sil AFTER DELETE ON gebelik
+            BEGIN
+                UPDATE hayvan_ozet SET
+                    gebelik_id = (SELECT g.id FROM gebelik g WHERE g.hayvan_id = OLD.hayvan_id
+                                  ORDER BY g.tespit_tarihi DESC, g.id DESC LIMIT 1),
+                    gebelik_durumu = (SELECT g.durum FROM gebelik g WHERE g.hayvan_id = OLD.hayvan_id
+                                      ORDER BY g.tespit_tarihi DESC, g.id DESC LIMIT 1),
+                    dogum_sayisi = dogum_sayisi - (SELECT COUNT(*) FROM dogum WHERE gebelik_id = OLD.id)
+                WHERE hayvan_id = OLD.hayvan_id;
+            END
+        ''',
+        # dogum: doğum, gebeliğin sahibi olan annenin sayacına yazılır
+        '''
+            CREATE TRIGGER IF NOT EXISTS trg_ozet_dogum_ekle AFTER INSERT ON dogum
+            BEGIN
+                INSERT OR IGNORE INTO hayvan_ozet (hayvan_id)
+                    SELECT hayvan_id FROM gebelik WHERE id = NEW.gebelik_id;
+                UPDATE hayvan_ozet SET dogum_sayisi = dogum_sayisi + 1
+                WHERE hayvan_id = (SELECT hayvan_id FROM gebelik WHERE id = NEW.gebelik_id);
+            END
+        ''',
+        '''
+            CREATE TRIGGER IF NOT EXISTS trg_ozet_dogum_sil AFTER DELETE ON dogum
+            BEGIN
+                UPDATE hayvan_ozet SET dogum_sayisi = dogum_sayisi - 1
+                WHERE hayvan_id = (SELECT hayvan_id FROM gebelik WHERE id = OLD.gebelik_id);
+            END
+        ''',
+        '''
+            CREATE TRIGGER IF NOT EXISTS trg_ozet_dogum_guncelle AFTER UPDATE OF gebelik_id ON dogum
+            BEGIN
+                UPDATE hayvan_ozet SET dogum_sayisi = dogum_sayisi - 1
+                WHERE hayvan_id = (SELECT hayvan_id FROM gebelik WHERE id = OLD.gebelik_id);
+                INSERT OR IGNORE INTO hayvan_ozet (hayvan_id)
+                    SELECT hayvan_id FROM gebelik WHERE id = NEW.gebelik_id;
+                UPDATE hayvan_ozet SET dogum_sayisi = dogum_sayisi + 1
+                WHERE hayvan_id = (SELECT hayvan_id FROM gebelik WHERE id = NEW.gebelik_id);
+            END
+        ''',
+        # saglik: toplam maliyet artımlı tutulur
+        '''
+            CREATE TRIGGER IF NOT EXISTS trg_ozet_saglik_ekle AFTER INSERT ON saglik
+            BEGIN
+                INSERT OR IGNORE INTO hayvan_ozet (hayvan_id) VALUES (NEW.hayvan_id);
+                UPDATE hayvan_ozet SET saglik_maliyeti = saglik_maliyeti + COALESCE(NEW.maliyet, 0)
+                WHERE hayvan_id = NEW.hayvan_id;
+            END
+        ''',
+        '''
+            CREATE TRIGGER IF NOT EXISTS trg_ozet_saglik_sil AFTER DELETE ON saglik
+            BEGIN
+                UPDATE hayvan_ozet SET saglik_maliyeti = saglik_maliyeti - COALESCE(OLD.maliyet, 0)
+                WHERE hayvan_id = OLD.hayvan_id;
+            END
+        ''',
+        '''
+            CREATE TRIGGER IF NOT EXISTS trg_ozet_saglik_guncelle AFTER UPDATE OF hayvan_id, maliyet ON saglik
+            BEGIN
+                UPDATE hayvan_ozet SET saglik_maliyeti = saglik_maliyeti - COALESCE(OLD.maliyet, 0)
+                WHERE hayvan_id = OLD.hayvan_id;
+                INSERT OR IGNORE INTO hayvan_ozet (hayvan_id) VALUES (NEW.hayvan_id);
+                UPDATE hayvan_ozet SET saglik_maliyeti = saglik_maliyeti + COALESCE(NEW.maliyet, 0)
+                WHERE hayvan_id = NEW.hayvan_id;
+            END
+        ''',
+    ]),
+    (4, "Serbest metin araması için FTS5 dizini", [
+        # rowid = kaynak id * 4 + tablo kodu (SEARCH_TABLES sırası); metin
+        # alanları ayrı sütunlarda tutulur, böylece "ilac: ..." gibi sütun
+        # filtreleri de çalışır
+        '''
+            CREATE VIRTUAL TABLE IF NOT EXISTS arama USING fts5(
+                notlar, islem, ilac, boga,
+                tokenize = 'unicode61 remove_diacritics 2'
+            )
+        ''',
+        '''
+            INSERT INTO arama (rowid, notlar)
+            SELECT id * 4 + 0, notlar FROM hayvanlar WHERE notlar IS NOT NULL AND notlar != ''
+        ''',
+        '''
+            INSERT INTO arama (rowid, notlar, islem, ilac)
+            SELECT id * 4 + 1, notlar, islem_adi, ilac_bilgisi FROM saglik
+        ''',
+        '''
+            INSERT INTO arama (rowid, notlar, boga)
+            SELECT id * 4 + 2, notlar, boga_bilgisi FROM tohumlama
+        ''',
+        '''
+            INSERT INTO arama (rowid, notlar)
+            SELECT id * 4 + 3, notlar FROM gebelik WHERE notlar IS NOT NULL AND notlar != ''
+        ''',
+        # hayvanlar
+        '''
+            CREATE TRIGGER IF NOT EXISTS trg_arama_hayvan_ekle AFTER INSERT ON hayvanlar
+            WHEN NEW.notlar IS NOT NULL AND NEW.notlar != ''
+            BEGIN
+                INSERT INTO arama (rowid, notlar) VALUES (NEW.id * 4 + 0, NEW.notlar);
+            END
+        ''',
+        '''
+            CREATE TRIGGER IF NOT EXISTS trg_arama_hayvan_guncelle AFTER UPDATE OF id, notlar ON hayvanlar
+            BEGIN
+                DELETE FROM arama WHERE rowid = OLD.id * 4 + 0;
+                INSERT INTO arama (rowid, notlar)
+                    SELECT NEW.id * 4 + 0, NEW.notlar WHERE NEW.notlar IS NOT NULL AND NEW.notlar != '';
+            END
+        ''',
+        '''
+            CREATE TRIGGER IF NOT EXISTS trg_arama_hayvan_sil AFTER DELETE ON hayvanlar
+            BEGIN
+                DELETE FROM arama WHERE rowid = OLD.id * 4 + 0;
+            END
+        ''',
+        # saglik
+        '''
+            CREATE TRIGGER IF NOT EXISTS trg_arama_saglik_ekle AFTER INSERT ON saglik
+            BEGIN
+                INSERT INTO arama (rowid, notlar, islem, ilac)
+                VALUES (NEW.id * 4 + 1, NEW.notlar, NEW.islem_adi, NEW.ilac_bilgisi);
+            END
+        ''',
+        '''
+            CREATE TRIGGER IF NOT EXISTS trg_arama_saglik_guncelle
+            AFTER UPDATE OF id, notlar, islem_adi, ilac_bilgisi ON saglik
+            BEGIN
+                DELETE FROM arama WHERE rowid = OLD.id * 4 + 1;
+                INSERT INTO arama (rowid, notlar, islem, ilac)
+                VALUES (NEW.id * 4 + 1, NEW.notlar, NEW.islem_adi, NEW.ilac_bilgisi);
+            END
+        ''',
+        '''
+            CREATE TRIGGER IF NOT EXISTS trg_arama_saglik_sil AFTER DELETE ON saglik
+            BEGIN
+                DELETE FROM arama WHERE rowid = OLD.id * 4 + 1;
+            END
+        ''',
+        # tohumlama
+        '''
+            CREATE TRIGGER IF NOT EXISTS trg_arama_tohumlama_ekle AFTER INSERT ON tohumlama
+            BEGIN
+                INSERT INTO arama (rowid, notlar, boga) VALUES (NEW.id * 4 + 2, NEW.notlar, NEW.boga_bilgisi);
+            END
+        ''',
+        '''
+            CREATE TRIGGER IF NOT EXISTS trg_arama_tohumlama_guncelle
+            AFTER UPDATE OF id, notlar, boga_bilgisi ON tohumlama
+            BEGIN
+                DELETE FROM arama WHERE rowid = OLD.id * 4 + 2;
+                INSERT INTO arama (rowid, notlar, boga) VALUES (NEW.id * 4 + 2, NEW.notlar, NEW.boga_bilgisi);
+            END
+        ''',
+        '''
+            CREATE TRIGGER IF NOT EXISTS trg_arama_tohumlama_sil AFTER DELETE ON tohumlama
+            BEGIN
+                DELETE FROM arama WHERE rowid = OLD.id * 4 + 2;
+            END
+        ''',
+        # gebelik
+        '''
+            CREATE TRIGGER IF NOT EXISTS trg_arama_gebelik_ekle AFTER INSERT ON gebelik
+            WHEN NEW.notlar IS NOT NULL AND NEW.notlar != ''
+            BEGIN
+                INSERT INTO arama (rowid, notlar) VALUES (NEW.id * 4 + 3, NEW.notlar);
+            END
+        ''',
+        '''
+            CREATE TRIGGER IF NOT EXISTS trg_arama_gebelik_guncelle AFTER UPDATE OF id, notlar ON gebelik
+            BEGIN
+                DELETE FROM arama WHERE rowid = OLD.id * 4 + 3;
+                INSERT INTO arama (rowid, notlar)
+                    SELECT NEW.id * 4 + 3, NEW.notlar WHERE NEW.notlar IS NOT NULL AND NEW.notlar != '';
+            END
+        ''',
+        '''
+            CREATE TRIGGER IF NOT EXISTS trg_arama_gebelik_sil AFTER DELETE ON gebelik
+            BEGIN
+                DELETE FROM arama WHERE rowid = OLD.id * 4 + 3;
+            END
+        ''',
+    ]),
+    (5, "Soy ağacı kapanış tablosu", [
+        # Her hayvan için kendisi (nesil 0) ve tüm ataları; aynı ataya birden
+        # fazla yoldan ulaşılıyorsa en kısa yolun nesil sayısı tutulur
+        '''
+            CREATE TABLE IF NOT EXISTS hayvan_soy (
+                ata_id INTEGER NOT NULL,
+                torun_id INTEGER NOT NULL,
+                nesil INTEGER NOT NULL,
+                PRIMARY KEY (ata_id, torun_id)
+            ) WITHOUT ROWID
+        ''',
+        'CREATE INDEX IF NOT EXISTS idx_hayvan_soy_torun ON hayvan_soy (torun_id, nesil, ata_id)',
+        '''
+            INSERT INTO hayvan_soy (ata_id, torun_id, nesil)
+            WITH RECURSIVE ebeveyn(id, ebeveyn_id) AS (
+                SELECT id, anne_id FROM hayvanlar WHERE anne_id IS NOT NULL
+                UNION ALL
+                SELECT id, baba_id FROM hayvanlar WHERE baba_id IS NOT NULL
+            ),
+            yol(ata_id, torun_id, nesil) AS (
+                SELECT id, id, 0 FROM hayvanlar
+                UNION
+                SELECT e.ebeveyn_id, y.torun_id, y.nesil + 1
+                FROM yol y JOIN ebeveyn e ON e.id = y.ata_id
+            )
+            SELECT ata_id, torun_id, MIN(nesil) FROM yol GROUP BY ata_id, torun_id
+        ''',
+        # Yeni hayvan, anne ve babasının atalarını bir nesil ileriden devralır
+        '''
+            CREATE TRIGGER IF NOT EXISTS trg_soy_hayvan_ekle AFTER INSERT ON hayvanlar
+            BEGIN
+                INSERT OR IGNORE INTO hayvan_soy (ata_id, torun_id, nesil) VALUES (NEW.id, NEW.id, 0);
+                INSERT INTO hayvan_soy (ata_id, torun_id, nesil)
+                    SELECT ata_id, NEW.id, nesil + 1 FROM hayvan_soy
+                    WHERE torun_id IN (NEW.anne_id, NEW.baba_id)
+                    ON CONFLICT (ata_id, torun_id) DO UPDATE SET nesil = MIN(nesil, excluded.nesil);
+            END
+        ''',
+        # Ebeveyn değişirse hayvanın alt ağacı (kendisi ve torunları) dışarıdaki
+        # atalarını kaybeder; ardından alt ağaçtan çıkan her ebeveyn kenarı
+        # üzerinden yeniden bağlanır. Alt ağaç içindeki satırlar değişmez.
+        '''
+            CREATE TRIGGER IF NOT EXISTS trg_soy_hayvan_guncelle AFTER UPDATE OF anne_id, baba_id ON hayvanlar
+            WHEN OLD.anne_id IS NOT NEW.anne_id OR OLD.baba_id IS NOT NEW.baba_id
+            BEGIN
+                DELETE FROM hayvan_soy
+                WHERE torun_id IN (SELECT torun_id FROM hayvan_soy WHERE ata_id = NEW.id)
+                AND ata_id NOT IN (SELECT torun_id FROM hayvan_soy WHERE ata_id = NEW.id);
+                INSERT INTO hayvan_soy (ata_id, torun_id, nesil)
+                    SELECT u.ata_id, i.torun_id, i.nesil + 1 + u.nesil
+                    FROM hayvan_soy i
+                    JOIN hayvanlar h ON h.id = i.ata_id
+                    JOIN hayvan_soy u ON u.torun_id IN (h.anne_id, h.baba_id)
+                    WHERE i.ata_id IN (SELECT torun_id FROM hayvan_soy WHERE ata_id = NEW.id)
+                    AND u.torun_id NOT IN (SELECT torun_id FROM hayvan_soy WHERE ata_id = NEW.id)
+                    ON CONFLICT (ata_id, torun_id) DO UPDATE SET nesil = MIN(nesil, excluded.nesil);
+            END
+        ''',
+        # Yalnızca silinen hayvanın satırları kaldırılır; arşivleme torunu
+        # ana tabloda kalan hayvanları taşımadığından bu yeterlidir
+        '''
+            CREATE TRIGGER IF NOT EXISTS trg_soy_hayvan_sil AFTER DELETE ON hayvanlar
+            BEGIN
+                DELETE FROM hayvan_soy WHERE torun_id = OLD.id;
+                DELETE FROM hayvan_soy WHERE ata_id = OLD.id;
+            END
+        ''',
+    ]),
+    (6, "Hayvan seçici için büyük/küçük harf duyarsız küpe indeksi", [
+        # Küpe önekiyle LIKE aramaları bu indeksten aralık olarak okunur
+        'CREATE INDEX IF NOT EXISTS idx_hayvanlar_kupe_nocase ON hayvanlar (kulak_kupesi COLLATE NOCASE)',
+    ]),
+    (7, "Liste ekranlarının sıralama ve süzgeçleri için indeksler", [
+        # Başlığa tıklanarak sıralanabilen sütunlar
+        'CREATE INDEX IF NOT EXISTS idx_hayvanlar_dogum_tarihi ON hayvanlar (dogum_tarihi)',
+        'CREATE INDEX IF NOT EXISTS idx_hayvanlar_irk ON hayvanlar (irk)',
+        'CREATE INDEX IF NOT EXISTS idx_gebelik_tahmini_dogum ON gebelik (tahmini_dogum_tarihi)',
+        'CREATE INDEX IF NOT EXISTS idx_saglik_islem_turu ON saglik (islem_turu)',
+        # Eşitlik süzgeci + tarih sıralaması: sayfa indeksin tek aralığından okunur
+        'CREATE INDEX IF NOT EXISTS idx_saglik_tur_tarihi ON saglik (islem_turu, islem_tarihi)',
+        'CREATE INDEX IF NOT EXISTS idx_tohumlama_basari_tarihi ON tohumlama (basari_durumu, tohumlama_tarihi)',
+        'CREATE INDEX IF NOT EXISTS idx_gebelik_durum_tespit ON gebelik (durum, tespit_tarihi)',
+        # Yukarıdakilerin öneki olan tek sütunlu indeksler gereksizleşti
+        'DROP INDEX IF EXISTS idx_tohumlama_basari_durumu',
+        'DROP INDEX IF EXISTS idx_gebelik_durum',
+    ]),
+    (8, "Anasayfa göstergeleri için durum ve ırk indeksi", [
+        # Etkin hayvanların ırk dağılımı tablo okunmadan indeksten sayılır
+        'CREATE INDEX IF NOT EXISTS idx_hayvanlar_durum_irk ON hayvanlar (durum, irk)',
+    ]),
+]
+
+# arama dizinindeki tablo kodları: rowid % 4 bu listedeki sırayı verir
+SEARCH_TABLES = ['hayvanlar', 'saglik', 'tohumlama', 'gebelik']
+
+# Tetikleyicilerin dolaylı olarak yazdığı tablolar; önbellek bu tablolara
+# yapılan yazmaları da geçersiz kılma için dikkate alır
+TRIGGER_TARGETS = {
+    'hayvanlar': {'hayvan_ozet', 'arama', 'hayvan_soy'},
+    'tohumlama': {'hayvan_ozet', 'arama'},
+    'gebelik': {'hayvan_ozet', 'arama'},
+    'dogum': {'hayvan_ozet'},
+    'saglik': {'hayvan_ozet', 'arama'},
+}
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+def current_version(conn):
+    """Veritabanının kayıtlı şema sürümünü döndürür"""
+    return conn.execute('PRAGMA user_version').fetchone()[0]
+
+def apply_migrations(conn):
+    """Eksik göçleri sırayla uygular ve uygulanan sürümleri döndürür"""
+    version = current_version(conn)
+    if version >= LATEST_VERSION:
+        return []
+
+    applied = []
+    for migration_version, description, statements in MIGRATIONS:
+        if migration_version <= version:
+            continue
+        # Her göç kendi işleminde çalışır; hata olursa sürüm ilerlemez
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            for statement in statements:
+                if callable(statement):
+                    statement(conn)
+                else:
+                    conn.execute(statement)
+            conn.execute(f'PRAGMA user_version = {migration_version}')
+            conn.commit()
+        except sqlite3.Error:
+            conn.rollback()
+            raise
+        applied.append((migration_version, description))
+
+    # Yeni indeksler için sorgu planlayıcı istatistiklerini güncelle
+    conn.execute('PRAGMA optimize')
+    return applied
@@ -1,16 +1,19 @@
 import asyncio
 from datetime import datetime, timedelta
-from telegram import Bot
-from config import TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID
+from config import TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID, BILDIRIM_ISARETLEME_GRUBU
 from database import DatabaseManager
 
 class NotificationManager:
     def __init__(self):
-        self.bot = Bot(token=TELEGRAM_BOT_TOKEN)
+        # Bot ilk mesajda oluşturulur; gönderilecek bildirim yoksa telegram paketi yüklenmez
+        self.bot = None
         
     async def send_telegram_message(self, message):
         """Telegram üzerinden mesaj gönderir"""
         try:
+            if self.bot is None:
+                from telegram import Bot
+                self.bot = Bot(token=TELEGRAM_BOT_TOKEN)
             await self.bot.send_message(chat_id=TELEGRAM_CHAT_ID, text=message)
             return True
         except Exception as e:
@@ -19,13 +22,24 @@ class NotificationManager:
     
     def create_notification(self, hayvan_id, bildirim_turu, bildirim_tarihi, mesaj):
         """Veritabanına bildirim ekler"""
-        data = {
-            'hayvan_id': hayvan_id,
-            'bildirim_turu': bildirim_turu,
-            'bildirim_tarihi': bildirim_tarihi,
-            'mesaj': mesaj
-        }
-        return DatabaseManager.insert_data('bildirimler', data)
+        sonuc = self.create_notifications([(hayvan_id, bildirim_turu, bildirim_tarihi, mesaj)])
+        return sonuc.ids[0] if sonuc.ids else None
+    
+    def create_notifications(self, bildirimler):
+        """(hayvan_id, tür, tarih, mesaj) demetlerini tek işlemde toplu ekler"""
+        rows = (
+            {
+                'hayvan_id': hayvan_id,
+                'bildirim_turu': bildirim_turu,
+                'bildirim_tarihi': bildirim_tarihi,
+                'mesaj': mesaj
+            }
+            for hayvan_id, bildirim_turu, bildirim_tarihi, mesaj in bildirimler
+        )
+        sonuc = DatabaseManager.insert_many('bildirimler', rows)
+        for satir, hata in sonuc.errors:
+            print(f"Bildirim eklenemedi (satır {satir}): {hata}")
+        return sonuc
     
     def check_notifications(self):
         """Bekleyen bildirimleri kontrol eder ve gönderir"""
@@ -39,18 +53,26 @@ class NotificationManager:
         notifications = DatabaseManager.execute_query(query, (today,))
         
         if notifications:
-            for notification in notifications:
-                message = f"🔔 Bildirim: {notification['kulak_kupesi']} numaralı hayvan için {notification['bildirim_turu']}\n\n{notification['mesaj']}"
-                
-                # Telegram mesajını gönder
-                asyncio.run(self.send_telegram_message(message))
-                
-                # Bildirim durumunu güncelle
-                DatabaseManager.update_data(
-                    'bildirimler',
-                    {'durum': 'Gönderildi'},
-                    {'id': notification['id']}
-                )
+            # Yalnızca gönderilebilen bildirimler, gruplar halinde işaretlenir; döngü yarıda
+            # kesilse de gönderilmiş olanlar sonraki çalıştırmada yeniden gönderilmez
+            sent = []
+            try:
+                for notification in notifications:
+                    message = f"🔔 Bildirim: {notification['kulak_kupesi']} numaralı hayvan için {notification['bildirim_turu']}\n\n{notification['mesaj']}"
+                    
+                    # Telegram mesajını gönder
+                    if asyncio.run(self.send_telegram_message(message)):
+                        sent.append(notification['id'])
+                    if len(sent) >= BILDIRIM_ISARETLEME_GRUBU:
+                        self._mark_sent(sent)
+                        sent = []
+            finally:
+                self._mark_sent(sent)
+    
+    def _mark_sent(self, ids):
+        """Verilen bildirimlerin durumunu tek işlemde Gönderildi yapar"""
+        if ids:
+            DatabaseManager.update_many('bildirimler', (({'durum': 'Gönderildi'}, {'id': i}) for i in ids))
     
     def check_gebelik_bildirimleri(self):
         """Gebelik durumlarını kontrol eder ve bildirim oluşturur"""
@@ -64,18 +86,16 @@ class NotificationManager:
         
         if gebelikler:
             today = datetime.now().date()
+            bildirimler = []
             for gebelik in gebelikler:
                 tahmini_dogum = datetime.strptime(gebelik['tahmini_dogum_tarihi'], '%Y-%m-%d').date()
                 kalan_gun = (tahmini_dogum - today).days
                 
                 if kalan_gun <= 7:
                     mesaj = f"⚠️ {gebelik['kulak_kupesi']} numaralı hayvanın tahmini doğum tarihine {kalan_gun} gün kaldı!"
-                    self.create_notification(
-                        gebelik['hayvan_id'],
-                        'Gebelik Uyarısı',
-                        today,
-                        mesaj
-                    )
+                    bildirimler.append((gebelik['hayvan_id'], 'Gebelik Uyarısı', today, mesaj))
+            
+            self.create_notifications(bildirimler)
     
     def check_asi_bildirimleri(self):
         """Aşı tekrarlarını kontrol eder ve bildirim oluşturur"""
@@ -89,18 +109,16 @@ class NotificationManager:
         
         if asilar:
             today = datetime.now().date()
+            bildirimler = []
             for asi in asilar:
                 tekrar_tarihi = datetime.strptime(asi['tekrar_tarihi'], '%Y-%m-%d').date()
                 kalan_gun = (tekrar_tarihi - today).days
                 
                 if kalan_gun <= 7:
                     mesaj = f"💉 {asi['kulak_kupesi']} numaralı hayvanın {asi['islem_adi']} tekrarına {kalan_gun} gün kaldı!"
-                    self.create_notification(
-                        asi['hayvan_id'],
-                        'Aşı Hatırlatma',
-                        today,
-                        mesaj
-                    )
+                    bildirimler.append((asi['hayvan_id'], 'Aşı Hatırlatma', today, mesaj))
+            
+            self.create_notifications(bildirimler)
     
     def run_daily_checks(self):
         """Günlük kontrolleri gerçekleştirir"""
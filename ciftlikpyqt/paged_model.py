@@ -0,0 +1,385 @@
+from PyQt6.QtCore import QAbstractTableModel, QDate, QModelIndex, Qt, pyqtSignal
+from PyQt6.QtWidgets import QCheckBox, QComboBox, QDateEdit, QHBoxLayout, QLabel, QPushButton, QWidget
+from database import DatabaseManager, get_pool
+from async_query import AsyncQueryExecutor
+from event_bus import EventBus, id_placeholders, delta_applicable
+from queries import keyset_page
+from config import TABLO_SAYFA_BOYUTU
+
+def _text(value):
+    return '' if value is None else str(value)
+
+class PagedQueryModel(QAbstractTableModel):
+    """Liste ekranlarının ortak tablo modeli.
+
+    Bellekte yalnızca görünen sayfa tutulur ve hücre metinleri istendiğinde
+    üretilir. Sayfalar keyset_page ile sıralama sütununun indeksinden ileri
+    ya da geri okunur; tablo ne kadar büyürse büyüsün bir sayfanın maliyeti
+    sayfa boyutuna bağlıdır. Başlığa tıklanarak yapılan sıralama ve ekranın
+    süzgeçleri SQL'e çevrilir. Modelin tablosuna yapılan yazmalar olay
+    yolundan alınır: değişen satırlar yeniden okunup sayfanın aralığına
+    düşüyorsa sıralı konumlarına yerleştirilir.
+    """
+
+    # Sayfa okunamadığında (hata nesnesi)
+    load_failed = pyqtSignal(object)
+    # reveal ile beklenen kayıt sayfaya geldiğinde (satır numarası)
+    row_revealed = pyqtSignal(int)
+    # Görünen sayfa, sıralama ya da önceki/sonraki sayfa durumu değiştiğinde
+    page_changed = pyqtSignal()
+
+    def __init__(self, table, query, paging, columns, sortable=(), page_size=TABLO_SAYFA_BOYUTU, parent=None):
+        """columns (başlık, alan) ya da (başlık, alan, biçimlendirici) listesidir.
+
+        paging varsayılan sıralamadır. sortable başlığa tıklanarak
+        sıralanabilecek alanlardır; paging'in takma adının tablosunda
+        indeksli ve NULL olamayan sütunlar olmalıdır.
+        """
+        super().__init__(parent)
+        self.table = table
+        self.query = query
+        self.alias, self.sort_field, self.descending = paging
+        self.sortable = {'id', self.sort_field, *sortable}
+        self.columns = [column if len(column) == 3 else (*column, _text) for column in columns]
+        self.page_size = page_size
+        self.filters = []  # (koşul, parametreler) çiftleri
+        self.has_previous = False
+        self.has_next = False
+        self.executor = AsyncQueryExecutor.instance()
+        self._rows = []
+        self._positions = {}  # id -> satır numarası
+        self._request = None  # okunmakta olan sayfanın (cursor, backward, inclusive) üçlüsü
+        self._revealing = None  # sayfaya geldiğinde bildirilecek kaydın id'si
+        EventBus.instance().table_changed.connect(self.table_changed)
+
+    # Qt arayüzü
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.columns)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole or not index.isValid():
+            return None
+        _, field, format_value = self.columns[index.column()]
+        return format_value(self._rows[index.row()][field])
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return self.columns[section][0]
+        return section + 1
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        """Sütuna göre veritabanında sıralayıp ilk sayfayı okur"""
+        field = self.columns[column][1] if column >= 0 else None
+        descending = order == Qt.SortOrder.DescendingOrder
+        if field in self.sortable and (field, descending) != (self.sort_field, self.descending):
+            self.sort_field, self.descending = field, descending
+            self.reload()
+        else:
+            # Sıralanamayan sütunda görünüm göstergesini geri alsın
+            self.page_changed.emit()
+
+    # Sıralama, süzgeçler ve sayfalar
+
+    @property
+    def paging(self):
+        return (self.alias, self.sort_field, self.descending)
+
+    def sort_column(self):
+        """Sıralama alanının sütun numarasını döndürür (sütunlarda yoksa -1)"""
+        return next((i for i, column in enumerate(self.columns) if column[1] == self.sort_field), -1)
+
+    def sort_order(self):
+        return Qt.SortOrder.DescendingOrder if self.descending else Qt.SortOrder.AscendingOrder
+
+    def set_filters(self, filters):
+        """(koşul, parametreler) çiftlerini süzgeç yapıp ilk sayfayı okur"""
+        self.filters = list(filters)
+        self.reload()
+
+    def reload(self):
+        """İlk sayfayı yeniden okur"""
+        self._revealing = None
+        self._load(None)
+
+    def next_page(self):
+        if self.has_next and self._rows and self._request is None:
+            self._load(self._sort_key(self._rows[-1]))
+
+    def previous_page(self):
+        if self.has_previous and self._rows and self._request is None:
+            self._load(self._sort_key(self._rows[0]), backward=True)
+
+    def page_label(self):
+        """Sayfanın sıralama sütunundaki ilk ve son değeri"""
+        if not self._rows:
+            return "Kayıt yok"
+        column = self.sort_column()
+        if column < 0:
+            return f"{len(self._rows)} kayıt"
+        header, field, format_value = self.columns[column]
+        return f"{header}: {format_value(self._rows[0][field])} – {format_value(self._rows[-1][field])}"
+
+    # Satır erişimi
+
+    def row_at(self, position):
+        """position. satırın sorgu satırını döndürür"""
+        return self._rows[position]
+
+    def position_of(self, row_id):
+        """Kaydın satır numarasını, görünen sayfada değilse None döndürür"""
+        return self._positions.get(row_id)
+
+    def reveal(self, row_id):
+        """Kaydın satır numarasını row_revealed ile bildirir.
+
+        Kayıt görünen sayfada değilse ve süzgeçlere uyuyorsa onunla biten
+        sayfaya geçilir; henüz yazılmakta olan kayıt değişiklik olayıyla
+        sayfaya gelince bildirilir. Yeni bir reveal ya da reload beklemeyi
+        bırakır.
+        """
+        self._revealing = row_id
+        if row_id in self._positions:
+            self._emit_revealed()
+            return
+        query, parameters = self._rows_query([row_id])
+        self.executor.query((id(self), 'bul'), query, parameters, on_result=self._jump)
+
+    def _jump(self, rows):
+        if not rows or rows[0]['id'] != self._revealing:
+            return
+        if rows[0]['id'] in self._positions:
+            self._emit_revealed()
+        elif self._request is None and not self._in_page(self._sort_key(rows[0])):
+            # Aralıktaki kayıt değişiklik olayıyla sayfaya eklenir
+            self._load(self._sort_key(rows[0]), backward=True, inclusive=True)
+
+    def _emit_revealed(self):
+        position = self._positions.get(self._revealing) if self._revealing is not None else None
+        if position is not None:
+            self._revealing = None
+            self.row_revealed.emit(position)
+
+    # Sayfa okuma
+
+    def _sort_key(self, row):
+        return (row[self.sort_field], row['id'])
+
+    def _precedes(self, a, b):
+        """a anahtarlı satır görünümde b'den önce mi gelir"""
+        return a > b if self.descending else a < b
+
+    def _rows_query(self, ids):
+        """Süzgeçlere uyan ids satırlarını okuyan (sorgu, parametreler)"""
+        conditions = [condition for condition, _ in self.filters]
+        conditions.append(f'{self.alias}.id IN ({id_placeholders(ids)})')
+        parameters = [value for _, values in self.filters for value in values] + list(ids)
+        return f"{self.query} WHERE {' AND '.join(conditions)}", parameters
+
+    def _load(self, cursor, backward=False, inclusive=False):
+        self._request = (cursor, backward, inclusive)
+        # Fazladan okunan satır sayfanın ötesinde kayıt olup olmadığını gösterir
+        query, parameters = keyset_page(self.query, self.paging, cursor, self.page_size + 1,
+                                        self.filters, backward, inclusive)
+        # iter_query hataları yükseltir; sayfa hatası ekrana iletilebilir
+        self.executor.submit((id(self), 'sayfa'), lambda: list(DatabaseManager.iter_query(query, parameters)),
+                             on_result=lambda rows: self._page_loaded(rows, cursor, backward),
+                             on_error=self._page_failed)
+
+    def _page_loaded(self, rows, cursor, backward):
+        self._request = None
+        more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if backward:
+            if not more:
+                # Geride bir sayfa dolduracak kadar kayıt yok; ilk sayfa okunur
+                self._load(None)
+                return
+            rows.reverse()
+            has_previous, has_next = True, True
+        elif not rows and cursor is not None:
+            # Son sayfadaki kayıtlar silinmiş; görünen sayfa korunur
+            self.has_next = False
+            self.page_changed.emit()
+            return
+        else:
+            has_previous, has_next = cursor is not None, more
+
+        self.beginResetModel()
+        self._rows = rows
+        self._positions = {row['id']: position for position, row in enumerate(rows)}
+        self.has_previous, self.has_next = has_previous, has_next
+        self.endResetModel()
+        self.page_changed.emit()
+        self._emit_revealed()
+
+    def _page_failed(self, error):
+        self._request = None
+        self.load_failed.emit(error)
+
+    # Değişiklikler
+
+    def table_changed(self, change):
+        """Modelin tablosundaki yazmaları satır düzeyinde uygular"""
+        # Başka çiftliğin havuzuna yapılan yazmalar bu modeli etkilemez
+        if change.table != self.table or change.database != get_pool().database:
+            return
+        if not delta_applicable(change):
+            self.reload()
+            return
+        if self._request is not None:
+            # Commit'ten önce başlamış sayfa okuması yeni satırları görmeyebilir
+            self._load(*self._request)
+        ids = list(change.ids)
+        query, parameters = self._rows_query(ids)
+        self.executor.query((id(self), 'delta', change), query, parameters,
+                            on_result=lambda rows: self.apply_delta(ids, rows))
+
+    def apply_delta(self, ids, rows):
+        """ids için yeniden okunan satırları uygular.
+
+        Sorgudan dönmeyen (silinmiş ya da süzgeçlere artık uymayan) id'lerin
+        satırları silinir. Sıralama değeri değişmeyen satır yerinde
+        güncellenir; diğerleri sayfanın aralığına düşüyorsa sıralı konumuna
+        taşınır ya da eklenir.
+        """
+        if rows is None:
+            return
+        rows_by_id = {row['id']: row for row in rows}
+        for row_id in ids:
+            row = rows_by_id.get(row_id)
+            position = self._positions.get(row_id)
+            if position is not None:
+                if row is not None and self._sort_key(row) == self._sort_key(self._rows[position]):
+                    self._rows[position] = row
+                    self.dataChanged.emit(self.index(position, 0), self.index(position, len(self.columns) - 1))
+                    continue
+                self._remove(position)
+            if row is not None:
+                self._insert_sorted(row)
+        self.page_changed.emit()
+        self._emit_revealed()
+
+    def _in_page(self, key):
+        """Anahtar görünen sayfanın aralığına düşüyor mu; ilk ve son sayfa o yönde açıktır"""
+        if self._rows and self.has_previous and self._precedes(key, self._sort_key(self._rows[0])):
+            return False
+        if self._rows and self.has_next and self._precedes(self._sort_key(self._rows[-1]), key):
+            return False
+        return bool(self._rows) or not (self.has_previous or self.has_next)
+
+    def _remove(self, position):
+        self.beginRemoveRows(QModelIndex(), position, position)
+        del self._positions[self._rows[position]['id']]
+        del self._rows[position]
+        self.endRemoveRows()
+        self._reindex(position)
+
+    def _insert_sorted(self, row):
+        key = self._sort_key(row)
+        # Aralığın dışındaki satır kendi sayfasında görünür
+        if not self._in_page(key):
+            return
+        low, high = 0, len(self._rows)
+        while low < high:
+            middle = (low + high) // 2
+            if self._precedes(self._sort_key(self._rows[middle]), key):
+                low = middle + 1
+            else:
+                high = middle
+        self.beginInsertRows(QModelIndex(), low, low)
+        self._rows.insert(low, row)
+        self.endInsertRows()
+        self._reindex(low)
+
+    def _reindex(self, start):
+        for position in range(start, len(self._rows)):
+            self._positions[self._rows[position]['id']] = position
+
+class ListToolbar(QWidget):
+    """Liste tablosunun süzgeçleri ve sayfa düğmeleri.
+
+    Görünümü modele bağlar: başlığa tıklanınca model veritabanında
+    sıralanır, reveal edilen kayıt seçilir. Süzgeçler değiştikçe
+    parametreli SQL koşullarına çevrilip modele verilir.
+    """
+
+    def __init__(self, model, view, parent=None):
+        super().__init__(parent)
+        self.model = model
+        self.view = view
+        self._filters = []  # her biri (koşul, parametreler) listesi döndüren fonksiyonlar
+
+        view.setModel(model)
+        # Gösterge önce modelin sıralamasına ayarlanır; sıralama açılırken
+        # varsayılan göstergeyle gereksiz bir sayfa okunmasın
+        view.horizontalHeader().setSortIndicator(model.sort_column(), model.sort_order())
+        view.setSortingEnabled(True)
+        model.row_revealed.connect(view.selectRow)
+        model.page_changed.connect(self.update_controls)
+
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        self.filter_layout = QHBoxLayout()
+        layout.addLayout(self.filter_layout)
+        layout.addStretch()
+
+        self.previous_button = QPushButton("Önceki")
+        self.previous_button.clicked.connect(model.previous_page)
+        layout.addWidget(self.previous_button)
+        self.info = QLabel()
+        self.info.setStyleSheet("color: #7f8c8d;")
+        layout.addWidget(self.info)
+        self.next_button = QPushButton("Sonraki")
+        self.next_button.clicked.connect(model.next_page)
+        layout.addWidget(self.next_button)
+        self.update_controls()
+
+    def add_choice(self, label, column, values):
+        """column = değer süzgeci ekler; "Tümü" süzmez"""
+        combo = QComboBox()
+        combo.addItem("Tümü", None)
+        for value in values:
+            combo.addItem(value, value)
+        combo.currentIndexChanged.connect(self.apply_filters)
+        self.filter_layout.addWidget(QLabel(f"{label}:"))
+        self.filter_layout.addWidget(combo)
+        self._filters.append(
+            lambda: [] if combo.currentData() is None else [(f'{column} = ?', [combo.currentData()])])
+        return combo
+
+    def add_date_range(self, label, column):
+        """İşaretlendiğinde column için başlangıç ve bitiş tarihi (ikisi de dahil) süzgeci ekler"""
+        check = QCheckBox(f"{label}:")
+        start, end = QDateEdit(), QDateEdit()
+        for edit, date in ((start, QDate.currentDate().addMonths(-1)), (end, QDate.currentDate())):
+            edit.setCalendarPopup(True)
+            edit.setDate(date)
+            edit.setEnabled(False)
+            edit.dateChanged.connect(self.apply_filters)
+            check.toggled.connect(edit.setEnabled)
+        check.toggled.connect(self.apply_filters)
+        for widget in (check, start, end):
+            self.filter_layout.addWidget(widget)
+        self._filters.append(lambda: [] if not check.isChecked() else [
+            (f'{column} >= ?', [start.date().toString("yyyy-MM-dd")]),
+            (f'{column} <= ?', [end.date().toString("yyyy-MM-dd")]),
+        ])
+        return check, start, end
+
+    def apply_filters(self):
+        self.model.set_filters([condition for make in self._filters for condition in make()])
+
+    def update_controls(self):
+        header = self.view.horizontalHeader()
+        indicator = (self.model.sort_column(), self.model.sort_order())
+        if (header.sortIndicatorSection(), header.sortIndicatorOrder()) != indicator:
+            header.setSortIndicator(*indicator)
+        self.previous_button.setEnabled(self.model.has_previous)
+        self.next_button.setEnabled(self.model.has_next)
+        self.info.setText(self.model.page_label())
@@ -0,0 +1,54 @@
+import sys
+from database import DatabaseManager
+
+# Sınırsız nesil sorguları için üst sınır
+_TUM_NESILLER = sys.maxsize
+
+def _generation_limit(max_generations):
+    return _TUM_NESILLER if max_generations is None else max_generations
+
+class PedigreeManager:
+    """hayvan_soy kapanış tablosu üzerinden soy ağacı sorguları.
+
+    Tablo hayvanlar tetikleyicileriyle güncel tutulur; sorgular ağacı
+    satır satır dolaşmak yerine tek bir indeks aralığı okur. nesil, en
+    kısa yoldaki kuşak sayısıdır (anne/baba 1, büyükanne/büyükbaba 2).
+    """
+
+    @staticmethod
+    def ancestors(hayvan_id, max_generations=None):
+        """Hayvanın atalarını yakından uzağa döndürür"""
+        return DatabaseManager.execute_query('''
+            SELECT h.id, h.kulak_kupesi, h.cinsiyet, s.nesil
+            FROM hayvan_soy s
+            JOIN hayvanlar h ON h.id = s.ata_id
+            WHERE s.torun_id = ? AND s.nesil BETWEEN 1 AND ?
+            ORDER BY s.nesil, h.id
+        ''', (hayvan_id, _generation_limit(max_generations)))
+
+    @staticmethod
+    def descendants(hayvan_id, max_generations=None):
+        """Hayvanın yavrularını ve torunlarını yakından uzağa döndürür"""
+        return DatabaseManager.execute_query('''
+            SELECT h.id, h.kulak_kupesi, h.cinsiyet, s.nesil
+            FROM hayvan_soy s
+            JOIN hayvanlar h ON h.id = s.torun_id
+            WHERE s.ata_id = ? AND s.nesil BETWEEN 1 AND ?
+            ORDER BY s.nesil, h.id
+        ''', (hayvan_id, _generation_limit(max_generations)))
+
+    @staticmethod
+    def common_ancestors(hayvan_1, hayvan_2, max_generations=None):
+        """İki hayvanın ortak atalarını en yakından başlayarak döndürür.
+
+        Hayvanlardan biri diğerinin atasıysa kendisi de (nesil 0 ile) döner.
+        """
+        limit = _generation_limit(max_generations)
+        return DatabaseManager.execute_query('''
+            SELECT h.id, h.kulak_kupesi, h.cinsiyet, a.nesil AS nesil_1, b.nesil AS nesil_2
+            FROM hayvan_soy a
+            JOIN hayvan_soy b ON b.ata_id = a.ata_id AND b.torun_id = ?
+            JOIN hayvanlar h ON h.id = a.ata_id
+            WHERE a.torun_id = ? AND a.nesil <= ? AND b.nesil <= ?
+            ORDER BY a.nesil + b.nesil, h.id
+        ''', (hayvan_2, hayvan_1, limit, limit))
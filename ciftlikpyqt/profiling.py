@@ -0,0 +1,205 @@
+import atexit
+import os
+import re
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from config import SORGU_PROFILI_ACIK, YAVAS_SORGU_ESIGI_MS, YAVAS_SORGU_DOSYASI
+
+# Histogram kova üst sınırları (milisaniye); sonuncusu sınırsız
+HISTOGRAM_KOVALARI = (1, 5, 10, 50, 100, 500, 1000, float('inf'))
+
+# Çağrı yeri aranırken atlanan altyapı dosyaları
+_ALTYAPI_DOSYALARI = {'database.py', 'profiling.py', 'async_query.py', 'cache.py',
+                      'contextlib.py', 'threading.py'}
+
+def normalize(query):
+    """Boşlukları sadeleştirerek aynı ifadenin farklı yazımlarını birleştirir"""
+    return re.sub(r'\s+', ' ', query).strip()
+
+def call_site():
+    """Sorguyu başlatan ilk uygulama çerçevesini 'dosya:satır (fonksiyon)' olarak döndürür"""
+    frame = sys._getframe(1)
+    while frame is not None:
+        filename = os.path.basename(frame.f_code.co_filename)
+        if filename not in _ALTYAPI_DOSYALARI:
+            return f"{filename}:{frame.f_lineno} ({frame.f_code.co_name})"
+        frame = frame.f_back
+    return '?'
+
+class _Measurement:
+    """measure() bloğunda döndürülen ölçüm; çağıran rows değerini doldurur"""
+    __slots__ = ('rows',)
+
+    def __init__(self):
+        self.rows = None
+
+class _StatementStats:
+    """Tek bir SQL ifadesi için biriken istatistikler"""
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.rows = 0
+        self.histogram = [0] * len(HISTOGRAM_KOVALARI)
+        self.call_sites = {}
+
+class QueryProfiler:
+    """SQL ifadelerinin süre histogramlarını, satır sayılarını ve çağrı yerlerini toplar.
+
+    Eşiği aşan ifadeler EXPLAIN QUERY PLAN çıktısıyla birlikte yavaş sorgu
+    dosyasına yazılır. Kapalıyken measure() yalnızca boş bir ölçüm döndürür.
+    """
+
+    def __init__(self, enabled=SORGU_PROFILI_ACIK, threshold_ms=YAVAS_SORGU_ESIGI_MS,
+                 log_path=YAVAS_SORGU_DOSYASI):
+        self.enabled = enabled
+        self.threshold_ms = threshold_ms
+        self.log_path = log_path
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._stats = {}
+        self._plans = {}
+
+    @contextmanager
+    def measure(self, conn, query, parameters=None):
+        """Blok süresini query için kaydeder"""
+        measurement = _Measurement()
+        if not self.enabled:
+            yield measurement
+            return
+        start = time.perf_counter()
+        failed = False
+        try:
+            yield measurement
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            self.record(conn, query, parameters, time.perf_counter() - start,
+                        measurement.rows, failed)
+
+    @contextmanager
+    def attributed_to(self, site):
+        """Bloktaki sorguları verilen çağrı yerine yazar (arka plan görevleri için)"""
+        previous = getattr(self._local, 'site', None)
+        self._local.site = site
+        try:
+            yield
+        finally:
+            self._local.site = previous
+
+    def current_site(self):
+        """Etkin çağrı yerini döndürür; arka plan görevlerinde gönderen yer kullanılır"""
+        return getattr(self._local, 'site', None) or call_site()
+
+    def record(self, conn, query, parameters, elapsed, rows=None, failed=False):
+        """Tamamlanan bir ifadenin süresini (saniye) ve satır sayısını kaydeder"""
+        if not self.enabled:
+            return
+        statement = normalize(query)
+        elapsed_ms = elapsed * 1000
+        site = self.current_site()
+        with self._lock:
+            stats = self._stats.get(statement)
+            if stats is None:
+                stats = self._stats[statement] = _StatementStats()
+            stats.count += 1
+            stats.errors += failed
+            stats.total += elapsed_ms
+            stats.max = max(stats.max, elapsed_ms)
+            stats.rows += rows or 0
+            for i, limit in enumerate(HISTOGRAM_KOVALARI):
+                if elapsed_ms <= limit:
+                    stats.histogram[i] += 1
+                    break
+            stats.call_sites[site] = stats.call_sites.get(site, 0) + 1
+        if elapsed_ms >= self.threshold_ms and not failed:
+            self._log_slow(conn, statement, query, parameters, elapsed_ms, rows, site)
+
+    def _query_plan(self, conn, statement, query, parameters):
+        """İfadenin sorgu planını bir kez çıkarıp saklar"""
+        with self._lock:
+            plan = self._plans.get(statement)
+        if plan is not None:
+            return plan
+        try:
+            cursor = conn.execute(f'EXPLAIN QUERY PLAN {query}', parameters or ())
+            rows = cursor.fetchall()
+            cursor.close()
+        except Exception as e:
+            return [f"(plan alınamadı: {str(e)})"]
+        depths = {0: -1}
+        plan = []
+        for node_id, parent, _, detail in rows:
+            depths[node_id] = depths.get(parent, -1) + 1
+            plan.append('  ' * depths[node_id] + detail)
+        with self._lock:
+            self._plans[statement] = plan
+        return plan
+
+    def _log_slow(self, conn, statement, query, parameters, elapsed_ms, rows, site):
+        plan = self._query_plan(conn, statement, query, parameters) if conn is not None else []
+        lines = [f"[{datetime.now().isoformat(timespec='seconds')}] {elapsed_ms:.1f} ms, "
+                 f"{rows if rows is not None else '?'} satır, {site}",
+                 f"  {statement}"]
+        lines.extend(f"    {step}" for step in plan)
+        try:
+            with open(self.log_path, 'a', encoding='utf-8') as f:
+                f.write('\n'.join(lines) + '\n')
+        except OSError as e:
+            print(f"Yavaş sorgu kaydı yazılamadı: {str(e)}")
+
+    def summary(self):
+        """İfade başına istatistikleri toplam süreye göre azalan sırada döndürür"""
+        with self._lock:
+            items = [(statement, stats) for statement, stats in self._stats.items()]
+            result = []
+            for statement, stats in items:
+                result.append({
+                    'query': statement,
+                    'count': stats.count,
+                    'errors': stats.errors,
+                    'total_ms': stats.total,
+                    'avg_ms': stats.total / stats.count,
+                    'max_ms': stats.max,
+                    'rows': stats.rows,
+                    'histogram': dict(zip(HISTOGRAM_KOVALARI, stats.histogram)),
+                    'call_sites': dict(stats.call_sites),
+                })
+        result.sort(key=lambda item: item['total_ms'], reverse=True)
+        return result
+
+    def report(self, limit=20, file=None):
+        """Özetin ilk limit ifadesini okunur biçimde yazdırır"""
+        summary = self.summary()
+        if not summary:
+            return
+        out = file or sys.stdout
+        print(f"Sorgu profili ({len(summary)} ifade):", file=out)
+        for item in summary[:limit]:
+            print(f"{item['total_ms']:10.1f} ms toplam  {item['count']:6d} çağrı  "
+                  f"ort. {item['avg_ms']:.2f} ms  en çok {item['max_ms']:.1f} ms  "
+                  f"{item['rows']} satır", file=out)
+            print(f"    {item['query'][:200]}", file=out)
+            histogram = '  '.join(f"<={'∞' if limit_ms == float('inf') else limit_ms}:{n}"
+                                  for limit_ms, n in item['histogram'].items() if n)
+            print(f"    {histogram}", file=out)
+            for site, n in sorted(item['call_sites'].items(), key=lambda s: -s[1])[:3]:
+                print(f"    {n:6d} x {site}", file=out)
+
+    def reset(self):
+        """Toplanan istatistikleri siler"""
+        with self._lock:
+            self._stats.clear()
+            self._plans.clear()
+
+# Uygulama genelinde paylaşılan profil toplayıcı
+profiler = QueryProfiler()
+
+if profiler.enabled:
+    atexit.register(profiler.report)
@@ -0,0 +1,131 @@
+# Ekranların okuduğu SQL sorguları. Qt'ye bağımlı değildir; ekranlar,
+# karşılaştırma betiği ve diğer araçlar aynı metni buradan kullanır.
+# Tablo sorguları WHERE/ORDER BY içermez; satır deltaları için
+# "WHERE x.id IN (...)", tablo sayfaları için keyset_page ile
+# sıralama ve sayfa koşulu eklenir.
+from datetime import timedelta
+from config import TABLO_SAYFA_BOYUTU, ASI_HATIRLATMA_SURESI
+
+def keyset_page(query, paging, cursor=None, limit=TABLO_SAYFA_BOYUTU, filters=(), backward=False,
+                inclusive=False):
+    """Tablo sorgusunun bir sayfasını anahtar kümesi sayfalamasıyla okuyan (sorgu, parametreler).
+
+    paging (takma ad, sıralama sütunu, azalan) üçlüsüdür; eşit değerler id
+    ile sıralanır. cursor bir satırın (sütun değeri, id) çiftidir; sayfa
+    OFFSET ile değil, indeksteki bu konumdan okunur. backward verilirse
+    cursor'dan geriye (ters sırayla) okunur; inclusive cursor'un kendi
+    satırını da sayfaya katar. filters (koşul, parametreler) çiftleridir ve
+    AND ile eklenir.
+    """
+    alias, column, descending = paging
+    if backward:
+        descending = not descending
+    direction = 'DESC' if descending else 'ASC'
+    op = ('<' if descending else '>') + ('=' if inclusive else '')
+    conditions = [condition for condition, _ in filters]
+    parameters = [value for _, values in filters for value in values]
+    if column == 'id':
+        order = f'ORDER BY {alias}.id {direction}'
+        if cursor is not None:
+            conditions.append(f'{alias}.id {op} ?')
+            parameters.append(cursor[1])
+    else:
+        order = f'ORDER BY {alias}.{column} {direction}, {alias}.id {direction}'
+        if cursor is not None:
+            conditions.append(f'({alias}.{column}, {alias}.id) {op} (?, ?)')
+            parameters.extend(cursor)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+    return f"{query} {where} {order} LIMIT ?", parameters + [limit]
+
+# Hayvan kayıt ekranı
+HAYVAN_TABLOSU = '''
+    SELECT h.*,
+        a.kulak_kupesi as anne_kupesi,
+        b.kulak_kupesi as baba_kupesi
+    FROM hayvanlar h
+    LEFT JOIN hayvanlar a ON h.anne_id = a.id
+    LEFT JOIN hayvanlar b ON h.baba_id = b.id
+'''
+HAYVAN_SAYFALAMA = ('h', 'id', False)
+
+# Tohumlama ekranı
+TOHUMLAMA_TABLOSU = '''
+    SELECT t.*, h.kulak_kupesi
+    FROM tohumlama t
+    JOIN hayvanlar h ON t.hayvan_id = h.id
+'''
+TOHUMLAMA_SIRASI = "ORDER BY t.tohumlama_tarihi DESC"
+TOHUMLAMA_SAYFALAMA = ('t', 'tohumlama_tarihi', True)
+
+# Gebelik ekranı
+GEBELIK_TABLOSU = '''
+    SELECT g.*, h.kulak_kupesi, t.tohumlama_tarihi
+    FROM gebelik g
+    JOIN hayvanlar h ON g.hayvan_id = h.id
+    JOIN tohumlama t ON g.tohumlama_id = t.id
+'''
+GEBELIK_SAYFALAMA = ('g', 'tespit_tarihi', True)
+BEKLEYEN_TOHUMLAMALAR = '''
+    SELECT t.id, t.tohumlama_tarihi, h.kulak_kupesi
+    FROM tohumlama t
+    JOIN hayvanlar h ON t.hayvan_id = h.id
+    WHERE t.basari_durumu = 'Beklemede'
+    AND NOT EXISTS (
+        SELECT 1 FROM gebelik g WHERE g.tohumlama_id = t.id
+    )
+'''
+
+# Sağlık ekranı
+SAGLIK_TABLOSU = '''
+    SELECT s.*, h.kulak_kupesi
+    FROM saglik s
+    JOIN hayvanlar h ON s.hayvan_id = h.id
+'''
+SAGLIK_SAYFALAMA = ('s', 'islem_tarihi', True)
+
+# Hayvan seçicilerin önerdiği hayvanlar (DatabaseManager.find_animals koşulu).
+# + işareti cinsiyet/durum indekslerini devre dışı bırakır; aksi halde
+# planlayıcı küpe indeksi yerine onları seçip sonucu ayrıca sıralayabilir.
+DISI_KOSULU = "+cinsiyet = 'Dişi'"
+ERKEK_KOSULU = "+cinsiyet = 'Erkek'"
+AKTIF_KOSULU = "+durum = 'Aktif'"
+
+# Anasayfa göstergeleri: ad -> (sorgu, çok satırlı mı). Tarihler kpi_parameters'tan
+# adlandırılmış parametrelerle verilir; her sorgu bir indeks aralığından okur.
+GOSTERGELER = {
+    'aktif_irklar': ('''
+        SELECT irk, COUNT(*) AS sayi FROM hayvanlar
+        WHERE durum = 'Aktif' GROUP BY irk ORDER BY sayi DESC
+    ''', True),
+    'acik_gebelikler': ("SELECT COUNT(*) FROM gebelik WHERE durum = 'Devam Ediyor'", False),
+    'haftalik_dogumlar': ('''
+        SELECT COUNT(*) FROM gebelik
+        WHERE durum = 'Devam Ediyor' AND tahmini_dogum_tarihi BETWEEN :hafta_basi AND :hafta_sonu
+    ''', False),
+    'yaklasan_asilar': ('''
+        SELECT COUNT(*) FROM saglik WHERE tekrar_tarihi BETWEEN :bugun AND :asi_siniri
+    ''', False),
+    'aylik_saglik_maliyeti': ('''
+        SELECT COALESCE(SUM(maliyet), 0) FROM saglik WHERE islem_tarihi BETWEEN :ay_basi AND :bugun
+    ''', False),
+}
+
+def kpi_parameters(today):
+    """Gösterge sorgularının today gününe göre tarih parametreleri"""
+    week_start = today - timedelta(days=today.weekday())
+    return {
+        'bugun': today.isoformat(),
+        'hafta_basi': week_start.isoformat(),
+        'hafta_sonu': (week_start + timedelta(days=6)).isoformat(),
+        'asi_siniri': (today + timedelta(days=ASI_HATIRLATMA_SURESI)).isoformat(),
+        'ay_basi': today.replace(day=1).isoformat(),
+    }
+
+# Ekranların açılışta çalıştırdığı sorgular; tablolar yalnızca ilk sayfayı okur
+EKRAN_SORGULARI = {
+    'hayvan_kayit.tablo': keyset_page(HAYVAN_TABLOSU, HAYVAN_SAYFALAMA),
+    'tohumlama.tablo': keyset_page(TOHUMLAMA_TABLOSU, TOHUMLAMA_SAYFALAMA),
+    'gebelik.tablo': keyset_page(GEBELIK_TABLOSU, GEBELIK_SAYFALAMA),
+    'gebelik.tohumlamalar': BEKLEYEN_TOHUMLAMALAR + TOHUMLAMA_SIRASI,
+    'saglik.tablo': keyset_page(SAGLIK_TABLOSU, SAGLIK_SAYFALAMA),
+}
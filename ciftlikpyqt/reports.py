@@ -2,13 +2,42 @@ import os
 import csv
 import sqlite3
 from datetime import datetime
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph
-from reportlab.lib.styles import getSampleStyleSheet
-from PyQt6.QtWidgets import QWidget
-from config import RAPOR_DIZINI, DATABASE_NAME
+from itertools import islice
+from config import RAPOR_DIZINI, DATABASE_NAME, PDF_TABLO_PARCA_BOYUTU
 from database import DatabaseManager
+from archive import needs_archive, source
+from farms import ALL_FARMS, use_farm, fan_out, merge_results
+
+class _StreamedFlowables(list):
+    """doc.build'in önünden tükettiği, boşaldıkça sonraki tablo parçasıyla dolan flowable listesi.
+
+    Platypus listeyi yalnızca baştan okur, siler ve bölünen parçaları başa
+    geri koyar; bu yüzden bellekte tüm rapor değil, yazılmakta olan parça
+    bulunur.
+    """
+
+    def __init__(self, flowables, chunks):
+        super().__init__(flowables)
+        self._chunks = chunks
+        # İlk parça baştan eklenir; başlık onunla aynı sayfada tutulabilsin
+        self._fill_next()
+
+    def _fill_next(self):
+        chunk = next(self._chunks, None)
+        if chunk is not None:
+            self.append(chunk)
+
+    def _fill(self):
+        if not list.__len__(self):
+            self._fill_next()
+
+    def __len__(self):
+        self._fill()
+        return list.__len__(self)
+
+    def __getitem__(self, index):
+        self._fill()
+        return list.__getitem__(self, index)
 
 class ReportGenerator:
     def __init__(self):
@@ -16,7 +45,7 @@ class ReportGenerator:
             os.makedirs(RAPOR_DIZINI)
     
     def generate_csv_report(self, data, headers, filename):
-        """CSV raporu oluşturur"""
+        """CSV raporu oluşturur; satırlar okundukça dosyaya yazılır"""
         csv_path = os.path.join(RAPOR_DIZINI, f"{filename}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv")
         with open(csv_path, 'w', newline='', encoding='utf-8') as f:
             writer = csv.writer(f)
@@ -26,6 +55,12 @@ class ReportGenerator:
     
     def generate_pdf_report(self, data, headers, title, filename):
         """PDF raporu oluşturur"""
+        # reportlab yalnızca PDF istendiğinde yüklenir; CSV raporları ve komut satırı onsuz açılır
+        from reportlab.lib import colors
+        from reportlab.lib.pagesizes import letter
+        from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph
+        from reportlab.lib.styles import getSampleStyleSheet
+        
         pdf_path = os.path.join(RAPOR_DIZINI, f"{filename}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf")
         doc = SimpleDocTemplate(pdf_path, pagesize=letter)
         elements = []
@@ -35,14 +70,9 @@ class ReportGenerator:
         title_style = styles['Heading1']
         elements.append(Paragraph(title, title_style))
         
-        # Tablo verilerini hazırla
-        table_data = [headers]
-        for row in data:
-            table_data.append([str(item) for item in row])
-        
-        # Tablo oluştur
-        table = Table(table_data)
-        table.setStyle(TableStyle([
+        # Tablo satırları okundukça PDF_TABLO_PARCA_BOYUTU satırlık parçalar halinde
+        # üretilir; her parça başlık satırıyla başlar ve sayfaya yazılınca bırakılır
+        style = TableStyle([
             ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
             ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
             ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
@@ -54,237 +84,135 @@ class ReportGenerator:
             ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
             ('FONTSIZE', (0, 1), (-1, -1), 12),
             ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
+        ])
         
-        elements.append(table)
-        doc.build(elements)
+        def tables():
+            rows = iter(data)
+            first = True
+            while True:
+                chunk = [[str(item) for item in row] for row in islice(rows, PDF_TABLO_PARCA_BOYUTU)]
+                # Kayıt yoksa yalnızca başlık satırı yazılır
+                if not chunk and not first:
+                    return
+                first = False
+                table = Table([headers] + chunk, repeatRows=1)
+                table.setStyle(style)
+                yield table
+        
+        doc.build(_StreamedFlowables(elements, tables()))
         return pdf_path
     
-    def hayvan_listesi_raporu(self, format='excel'):
+    def ciftlik_verisi(self, sorgu, ciftlik=None, key=None, reverse=False):
+        """Rapor satırlarını etkin, seçili ya da (ALL_FARMS) tüm çiftliklerden okur.
+
+        Tüm çiftliklerde sorgu paralel çalışır ve her satırın başına çiftlik
+        adı eklenir; key verilirse sıralı sonuçlar sıra bozulmadan birleşir.
+        """
+        if ciftlik is None:
+            return sorgu()
+        if ciftlik != ALL_FARMS:
+            with use_farm(ciftlik):
+                return list(sorgu())
+        sonuclar = fan_out(lambda: list(sorgu()))
+        return [(ad, *row) for ad, row in merge_results(sonuclar, key, reverse)]
+    
+    def ciftlik_basliklari(self, headers, ciftlik=None):
+        """Tüm çiftliklerin raporuna çiftlik sütununu ekler"""
+        return ['Çiftlik'] + headers if ciftlik == ALL_FARMS else headers
+    
+    def hayvan_listesi_verisi(self, ciftlik=None):
+        """Hayvan listesi raporunun başlıklarını ve satırlarını döndürür"""
+        def sorgu():
+            # Satılan/ölen hayvanlar arşive taşındıysa liste onları da içerir
+            arsivli = needs_archive('hayvanlar')
+            query = f'''
+                SELECT 
+                    h.kulak_kupesi,
+                    h.dogum_tarihi,
+                    h.cinsiyet,
+                    h.irk,
+                    h.durum,
+                    COALESCE(o.dogum_sayisi, 0) as dogum_sayisi,
+                    COALESCE(o.tohumlama_sayisi, 0) as tohumlama_sayisi
+                FROM {source('hayvanlar', arsivli)} h
+                LEFT JOIN {source('hayvan_ozet', arsivli)} o ON o.hayvan_id = h.id
+            '''
+            return DatabaseManager.iter_query(query)
+        data = self.ciftlik_verisi(sorgu, ciftlik)
+        
+        headers = self.ciftlik_basliklari(['Kulak Küpesi', 'Doğum Tarihi', 'Cinsiyet', 'Irk', 'Durum', 'Doğum Sayısı', 'Tohumlama Sayısı'], ciftlik)
+        return headers, data
+    
+    def hayvan_listesi_raporu(self, format='excel', ciftlik=None):
         """Hayvan listesi raporu oluşturur"""
-        query = '''
-            SELECT 
-                h.kulak_kupesi,
-                h.dogum_tarihi,
-                h.cinsiyet,
-                h.irk,
-                h.durum,
-                (SELECT COUNT(*) FROM dogum d WHERE d.anne_id = h.id) as dogum_sayisi,
-                (SELECT COUNT(*) FROM tohumlama t WHERE t.hayvan_id = h.id) as tohumlama_sayisi
-            FROM hayvanlar h
-        '''
-        data = DatabaseManager.execute_query(query)
-        
-        headers = ['Kulak Küpesi', 'Doğum Tarihi', 'Cinsiyet', 'Irk', 'Durum', 'Doğum Sayısı', 'Tohumlama Sayısı']
+        headers, data = self.hayvan_listesi_verisi(ciftlik)
         
         if format == 'excel':
             return self.generate_csv_report(data, headers, 'hayvan_listesi')
         else:
             return self.generate_pdf_report(data, headers, 'Hayvan Listesi Raporu', 'hayvan_listesi')
     
-    def saglik_raporu(self, baslangic_tarihi, bitis_tarihi, format='excel'):
+    def saglik_verisi(self, baslangic_tarihi, bitis_tarihi, ciftlik=None):
+        """Sağlık işlemleri raporunun başlıklarını ve satırlarını döndürür"""
+        def sorgu():
+            # Arşiv yalnızca tarih aralığı arşivdeki kayıtlara uzanıyorsa okunur
+            arsivli = needs_archive('saglik', since=baslangic_tarihi)
+            query = f'''
+                SELECT 
+                    h.kulak_kupesi,
+                    s.islem_tarihi,
+                    s.islem_turu,
+                    s.islem_adi,
+                    s.veteriner,
+                    s.ilac_bilgisi,
+                    s.maliyet
+                FROM {source('saglik', arsivli)} s
+                JOIN {source('hayvanlar', arsivli)} h ON s.hayvan_id = h.id
+                WHERE s.islem_tarihi BETWEEN ? AND ?
+                ORDER BY s.islem_tarihi DESC
+            '''
+            return DatabaseManager.iter_query(query, (baslangic_tarihi, bitis_tarihi))
+        # Çiftliklerin tarihe göre sıralı sonuçları sıra bozulmadan birleştirilir
+        data = self.ciftlik_verisi(sorgu, ciftlik, key=lambda row: row[1], reverse=True)
+        
+        headers = self.ciftlik_basliklari(['Kulak Küpesi', 'İşlem Tarihi', 'İşlem Türü', 'İşlem Adı', 'Veteriner', 'İlaç Bilgisi', 'Maliyet'], ciftlik)
+        return headers, data
+    
+    def saglik_raporu(self, baslangic_tarihi, bitis_tarihi, format='excel', ciftlik=None):
         """Sağlık işlemleri raporu oluşturur"""
-        query = '''
-            SELECT 
-                h.kulak_kupesi,
-                s.islem_tarihi,
-                s.islem_turu,
-                s.islem_adi,
-                s.veteriner,
-                s.ilac_bilgisi,
-                s.maliyet
-            FROM saglik s
-            JOIN hayvanlar h ON s.hayvan_id = h.id
-            WHERE s.islem_tarihi BETWEEN ? AND ?
-            ORDER BY s.islem_tarihi DESC
-        '''
-        data = DatabaseManager.execute_query(query, (baslangic_tarihi, bitis_tarihi))
-        
-        headers = ['Kulak Küpesi', 'İşlem Tarihi', 'İşlem Türü', 'İşlem Adı', 'Veteriner', 'İlaç Bilgisi', 'Maliyet']
+        headers, data = self.saglik_verisi(baslangic_tarihi, bitis_tarihi, ciftlik)
         
         if format == 'excel':
             return self.generate_csv_report(data, headers, 'saglik_raporu')
         else:
             return self.generate_pdf_report(data, headers, 'Sağlık İşlemleri Raporu', 'saglik_raporu')
     
-    def maliyet_raporu(self, baslangic_tarihi, bitis_tarihi, format='excel'):
+    def maliyet_verisi(self, baslangic_tarihi, bitis_tarihi, ciftlik=None):
+        """Maliyet raporunun başlıklarını ve satırlarını döndürür"""
+        def sorgu():
+            arsivli = needs_archive('saglik', since=baslangic_tarihi)
+            # Yem tüketimi henüz kaydedilmediğinden yem maliyeti sıfır gösterilir
+            query = f'''
+                SELECT 
+                    h.kulak_kupesi,
+                    COALESCE(SUM(s.maliyet), 0) as saglik_maliyeti,
+                    0 as yem_maliyeti,
+                    COALESCE(SUM(s.maliyet), 0) as toplam_maliyet
+                FROM {source('hayvanlar', arsivli)} h
+                LEFT JOIN {source('saglik', arsivli)} s ON h.id = s.hayvan_id AND s.islem_tarihi BETWEEN ? AND ?
+                GROUP BY h.id, h.kulak_kupesi
+            '''
+            return DatabaseManager.iter_query(query, (baslangic_tarihi, bitis_tarihi))
+        data = self.ciftlik_verisi(sorgu, ciftlik)
+        
+        headers = self.ciftlik_basliklari(['Kulak Küpesi', 'Sağlık Maliyeti', 'Yem Maliyeti', 'Toplam Maliyet'], ciftlik)
+        return headers, data
+    
+    def maliyet_raporu(self, baslangic_tarihi, bitis_tarihi, format='excel', ciftlik=None):
         """Maliyet raporu oluşturur"""
-        query = '''
-            SELECT 
-                h.kulak_kupesi,
-                COALESCE(SUM(s.maliyet), 0) as saglik_maliyeti,
-                COALESCE(SUM(y.maliyet), 0) as yem_maliyeti,
-                COALESCE(SUM(s.maliyet), 0) + COALESCE(SUM(y.maliyet), 0) as toplam_maliyet
-            FROM hayvanlar h
-            LEFT JOIN saglik s ON h.id = s.hayvan_id AND s.islem_tarihi BETWEEN ? AND ?
-            LEFT JOIN yem_tuketim y ON h.id = y.hayvan_id AND y.tarih BETWEEN ? AND ?
-            GROUP BY h.id, h.kulak_kupesi
-        '''
-        data = DatabaseManager.execute_query(query, (baslangic_tarihi, bitis_tarihi, baslangic_tarihi, bitis_tarihi))
-        
-        headers = ['Kulak Küpesi', 'Sağlık Maliyeti', 'Yem Maliyeti', 'Toplam Maliyet']
+        headers, data = self.maliyet_verisi(baslangic_tarihi, bitis_tarihi, ciftlik)
         
         if format == 'excel':
             return self.generate_csv_report(data, headers, 'maliyet_raporu')
         else:
             return self.generate_pdf_report(data, headers, 'Maliyet Raporu', 'maliyet_raporu')
-
-class RaporlarWidget(QWidget):
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.parent = parent
-        self.report_generator = ReportGenerator()
-        self.init_ui()
-    
-    def init_ui(self):
-        from PyQt6.QtWidgets import (QVBoxLayout, QHBoxLayout, QPushButton, 
-                                   QLabel, QComboBox, QDateEdit, QGroupBox,
-                                   QRadioButton, QMessageBox, QSpacerItem,
-                                   QSizePolicy)
-        from PyQt6.QtCore import Qt, QDate
-        from PyQt6.QtGui import QFont
-        
-        layout = QVBoxLayout()
-        
-        # Başlık
-        baslik = QLabel("Raporlar")
-        baslik.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        baslik.setFont(QFont('Arial', 20, QFont.Weight.Bold))
-        baslik.setStyleSheet("color: #2c3e50; margin: 20px;")
-        layout.addWidget(baslik)
-        
-        # Rapor tipleri için üst grup kutusu
-        rapor_tipleri_grup = QGroupBox("Rapor Tipi")
-        rapor_tipleri_layout = QVBoxLayout()
-        
-        # Rapor tipleri
-        self.rapor_tipi_combo = QComboBox()
-        self.rapor_tipi_combo.addItems([
-            "Hayvan Listesi", 
-            "Sağlık Raporu", 
-            "Maliyet Raporu"
-        ])
-        rapor_tipleri_layout.addWidget(self.rapor_tipi_combo)
-        
-        rapor_tipleri_grup.setLayout(rapor_tipleri_layout)
-        layout.addWidget(rapor_tipleri_grup)
-        
-        # Tarih aralığı grup kutusu
-        self.tarih_grup = QGroupBox("Tarih Aralığı")
-        tarih_layout = QHBoxLayout()
-        
-        # Başlangıç tarihi
-        baslangic_label = QLabel("Başlangıç:")
-        self.baslangic_date = QDateEdit()
-        self.baslangic_date.setDate(QDate.currentDate().addMonths(-1))
-        self.baslangic_date.setCalendarPopup(True)
-        
-        # Bitiş tarihi
-        bitis_label = QLabel("Bitiş:")
-        self.bitis_date = QDateEdit()
-        self.bitis_date.setDate(QDate.currentDate())
-        self.bitis_date.setCalendarPopup(True)
-        
-        tarih_layout.addWidget(baslangic_label)
-        tarih_layout.addWidget(self.baslangic_date)
-        tarih_layout.addWidget(bitis_label)
-        tarih_layout.addWidget(self.bitis_date)
-        
-        self.tarih_grup.setLayout(tarih_layout)
-        layout.addWidget(self.tarih_grup)
-        
-        # Format seçim grup kutusu
-        format_grup = QGroupBox("Rapor Formatı")
-        format_layout = QHBoxLayout()
-        
-        self.excel_radio = QRadioButton("Excel")
-        self.excel_radio.setChecked(True)
-        self.pdf_radio = QRadioButton("PDF")
-        
-        format_layout.addWidget(self.excel_radio)
-        format_layout.addWidget(self.pdf_radio)
-        
-        format_grup.setLayout(format_layout)
-        layout.addWidget(format_grup)
-        
-        # Butonlar
-        butonlar_layout = QHBoxLayout()
-        
-        geri_btn = QPushButton("Anasayfaya Dön")
-        geri_btn.clicked.connect(self.parent.anasayfaya_don)
-        
-        rapor_btn = QPushButton("Rapor Oluştur")
-        rapor_btn.clicked.connect(self.rapor_olustur)
-        
-        butonlar_layout.addWidget(geri_btn)
-        butonlar_layout.addWidget(rapor_btn)
-        
-        layout.addLayout(butonlar_layout)
-        
-        # Alt boşluk
-        layout.addSpacerItem(QSpacerItem(20, 40, QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Expanding))
-        
-        self.rapor_tipi_combo.currentIndexChanged.connect(self.rapor_tipi_degisti)
-        self.rapor_tipi_degisti()  # İlk durum ayarı
-        
-        self.setLayout(layout)
-    
-    def rapor_tipi_degisti(self):
-        rapor_tipi = self.rapor_tipi_combo.currentText()
-        
-        # Hayvan listesi raporu için tarihe gerek yok
-        if rapor_tipi == "Hayvan Listesi":
-            self.tarih_grup.setEnabled(False)
-        else:
-            self.tarih_grup.setEnabled(True)
-    
-    def rapor_olustur(self):
-        try:
-            from PyQt6.QtWidgets import QMessageBox
-            import os
-            
-            rapor_tipi = self.rapor_tipi_combo.currentText()
-            format_tipi = 'excel' if self.excel_radio.isChecked() else 'pdf'
-            
-            rapor_dosyasi = None
-            
-            if rapor_tipi == "Hayvan Listesi":
-                rapor_dosyasi = self.report_generator.hayvan_listesi_raporu(format=format_tipi)
-            else:
-                baslangic = self.baslangic_date.date().toString("yyyy-MM-dd")
-                bitis = self.bitis_date.date().toString("yyyy-MM-dd")
-                
-                if rapor_tipi == "Sağlık Raporu":
-                    rapor_dosyasi = self.report_generator.saglik_raporu(baslangic, bitis, format=format_tipi)
-                elif rapor_tipi == "Maliyet Raporu":
-                    rapor_dosyasi = self.report_generator.maliyet_raporu(baslangic, bitis, format=format_tipi)
-            
-            if rapor_dosyasi:
-                QMessageBox.information(
-                    self,
-                    "Rapor Oluşturuldu",
-                    f"Rapor başarıyla oluşturuldu:\n{rapor_dosyasi}",
-                    QMessageBox.StandardButton.Ok
-                )
-                # Dosyayı aç
-                if os.name == 'nt':  # Windows
-                    os.startfile(rapor_dosyasi)
-                elif os.name == 'posix':  # macOS ve Linux
-                    import subprocess
-                    subprocess.call(('open' if os.name == 'darwin' else 'xdg-open', rapor_dosyasi))
-            else:
-                QMessageBox.warning(
-                    self,
-                    "Hata",
-                    "Rapor oluşturulurken bir hata oluştu.",
-                    QMessageBox.StandardButton.Ok
-                )
-                
-        except Exception as e:
-            from PyQt6.QtWidgets import QMessageBox
-            QMessageBox.critical(
-                self,
-                "Hata",
-                f"Rapor oluşturulurken bir hata oluştu:\n{str(e)}",
-                QMessageBox.StandardButton.Ok
-            ) 
\ No newline at end of file
@@ -0,0 +1,371 @@
+import argparse
+import json
+import queue
+import re
+import secrets
+import sqlite3
+import threading
+from concurrent.futures import Future
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+from config import (SUNUCU_ADRESI, SUNUCU_PORTU, API_SAYFA_BOYUTU, API_EN_FAZLA_SAYFA, API_YAZMA_GRUBU,
+                    DB_BEKLEME_SURESI)
+from database import DatabaseManager, get_pool, set_pool
+from farms import active_farm, farm_pool
+from queries import HAYVAN_TABLOSU, TOHUMLAMA_TABLOSU, GEBELIK_TABLOSU, SAGLIK_TABLOSU
+
+class ApiError(Exception):
+    """İstemciye HTTP durum koduyla döndürülecek hata"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+class Resource:
+    """API'de sunulan bir tablo.
+
+    Okuma, ekranların kullandığı sorgunun (queries.py) üzerine id'ye göre
+    sayfalama ve eşitlik süzgeçleri eklenerek yapılır. Yazılabilir sütunlar
+    tablonun şemasından okunur; insert verilirse ekleme onunla yapılır.
+    """
+
+    def __init__(self, table, query, alias, filters=(), insert=None):
+        self.table = table
+        self.query = query
+        self.alias = alias
+        self.filters = filters
+        self.insert = insert
+        self._columns = None
+
+    def columns(self):
+        if self._columns is None:
+            rows = DatabaseManager.execute_query(f'PRAGMA table_info({self.table})') or []
+            self._columns = frozenset(row['name'] for row in rows if row['name'] != 'id')
+        return self._columns
+
+    def validate(self, data):
+        if not isinstance(data, dict) or not data:
+            raise ApiError(HTTPStatus.BAD_REQUEST, "Gövde boş olmayan bir JSON nesnesi olmalı")
+        unknown = sorted(set(data) - self.columns())
+        if unknown:
+            raise ApiError(HTTPStatus.BAD_REQUEST, f"Bilinmeyen sütunlar: {', '.join(unknown)}")
+        return data
+
+def _gebelik_ekle(tx, data):
+    """Gebelik ekranındaki gibi: hayvan tohumlamadan alınır, tohumlama başarılı sayılır"""
+    result = tx.execute_query('SELECT hayvan_id FROM tohumlama WHERE id = ?', (data.get('tohumlama_id'),))
+    if not result:
+        raise ApiError(HTTPStatus.BAD_REQUEST, "Tohumlama kaydı bulunamadı")
+    gebelik_id = tx.insert_data('gebelik', {**data, 'hayvan_id': result[0]['hayvan_id']})
+    tx.update_data('tohumlama', {'basari_durumu': 'Başarılı'}, {'id': data['tohumlama_id']})
+    return gebelik_id
+
+RESOURCES = {
+    'hayvanlar': Resource('hayvanlar', HAYVAN_TABLOSU, 'h', ('durum', 'cinsiyet', 'irk', 'anne_id', 'baba_id')),
+    'tohumlama': Resource('tohumlama', TOHUMLAMA_TABLOSU, 't', ('hayvan_id', 'basari_durumu')),
+    'gebelik': Resource('gebelik', GEBELIK_TABLOSU, 'g', ('hayvan_id', 'durum'), insert=_gebelik_ekle),
+    'saglik': Resource('saglik', SAGLIK_TABLOSU, 's', ('hayvan_id', 'islem_turu')),
+}
+
+def _report_data(name, params):
+    """Raporu ReportGenerator'ın veri metotlarıyla (başlıklar, satırlar) olarak üretir"""
+    # Raporlar (reportlab ile birlikte) yalnızca istendiğinde yüklenir
+    from reports import ReportGenerator
+    generator = ReportGenerator()
+    if name == 'hayvan-listesi':
+        return generator.hayvan_listesi_verisi()
+    baslangic, bitis = params.get('baslangic'), params.get('bitis')
+    if not baslangic or not bitis:
+        raise ApiError(HTTPStatus.BAD_REQUEST, "baslangic ve bitis tarihleri gerekli")
+    if name == 'saglik':
+        return generator.saglik_verisi(baslangic, bitis)
+    if name == 'maliyet':
+        return generator.maliyet_verisi(baslangic, bitis)
+    raise ApiError(HTTPStatus.NOT_FOUND, f"Bilinmeyen rapor: {name}")
+
+class WriteQueue:
+    """Tüm yazmaları tek bir iş parçacığında sırayla çalıştıran kuyruk.
+
+    İstek iş parçacıkları SQLite'ın yazma kilidi için yarışmaz. Kuyrukta
+    bekleyen işler (en fazla API_YAZMA_GRUBU) tek bir transaction içinde
+    kendi savepoint'lerinde çalışır ve birlikte commit edilir; hata veren
+    iş yalnızca kendi değişikliklerini geri alır. Sonuçlar commit'ten sonra
+    Future ile döner.
+    """
+
+    def __init__(self, group_size=API_YAZMA_GRUBU):
+        self.group_size = group_size
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name='api-yazici', daemon=True)
+        self._thread.start()
+
+    def submit(self, fn, *args):
+        """fn(tx, *args) çağrısını kuyruğa ekler ve Future döndürür"""
+        future = Future()
+        self._queue.put((future, fn, args))
+        return future
+
+    def close(self):
+        """Kuyruktaki işler bittikten sonra yazıcıyı durdurur"""
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            jobs = [self._queue.get()]
+            while jobs[-1] is not None and len(jobs) < self.group_size:
+                try:
+                    jobs.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = jobs[-1] is None
+            jobs = [job for job in jobs if job is not None and job[0].set_running_or_notify_cancel()]
+            if jobs:
+                self._run_group(jobs)
+            if stop:
+                return
+
+    def _run_group(self, jobs):
+        outcomes = []
+        try:
+            with DatabaseManager.transaction():
+                for future, fn, args in jobs:
+                    try:
+                        with DatabaseManager.transaction() as tx:
+                            outcomes.append((future, fn(tx, *args), None))
+                    except Exception as e:
+                        outcomes.append((future, None, e))
+        except Exception as e:
+            # Commit başarısızsa gruptaki hiçbir yazma kalıcı olmadı
+            print(f"Yazma grubu commit edilemedi: {str(e)}")
+            for future, _, _ in jobs:
+                future.set_exception(e)
+            return
+        for future, result, error in outcomes:
+            if error is None:
+                future.set_result(result)
+            else:
+                future.set_exception(error)
+
+class DataVersion:
+    """Veritabanındaki commit'leri PRAGMA data_version ile izler.
+
+    Değer ayrı bir bağlantıdan okunur; bu süreçteki ya da masaüstü
+    uygulamasındaki başka bir bağlantı commit ettiğinde değişir. Her
+    değişiklikte nesil artar; ETag, sunucunun açılış işaretiyle birlikte bu
+    nesilden üretilir. Okuma sorgudan önce yapıldığından, sorgu sırasında
+    gelen bir yazma en kötü ihtimalle bir sonraki istekte yeniden okumaya
+    yol açar, eski veriyi yeni ETag ile sunmaz.
+    """
+
+    def __init__(self, database):
+        self._conn = sqlite3.connect(database, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._token = secrets.token_hex(4)
+        self._last = None
+        self._generation = 0
+
+    def etag(self):
+        with self._lock:
+            value = self._conn.execute('PRAGMA data_version').fetchone()[0]
+            if value != self._last:
+                self._last = value
+                self._generation += 1
+            return f'"{self._token}-{self._generation}"'
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+def _int_param(params, name, default=None):
+    value = params.get(name)
+    if value is None:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise ApiError(HTTPStatus.BAD_REQUEST, f"{name} bir tamsayı olmalı") from None
+
+class ApiHandler(BaseHTTPRequestHandler):
+    """/api/<kaynak>[/<id>] ve /api/raporlar/<rapor> isteklerini karşılar"""
+
+    server_version = 'CiftlikAPI/1.0'
+    protocol_version = 'HTTP/1.1'
+    _PATH = re.compile(r'^/api/([\w-]+)(?:/([\w-]+))?/?$')
+
+    def do_GET(self):
+        self._handle(self._get)
+
+    def do_POST(self):
+        self._handle(self._post)
+
+    def do_PATCH(self):
+        self._handle(self._patch)
+
+    def _handle(self, method):
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+            if length < 0:
+                raise ValueError
+        except ValueError:
+            # Gövdenin nerede bittiği bilinmiyor; bağlantı kapatılmazsa sonraki isteğe karışır
+            self.close_connection = True
+            self._send_json(HTTPStatus.BAD_REQUEST, {'hata': "Geçersiz Content-Length"}, {'Connection': 'close'})
+            return
+        try:
+            # Gövde adres eşleşmeden önce okunur; kalıcı bağlantıda hata durumunda da sonraki isteğe karışmasın
+            self.body = self.rfile.read(length)
+            url = urlsplit(self.path)
+            match = self._PATH.match(url.path)
+            if not match:
+                raise ApiError(HTTPStatus.NOT_FOUND, "Bilinmeyen adres")
+            params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+            method(match.group(1), match.group(2), params)
+        except ApiError as e:
+            self._send_json(e.status, {'hata': str(e)})
+        except sqlite3.IntegrityError as e:
+            status = HTTPStatus.CONFLICT if str(e).startswith('UNIQUE') else HTTPStatus.BAD_REQUEST
+            self._send_json(status, {'hata': str(e)})
+        except Exception as e:
+            print(f"API hatası ({self.command} {self.path}): {str(e)}")
+            self._send_json(HTTPStatus.INTERNAL_SERVER_ERROR, {'hata': str(e)})
+
+    def _resource(self, name):
+        resource = RESOURCES.get(name)
+        if resource is None:
+            raise ApiError(HTTPStatus.NOT_FOUND, f"Bilinmeyen kaynak: {name}")
+        return resource
+
+    def _record_id(self, value):
+        if value is None or not value.isdigit():
+            raise ApiError(HTTPStatus.NOT_FOUND, "Kayıt id'si gerekli")
+        return int(value)
+
+    def _query(self, query, parameters=()):
+        rows = DatabaseManager.execute_query(query, parameters)
+        if rows is None:
+            raise ApiError(HTTPStatus.INTERNAL_SERVER_ERROR, "Sorgu çalıştırılamadı")
+        return rows
+
+    def _get(self, name, record, params):
+        # Veri değişmediyse sorgu çalıştırılmadan 304 döner
+        etag = self.server.version.etag()
+        if etag in (tag.strip() for tag in self.headers.get('If-None-Match', '').split(',')):
+            self._send(HTTPStatus.NOT_MODIFIED, b'', {'ETag': etag})
+            return
+        if name == 'raporlar':
+            headers, rows = _report_data(record, params)
+            body = {'basliklar': headers, 'satirlar': [list(row) for row in rows]}
+        elif record is not None:
+            body = self._fetch(self._resource(name), self._record_id(record))
+        else:
+            body = self._list(self._resource(name), params)
+        self._send_json(HTTPStatus.OK, body, {'ETag': etag, 'Cache-Control': 'no-cache'})
+
+    def _fetch(self, resource, record_id):
+        rows = self._query(f'{resource.query} WHERE {resource.alias}.id = ?', (record_id,))
+        if not rows:
+            raise ApiError(HTTPStatus.NOT_FOUND, "Kayıt bulunamadı")
+        return dict(rows[0])
+
+    def _list(self, resource, params):
+        """id'ye göre anahtar kümesi sayfalaması: ?sonra=<son id>&limit=<n>&<süzgeç>=<değer>"""
+        limit = min(max(_int_param(params, 'limit', API_SAYFA_BOYUTU), 1), API_EN_FAZLA_SAYFA)
+        conditions = [f'{resource.alias}.id > ?']
+        parameters = [_int_param(params, 'sonra', 0)]
+        for column in resource.filters:
+            if column in params:
+                conditions.append(f'{resource.alias}.{column} = ?')
+                parameters.append(params[column])
+        query = (f"{resource.query} WHERE {' AND '.join(conditions)} "
+                 f"ORDER BY {resource.alias}.id LIMIT ?")
+        # Bir fazla satır okunarak sonraki sayfanın varlığı anlaşılır
+        rows = [dict(row) for row in self._query(query, parameters + [limit + 1])]
+        more = len(rows) > limit
+        rows = rows[:limit]
+        return {'kayitlar': rows, 'sonraki': rows[-1]['id'] if more else None}
+
+    def _read_body(self, resource):
+        try:
+            data = json.loads(self.body or b'null')
+        except ValueError:
+            raise ApiError(HTTPStatus.BAD_REQUEST, "Gövde geçerli bir JSON değil") from None
+        return resource.validate(data)
+
+    def _write(self, fn, *args):
+        return self.server.writer.submit(fn, *args).result(timeout=DB_BEKLEME_SURESI)
+
+    def _post(self, name, record, params):
+        resource = self._resource(name)
+        if record is not None:
+            raise ApiError(HTTPStatus.METHOD_NOT_ALLOWED, "Kayıt eklemek için /api/<kaynak> kullanılır")
+        data = self._read_body(resource)
+        insert = resource.insert or (lambda tx, data: tx.insert_data(resource.table, data))
+        record_id = self._write(insert, data)
+        self._send_json(HTTPStatus.CREATED, self._fetch(resource, record_id),
+                        {'Location': f'/api/{name}/{record_id}'})
+
+    def _patch(self, name, record, params):
+        resource = self._resource(name)
+        record_id = self._record_id(record)
+        data = self._read_body(resource)
+        updated = self._write(lambda tx: tx.update_data(resource.table, data, {'id': record_id}))
+        if not updated:
+            raise ApiError(HTTPStatus.NOT_FOUND, "Kayıt bulunamadı")
+        self._send_json(HTTPStatus.OK, self._fetch(resource, record_id))
+
+    def _send_json(self, status, body, headers=None):
+        payload = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self._send(status, payload, {'Content-Type': 'application/json; charset=utf-8', **(headers or {})})
+
+    def _send(self, status, payload, headers):
+        self.send_response(status)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        if payload:
+            self.wfile.write(payload)
+
+class ApiServer(ThreadingHTTPServer):
+    """Etkin çiftliğin veritabanını HTTP/JSON olarak sunan sunucu.
+
+    Her istek kendi iş parçacığında çalışır ve okumalarını bağlantı
+    havuzundan yapar; yazmalar WriteQueue üzerinden sıraya girer.
+    """
+
+    daemon_threads = True
+    # Aynı anda bağlanan tabletler için bekleyen bağlantı kuyruğu (varsayılan 5)
+    request_queue_size = 64
+
+    def __init__(self, address=(SUNUCU_ADRESI, SUNUCU_PORTU)):
+        super().__init__(address, ApiHandler)
+        self.writer = WriteQueue()
+        self.version = DataVersion(get_pool().database)
+
+    def server_close(self):
+        super().server_close()
+        self.writer.close()
+        self.version.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Çiftlik verisini yerel HTTP/JSON API olarak sunar")
+    parser.add_argument('--adres', default=SUNUCU_ADRESI, help="dinlenecek adres")
+    parser.add_argument('--port', type=int, default=SUNUCU_PORTU, help="dinlenecek port")
+    parser.add_argument('--ciftlik', help="sunulacak çiftlik (varsayılan: etkin çiftlik)")
+    args = parser.parse_args()
+
+    # Masaüstü uygulamasının etkin çiftlik seçimi değiştirilmez
+    set_pool(farm_pool(args.ciftlik or active_farm()))
+    server = ApiServer((args.adres, args.port))
+    print(f"API http://{args.adres}:{server.server_address[1]}/api/ adresinde çalışıyor")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == '__main__':
+    main()
@@ -1,13 +1,28 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
-                             QLabel, QSpacerItem, QSizePolicy)
+                             QLabel, QSpacerItem, QSizePolicy, QFrame)
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QFont
+from kpi_cache import KpiCache
+from config import ASI_HATIRLATMA_SURESI
 
 class Anasayfa(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.parent = parent
+        self.gostergeler = KpiCache.instance()
         self.init_ui()
+        self.gostergeler.kpi_changed.connect(self.gosterge_guncelle)
+        for ad, deger in self.gostergeler.values.items():
+            self.gosterge_guncelle(ad, deger)
+    
+    def showEvent(self, event):
+        # Göstergeler yalnızca anasayfa görünürken yenilenir
+        super().showEvent(event)
+        self.gostergeler.watch()
+    
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.gostergeler.unwatch()
     
     def init_ui(self):
         layout = QVBoxLayout()
@@ -19,6 +34,42 @@ class Anasayfa(QWidget):
         baslik.setStyleSheet("color: #2c3e50; margin: 20px;")
         layout.addWidget(baslik)
         
+        # Gösterge kartları; değerler önbellekten gelir
+        kart_layout = QHBoxLayout()
+        kart_layout.setSpacing(15)
+        self.kartlar = {}
+        kartlar = [
+            ('aktif_irklar', "Aktif Hayvan"),
+            ('acik_gebelikler', "Devam Eden Gebelik"),
+            ('haftalik_dogumlar', "Bu Hafta Beklenen Doğum"),
+            ('yaklasan_asilar', f"{ASI_HATIRLATMA_SURESI} Gün İçinde Aşı"),
+            ('aylik_saglik_maliyeti', "Bu Ay Sağlık Gideri"),
+        ]
+        for ad, baslik_metni in kartlar:
+            kart = QFrame()
+            kart.setStyleSheet("QFrame { background-color: #ecf0f1; border-radius: 5px; }")
+            kart_ic = QVBoxLayout(kart)
+            
+            kart_basligi = QLabel(baslik_metni)
+            kart_basligi.setFont(QFont('Arial', 10))
+            kart_basligi.setStyleSheet("color: #7f8c8d;")
+            kart_ic.addWidget(kart_basligi)
+            
+            deger = QLabel("…")
+            deger.setFont(QFont('Arial', 20, QFont.Weight.Bold))
+            deger.setStyleSheet("color: #2c3e50;")
+            kart_ic.addWidget(deger)
+            
+            ayrinti = QLabel()
+            ayrinti.setFont(QFont('Arial', 9))
+            ayrinti.setStyleSheet("color: #7f8c8d;")
+            ayrinti.setWordWrap(True)
+            kart_ic.addWidget(ayrinti)
+            
+            self.kartlar[ad] = (deger, ayrinti)
+            kart_layout.addWidget(kart)
+        layout.addLayout(kart_layout)
+        
         # Buton container
         button_container = QVBoxLayout()
         button_container.setSpacing(20)
@@ -74,4 +125,15 @@ class Anasayfa(QWidget):
         # Alt boşluk
         layout.addSpacerItem(QSpacerItem(20, 40, QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Expanding))
         
-        self.setLayout(layout) 
\ No newline at end of file
+        self.setLayout(layout)
+    
+    def gosterge_guncelle(self, ad, deger):
+        """Önbellekte değişen göstergenin kartını günceller"""
+        etiket, ayrinti = self.kartlar[ad]
+        if ad == 'aktif_irklar':
+            etiket.setText(str(sum(sayi for _, sayi in deger)))
+            ayrinti.setText(", ".join(f"{irk}: {sayi}" for irk, sayi in deger))
+        elif ad == 'aylik_saglik_maliyeti':
+            etiket.setText(f"{deger:,.2f} TL")
+        else:
+            etiket.setText(str(deger)) 
\ No newline at end of file
@@ -0,0 +1,136 @@
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
+                             QPushButton, QTableWidget, QTableWidgetItem, QMessageBox)
+from PyQt6.QtCore import Qt
+from config import ARAMA_SAYFA_BOYUTU
+from database import DatabaseManager
+from async_query import AsyncQueryExecutor
+
+class Arama(QWidget):
+    # Sonucun açılacağı sayfa ve tabloda gösterilecek tür adı
+    TABLO_SAYFALARI = {'hayvanlar': 1, 'tohumlama': 2, 'gebelik': 3, 'saglik': 4}
+    TABLO_ADLARI = {'hayvanlar': 'Hayvan', 'tohumlama': 'Tohumlama', 'gebelik': 'Gebelik', 'saglik': 'Sağlık'}
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.parent = parent
+        self.executor = AsyncQueryExecutor.instance()
+        self.metin = ''
+        self.offset = 0
+        self.sonuclar = []
+        self.init_ui()
+    
+    def init_ui(self):
+        layout = QVBoxLayout()
+        
+        # Başlık
+        baslik = QLabel("Arama Sonuçları")
+        baslik.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        baslik.setStyleSheet("font-size: 24px; font-weight: bold; margin: 20px;")
+        layout.addWidget(baslik)
+        
+        self.bilgi = QLabel()
+        self.bilgi.setStyleSheet("color: #7f8c8d;")
+        layout.addWidget(self.bilgi)
+        
+        # Tablo
+        self.table = QTableWidget()
+        self.table.setColumnCount(4)
+        self.table.setHorizontalHeaderLabels(["Tür", "Hayvan", "Tarih", "Eşleşme"])
+        self.table.horizontalHeader().setStretchLastSection(True)
+        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        self.table.cellDoubleClicked.connect(self.kayda_git)
+        layout.addWidget(self.table)
+        
+        # Butonlar
+        button_layout = QHBoxLayout()
+        
+        self.onceki_btn = QPushButton("Önceki")
+        self.onceki_btn.clicked.connect(self.onceki_sayfa)
+        button_layout.addWidget(self.onceki_btn)
+        
+        self.sonraki_btn = QPushButton("Sonraki")
+        self.sonraki_btn.clicked.connect(self.sonraki_sayfa)
+        button_layout.addWidget(self.sonraki_btn)
+        
+        button_layout.addStretch()
+        
+        # Ana sayfaya dön butonu
+        don_btn = QPushButton("Ana Sayfaya Dön")
+        don_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #95a5a6;
+                color: white;
+                border: none;
+                border-radius: 5px;
+                padding: 10px;
+                min-width: 100px;
+            }
+            QPushButton:hover {
+                background-color: #7f8c8d;
+            }
+        """)
+        don_btn.clicked.connect(lambda: self.parent.sayfa_degistir(0))
+        button_layout.addWidget(don_btn)
+        
+        layout.addLayout(button_layout)
+        
+        self.onceki_btn.setEnabled(False)
+        self.sonraki_btn.setEnabled(False)
+        self.setLayout(layout)
+    
+    def ara(self, metin):
+        """Yeni bir arama başlatır ve ilk sayfayı yükler"""
+        self.metin = metin
+        self.offset = 0
+        self.sayfa_yukle()
+    
+    def sayfa_yukle(self):
+        """Geçerli sayfayı arka planda arar; bir fazla satır sonraki sayfa olup olmadığını gösterir"""
+        self.bilgi.setText("Aranıyor...")
+        self.executor.submit((id(self), 'arama'), DatabaseManager.search,
+                             self.metin, ARAMA_SAYFA_BOYUTU + 1, self.offset,
+                             on_result=self.sonuclari_goster, on_error=self.arama_hatasi)
+    
+    def sonuclari_goster(self, sonuclar):
+        """Arama sonuçlarını tabloya yazar ve sayfa butonlarını günceller"""
+        sonuclar = sonuclar or []
+        daha_var = len(sonuclar) > ARAMA_SAYFA_BOYUTU
+        self.sonuclar = sonuclar[:ARAMA_SAYFA_BOYUTU]
+        
+        self.table.setRowCount(len(self.sonuclar))
+        for i, row in enumerate(self.sonuclar):
+            self.table.setItem(i, 0, QTableWidgetItem(self.TABLO_ADLARI.get(row['tablo'], row['tablo'])))
+            self.table.setItem(i, 1, QTableWidgetItem(row['kulak_kupesi'] or ''))
+            self.table.setItem(i, 2, QTableWidgetItem(row['tarih'] or ''))
+            self.table.setItem(i, 3, QTableWidgetItem(row['ozet'] or ''))
+        
+        if self.sonuclar:
+            self.bilgi.setText(f"\"{self.metin}\" için {self.offset + 1}-{self.offset + len(self.sonuclar)}. "
+                               f"sonuçlar (çift tıklayarak kayda gidebilirsiniz)")
+        else:
+            self.bilgi.setText(f"\"{self.metin}\" için sonuç bulunamadı")
+        self.onceki_btn.setEnabled(self.offset > 0)
+        self.sonraki_btn.setEnabled(daha_var)
+    
+    def onceki_sayfa(self):
+        self.offset = max(0, self.offset - ARAMA_SAYFA_BOYUTU)
+        self.sayfa_yukle()
+    
+    def sonraki_sayfa(self):
+        self.offset += ARAMA_SAYFA_BOYUTU
+        self.sayfa_yukle()
+    
+    def kayda_git(self, satir, sutun):
+        """Seçilen sonucun ekranına geçer; kayıt okunmuşsa ya da okunduğunda seçilir"""
+        row = self.sonuclar[satir]
+        sayfa = self.TABLO_SAYFALARI.get(row['tablo'])
+        if sayfa is None:
+            return
+        self.parent.sayfa_degistir(sayfa)
+        ekran = self.parent.stacked_widget.widget(sayfa)
+        ekran.model.reveal(row['kayit_id'])
+    
+    def arama_hatasi(self, hata):
+        """Arka plan araması hata verirse kullanıcıyı bilgilendirir"""
+        QMessageBox.critical(self, "Hata", f"Arama yapılırken bir hata oluştu: {str(hata)}")
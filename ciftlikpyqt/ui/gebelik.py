@@ -1,16 +1,22 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
-                             QLineEdit, QPushButton, QTableWidget, QTableWidgetItem,
+                             QLineEdit, QPushButton, QTableView,
                              QMessageBox, QDateEdit, QComboBox, QFormLayout)
 from PyQt6.QtCore import Qt, QDate
 from database import DatabaseManager
+from async_query import AsyncQueryExecutor
+from queries import GEBELIK_TABLOSU, GEBELIK_SAYFALAMA, BEKLEYEN_TOHUMLAMALAR, TOHUMLAMA_SIRASI
+from event_bus import EventBus, id_placeholders, delta_applicable, apply_combo_delta
+from paged_model import PagedQueryModel, ListToolbar
 from datetime import datetime, timedelta
 
 class Gebelik(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.parent = parent
+        self.executor = AsyncQueryExecutor.instance()
         self.init_ui()
         self.load_data()
+        EventBus.instance().table_changed.connect(self.tablo_degisti)
     
     def init_ui(self):
         layout = QVBoxLayout()
@@ -89,13 +95,18 @@ class Gebelik(QWidget):
         
         layout.addLayout(button_layout)
         
-        # Tablo
-        self.table = QTableWidget()
-        self.table.setColumnCount(7)
-        self.table.setHorizontalHeaderLabels([
-            "ID", "Hayvan", "Tohumlama Tarihi", "Tespit Tarihi",
-            "Tahmini Doğum", "Durum", "Notlar"
-        ])
+        # Tablo; yalnızca görünen sayfa okunur, varsayılan sıra en yeniden eskiye
+        self.model = PagedQueryModel('gebelik', GEBELIK_TABLOSU, GEBELIK_SAYFALAMA, [
+            ("ID", 'id'), ("Hayvan", 'kulak_kupesi'), ("Tohumlama Tarihi", 'tohumlama_tarihi'),
+            ("Tespit Tarihi", 'tespit_tarihi'), ("Tahmini Doğum", 'tahmini_dogum_tarihi'),
+            ("Durum", 'durum'), ("Notlar", 'notlar')
+        ], sortable=('tahmini_dogum_tarihi',), parent=self)
+        self.model.load_failed.connect(self.yukleme_hatasi)
+        self.table = QTableView()
+        self.liste = ListToolbar(self.model, self.table)
+        self.liste.add_choice("Durum", 'g.durum', ["Devam Ediyor", "Doğum Yaptı"])
+        self.liste.add_date_range("Tespit", 'g.tespit_tarihi')
+        layout.addWidget(self.liste)
         layout.addWidget(self.table)
         
         self.setLayout(layout)
@@ -105,24 +116,19 @@ class Gebelik(QWidget):
     
     def load_tohumlama_kayitlari(self):
         """Beklemedeki tohumlama kayıtlarını combobox'a yükler"""
-        query = '''
-            SELECT t.id, t.tohumlama_tarihi, h.kulak_kupesi
-            FROM tohumlama t
-            JOIN hayvanlar h ON t.hayvan_id = h.id
-            WHERE t.basari_durumu = 'Beklemede'
-            AND NOT EXISTS (
-                SELECT 1 FROM gebelik g WHERE g.tohumlama_id = t.id
-            )
-            ORDER BY t.tohumlama_tarihi DESC
-        '''
-        tohumlamalar = DatabaseManager.execute_query(query)
-        
+        query = BEKLEYEN_TOHUMLAMALAR + TOHUMLAMA_SIRASI
+        self.executor.cached_query((id(self), 'tohumlamalar'), query, on_result=self.tohumlamalari_doldur)
+    
+    def tohumlamalari_doldur(self, tohumlamalar):
+        """Arka planda yüklenen tohumlama kayıtlarını combobox'a ekler"""
         self.tohumlama_input.clear()
-        for t in tohumlamalar:
-            self.tohumlama_input.addItem(
-                f"{t['kulak_kupesi']} - {t['tohumlama_tarihi']} (ID: {t['id']})",
-                t['id']
-            )
+        for t in tohumlamalar or []:
+            self.tohumlama_input.addItem(self.tohumlama_etiketi(t), t['id'])
+    
+    @staticmethod
+    def tohumlama_etiketi(t):
+        """Tohumlama listesinde gösterilecek metni üretir"""
+        return f"{t['kulak_kupesi']} - {t['tohumlama_tarihi']} (ID: {t['id']})"
     
     def hesapla_tahmini_dogum(self):
         """Tespit tarihine göre tahmini doğum tarihini hesaplar"""
@@ -138,39 +144,46 @@ class Gebelik(QWidget):
                 QMessageBox.warning(self, "Uyarı", "Lütfen bir tohumlama kaydı seçin!")
                 return
             
-            # Tohumlama kaydından hayvan ID'sini al
-            query = "SELECT hayvan_id FROM tohumlama WHERE id = ?"
-            result = DatabaseManager.execute_query(query, (tohumlama_id,))
+            # Okuma, ekleme ve güncelleme tek bağlantı ve tek commit ile yapılır
+            with DatabaseManager.transaction() as tx:
+                # Tohumlama kaydından hayvan ID'sini al
+                query = "SELECT hayvan_id FROM tohumlama WHERE id = ?"
+                result = tx.execute_query(query, (tohumlama_id,))
+                
+                # Kayıt yoksa uyarı, yazma kilidi bırakıldıktan sonra gösterilir
+                gebelik_id = None
+                if result:
+                    hayvan_id = result[0]['hayvan_id']
+                    
+                    # Form verilerini al
+                    data = {
+                        'hayvan_id': hayvan_id,
+                        'tohumlama_id': tohumlama_id,
+                        'tespit_tarihi': self.tespit_tarihi_input.date().toString("yyyy-MM-dd"),
+                        'tahmini_dogum_tarihi': self.tahmini_dogum_tarihi.text(),
+                        'durum': 'Devam Ediyor',
+                        'notlar': self.notlar_input.text()
+                    }
+                    
+                    # Veritabanına kaydet
+                    gebelik_id = tx.insert_data('gebelik', data)
+                    
+                    # Tohumlama kaydının durumunu güncelle
+                    tx.update_data(
+                        'tohumlama',
+                        {'basari_durumu': 'Başarılı'},
+                        {'id': tohumlama_id}
+                    )
+            
             if not result:
                 QMessageBox.warning(self, "Uyarı", "Tohumlama kaydı bulunamadı!")
                 return
             
-            hayvan_id = result[0]['hayvan_id']
-            
-            # Form verilerini al
-            data = {
-                'hayvan_id': hayvan_id,
-                'tohumlama_id': tohumlama_id,
-                'tespit_tarihi': self.tespit_tarihi_input.date().toString("yyyy-MM-dd"),
-                'tahmini_dogum_tarihi': self.tahmini_dogum_tarihi.text(),
-                'durum': 'Devam Ediyor',
-                'notlar': self.notlar_input.text()
-            }
-            
-            # Veritabanına kaydet
-            gebelik_id = DatabaseManager.insert_data('gebelik', data)
-            
             if gebelik_id:
-                # Tohumlama kaydının durumunu güncelle
-                DatabaseManager.update_data(
-                    'tohumlama',
-                    {'basari_durumu': 'Başarılı'},
-                    {'id': tohumlama_id}
-                )
-                
+                # Tablo ve tohumlama listesi, kaydın değişiklik olaylarıyla güncellenir;
+                # yeni satır yalnızca id'siyle okunup sıralı konumuna eklenir ve seçilir
+                self.model.reveal(gebelik_id)
                 QMessageBox.information(self, "Başarılı", "Gebelik kaydı başarıyla oluşturuldu!")
-                self.load_data()  # Tabloyu güncelle
-                self.load_tohumlama_kayitlari()  # Tohumlama listesini güncelle
                 self.temizle_form()  # Formu temizle
             else:
                 QMessageBox.critical(self, "Hata", "Kayıt oluşturulurken bir hata oluştu!")
@@ -179,29 +192,38 @@ class Gebelik(QWidget):
             QMessageBox.critical(self, "Hata", f"Bir hata oluştu: {str(e)}")
     
     def load_data(self):
-        """Mevcut gebelik kayıtlarını tabloya yükler"""
-        try:
-            query = '''
-                SELECT g.*, h.kulak_kupesi, t.tohumlama_tarihi
-                FROM gebelik g
-                JOIN hayvanlar h ON g.hayvan_id = h.id
-                JOIN tohumlama t ON g.tohumlama_id = t.id
-                ORDER BY g.tespit_tarihi DESC
-            '''
-            data = DatabaseManager.execute_query(query)
-            
-            self.table.setRowCount(len(data))
-            for i, row in enumerate(data):
-                self.table.setItem(i, 0, QTableWidgetItem(str(row['id'])))
-                self.table.setItem(i, 1, QTableWidgetItem(row['kulak_kupesi']))
-                self.table.setItem(i, 2, QTableWidgetItem(row['tohumlama_tarihi']))
-                self.table.setItem(i, 3, QTableWidgetItem(row['tespit_tarihi']))
-                self.table.setItem(i, 4, QTableWidgetItem(row['tahmini_dogum_tarihi']))
-                self.table.setItem(i, 5, QTableWidgetItem(row['durum']))
-                self.table.setItem(i, 6, QTableWidgetItem(row['notlar'] or ''))
-                
-        except Exception as e:
-            QMessageBox.critical(self, "Hata", f"Veriler yüklenirken bir hata oluştu: {str(e)}")
+        """Gebelik kayıtlarını ilk sayfadan yeniden okur"""
+        self.model.reload()
+    
+    def tablo_degisti(self, degisiklik):
+        """Tohumlama yazmalarını listeye satır düzeyinde uygular; tablo kendi modelince güncellenir"""
+        if degisiklik.table != 'tohumlama':
+            return
+        
+        # Commit'ten önce başlamış yükleme yeni satırları görmez; yeniden başlatılır
+        if not delta_applicable(degisiklik) or self.executor.is_pending((id(self), 'tohumlamalar')):
+            self.load_tohumlama_kayitlari()
+            return
+        
+        ids = list(degisiklik.ids)
+        self.executor.query((id(self), 'delta', degisiklik),
+                            BEKLEYEN_TOHUMLAMALAR + f"AND t.id IN ({id_placeholders(ids)})", ids,
+                            on_result=lambda rows: self.degisiklik_uygula(ids, rows))
+    
+    def degisiklik_uygula(self, ids, rows):
+        """Yeniden okunan tohumlamaları listeye uygular.
+        
+        Gebeliği kaydedilen tohumlama artık sorguya uymadığından listeden düşer.
+        """
+        if rows is None:
+            return
+        # Yeni kayıtlar en güncel tarihli olduğundan başa eklenir
+        if not self.executor.is_pending((id(self), 'tohumlamalar')):
+            apply_combo_delta(self.tohumlama_input, ids, rows, self.tohumlama_etiketi, prepend=True)
+    
+    def yukleme_hatasi(self, hata):
+        """Arka plan yüklemesi hata verirse kullanıcıyı bilgilendirir"""
+        QMessageBox.critical(self, "Hata", f"Veriler yüklenirken bir hata oluştu: {str(hata)}")
     
     def temizle_form(self):
         """Form alanlarını temizler"""
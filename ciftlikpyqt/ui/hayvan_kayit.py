@@ -1,13 +1,20 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
-                             QLineEdit, QPushButton, QTableWidget, QTableWidgetItem,
+                             QLineEdit, QPushButton, QTableView,
                              QMessageBox, QDateEdit, QComboBox, QFormLayout)
 from PyQt6.QtCore import Qt, QDate
 from database import DatabaseManager
+from async_query import AsyncQueryExecutor
+from queries import HAYVAN_TABLOSU, HAYVAN_SAYFALAMA, DISI_KOSULU, ERKEK_KOSULU
+from paged_model import PagedQueryModel, ListToolbar
+from animal_picker import AnimalPicker
+
+IRKLAR = ["Holstein", "Simental", "Montofon", "Jersey", "Diğer"]
 
 class HayvanKayit(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.parent = parent
+        self.executor = AsyncQueryExecutor.instance()
         self.init_ui()
         self.load_data()
     
@@ -40,19 +47,15 @@ class HayvanKayit(QWidget):
         
         # Irk
         self.irk_input = QComboBox()
-        self.irk_input.addItems(["Holstein", "Simental", "Montofon", "Jersey", "Diğer"])
+        self.irk_input.addItems(IRKLAR)
         form_layout.addRow("Irk:", self.irk_input)
         
-        # Anne ID
-        self.anne_id_input = QComboBox()
-        self.anne_id_input.setEditable(True)
-        self.load_anne_adaylari()
+        # Anne ID (isteğe bağlı)
+        self.anne_id_input = AnimalPicker(DISI_KOSULU)
         form_layout.addRow("Anne:", self.anne_id_input)
         
-        # Baba ID
-        self.baba_id_input = QComboBox()
-        self.baba_id_input.setEditable(True)
-        self.load_baba_adaylari()
+        # Baba ID (isteğe bağlı)
+        self.baba_id_input = AnimalPicker(ERKEK_KOSULU)
         form_layout.addRow("Baba:", self.baba_id_input)
         
         # Notlar
@@ -102,37 +105,23 @@ class HayvanKayit(QWidget):
         
         layout.addLayout(button_layout)
         
-        # Tablo
-        self.table = QTableWidget()
-        self.table.setColumnCount(8)
-        self.table.setHorizontalHeaderLabels([
-            "ID", "Kulak Küpesi", "Doğum Tarihi", "Cinsiyet", "Irk", 
-            "Anne ID", "Baba ID", "Notlar"
-        ])
+        # Tablo; yalnızca görünen sayfa okunur, sıralama ve süzgeçler veritabanında uygulanır
+        self.model = PagedQueryModel('hayvanlar', HAYVAN_TABLOSU, HAYVAN_SAYFALAMA, [
+            ("ID", 'id'), ("Kulak Küpesi", 'kulak_kupesi'), ("Doğum Tarihi", 'dogum_tarihi'),
+            ("Cinsiyet", 'cinsiyet'), ("Irk", 'irk'), ("Anne ID", 'anne_kupesi'),
+            ("Baba ID", 'baba_kupesi'), ("Notlar", 'notlar')
+        ], sortable=('kulak_kupesi', 'dogum_tarihi', 'cinsiyet', 'irk'), parent=self)
+        self.model.load_failed.connect(self.yukleme_hatasi)
+        self.table = QTableView()
+        self.liste = ListToolbar(self.model, self.table)
+        self.liste.add_choice("Irk", 'h.irk', IRKLAR)
+        self.liste.add_choice("Durum", 'h.durum', ["Aktif", "Satıldı", "Öldü"])
+        self.liste.add_date_range("Doğum", 'h.dogum_tarihi')
+        layout.addWidget(self.liste)
         layout.addWidget(self.table)
         
         self.setLayout(layout)
     
-    def load_anne_adaylari(self):
-        """Dişi hayvanları anne adayı olarak yükler"""
-        query = "SELECT id, kulak_kupesi FROM hayvanlar WHERE cinsiyet = 'Dişi'"
-        anneler = DatabaseManager.execute_query(query)
-        
-        self.anne_id_input.clear()
-        self.anne_id_input.addItem("", None)  # Boş seçenek
-        for anne in anneler:
-            self.anne_id_input.addItem(f"{anne['kulak_kupesi']} (ID: {anne['id']})", anne['id'])
-    
-    def load_baba_adaylari(self):
-        """Erkek hayvanları baba adayı olarak yükler"""
-        query = "SELECT id, kulak_kupesi FROM hayvanlar WHERE cinsiyet = 'Erkek'"
-        babalar = DatabaseManager.execute_query(query)
-        
-        self.baba_id_input.clear()
-        self.baba_id_input.addItem("", None)  # Boş seçenek
-        for baba in babalar:
-            self.baba_id_input.addItem(f"{baba['kulak_kupesi']} (ID: {baba['id']})", baba['id'])
-    
     def kaydet(self):
         """Yeni hayvan kaydı oluşturur"""
         try:
@@ -142,8 +131,8 @@ class HayvanKayit(QWidget):
                 'dogum_tarihi': self.dogum_tarihi_input.date().toString("yyyy-MM-dd"),
                 'cinsiyet': self.cinsiyet_input.currentText(),
                 'irk': self.irk_input.currentText(),
-                'anne_id': self.anne_id_input.currentData(),
-                'baba_id': self.baba_id_input.currentData(),
+                'anne_id': self.anne_id_input.selected_id(),
+                'baba_id': self.baba_id_input.selected_id(),
                 'notlar': self.notlar_input.text(),
                 'durum': 'Aktif'
             }
@@ -153,17 +142,22 @@ class HayvanKayit(QWidget):
                 QMessageBox.warning(self, "Uyarı", "Lütfen kulak küpesi numarasını girin!")
                 return
             
+            # Yazılan ama önerilerden seçilmeyen küpe kaydı sessizce ebeveynsiz bırakmasın
+            for secici, ad in ((self.anne_id_input, "Anne"), (self.baba_id_input, "Baba")):
+                if secici.text().strip() and secici.selected_id() is None:
+                    QMessageBox.warning(self, "Uyarı", f"{ad} küpesi bulunamadı; lütfen önerilerden seçin!")
+                    return
+            
             # Veritabanına kaydet
-            hayvan_id = DatabaseManager.insert_data('hayvanlar', data)
+            with DatabaseManager.transaction() as tx:
+                hayvan_id = tx.insert_data('hayvanlar', data)
             
             if hayvan_id:
+                # Tablo ve listeler, kaydın değişiklik olayıyla güncellenir;
+                # yeni satır yalnızca id'siyle okunup sıralı konumuna eklenir ve seçilir
+                self.model.reveal(hayvan_id)
                 QMessageBox.information(self, "Başarılı", "Hayvan kaydı başarıyla oluşturuldu!")
-                self.load_data()  # Tabloyu güncelle
                 self.temizle_form()  # Formu temizle
-                
-                # Anne/baba listelerini güncelle
-                self.load_anne_adaylari()
-                self.load_baba_adaylari()
             else:
                 QMessageBox.critical(self, "Hata", "Kayıt oluşturulurken bir hata oluştu!")
                 
@@ -171,31 +165,12 @@ class HayvanKayit(QWidget):
             QMessageBox.critical(self, "Hata", f"Bir hata oluştu: {str(e)}")
     
     def load_data(self):
-        """Mevcut hayvan kayıtlarını tabloya yükler"""
-        try:
-            query = '''
-                SELECT h.*, 
-                    a.kulak_kupesi as anne_kupesi,
-                    b.kulak_kupesi as baba_kupesi
-                FROM hayvanlar h
-                LEFT JOIN hayvanlar a ON h.anne_id = a.id
-                LEFT JOIN hayvanlar b ON h.baba_id = b.id
-            '''
-            data = DatabaseManager.execute_query(query)
-            
-            self.table.setRowCount(len(data))
-            for i, row in enumerate(data):
-                self.table.setItem(i, 0, QTableWidgetItem(str(row['id'])))
-                self.table.setItem(i, 1, QTableWidgetItem(row['kulak_kupesi']))
-                self.table.setItem(i, 2, QTableWidgetItem(row['dogum_tarihi']))
-                self.table.setItem(i, 3, QTableWidgetItem(row['cinsiyet']))
-                self.table.setItem(i, 4, QTableWidgetItem(row['irk']))
-                self.table.setItem(i, 5, QTableWidgetItem(row['anne_kupesi'] or ''))
-                self.table.setItem(i, 6, QTableWidgetItem(row['baba_kupesi'] or ''))
-                self.table.setItem(i, 7, QTableWidgetItem(row['notlar'] or ''))
-                
-        except Exception as e:
-            QMessageBox.critical(self, "Hata", f"Veriler yüklenirken bir hata oluştu: {str(e)}")
+        """Hayvan kayıtlarını ilk sayfadan yeniden okur"""
+        self.model.reload()
+    
+    def yukleme_hatasi(self, hata):
+        """Arka plan yüklemesi hata verirse kullanıcıyı bilgilendirir"""
+        QMessageBox.critical(self, "Hata", f"Veriler yüklenirken bir hata oluştu: {str(hata)}")
     
     def temizle_form(self):
         """Form alanlarını temizler"""
@@ -203,6 +178,6 @@ class HayvanKayit(QWidget):
         self.dogum_tarihi_input.setDate(QDate.currentDate())
         self.cinsiyet_input.setCurrentIndex(0)
         self.irk_input.setCurrentIndex(0)
-        self.anne_id_input.setCurrentIndex(0)
-        self.baba_id_input.setCurrentIndex(0)
+        self.anne_id_input.clear_selection()
+        self.baba_id_input.clear_selection()
         self.notlar_input.clear() 
\ No newline at end of file
@@ -0,0 +1,180 @@
+from PyQt6.QtWidgets import QWidget
+from reports import ReportGenerator
+from farms import ALL_FARMS, list_farms
+
+class RaporlarWidget(QWidget):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.parent = parent
+        self.report_generator = ReportGenerator()
+        self.init_ui()
+    
+    def init_ui(self):
+        from PyQt6.QtWidgets import (QVBoxLayout, QHBoxLayout, QPushButton, 
+                                   QLabel, QComboBox, QDateEdit, QGroupBox,
+                                   QRadioButton, QMessageBox, QSpacerItem,
+                                   QSizePolicy)
+        from PyQt6.QtCore import Qt, QDate
+        from PyQt6.QtGui import QFont
+        
+        layout = QVBoxLayout()
+        
+        # Başlık
+        baslik = QLabel("Raporlar")
+        baslik.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        baslik.setFont(QFont('Arial', 20, QFont.Weight.Bold))
+        baslik.setStyleSheet("color: #2c3e50; margin: 20px;")
+        layout.addWidget(baslik)
+        
+        # Rapor tipleri için üst grup kutusu
+        rapor_tipleri_grup = QGroupBox("Rapor Tipi")
+        rapor_tipleri_layout = QVBoxLayout()
+        
+        # Rapor tipleri
+        self.rapor_tipi_combo = QComboBox()
+        self.rapor_tipi_combo.addItems([
+            "Hayvan Listesi", 
+            "Sağlık Raporu", 
+            "Maliyet Raporu"
+        ])
+        rapor_tipleri_layout.addWidget(self.rapor_tipi_combo)
+        
+        rapor_tipleri_grup.setLayout(rapor_tipleri_layout)
+        layout.addWidget(rapor_tipleri_grup)
+        
+        # Çiftlik seçimi; yalnızca birden fazla çiftlik kayıtlıysa görünür
+        ciftlik_grup = QGroupBox("Çiftlik")
+        ciftlik_layout = QVBoxLayout()
+        self.ciftlik_combo = QComboBox()
+        self.ciftlik_combo.addItem("Etkin Çiftlik", None)
+        self.ciftlik_combo.addItem("Tüm Çiftlikler", ALL_FARMS)
+        ciftlikler = list_farms()
+        for ad in ciftlikler:
+            self.ciftlik_combo.addItem(ad, ad)
+        ciftlik_layout.addWidget(self.ciftlik_combo)
+        ciftlik_grup.setLayout(ciftlik_layout)
+        ciftlik_grup.setVisible(len(ciftlikler) > 1)
+        layout.addWidget(ciftlik_grup)
+        
+        # Tarih aralığı grup kutusu
+        self.tarih_grup = QGroupBox("Tarih Aralığı")
+        tarih_layout = QHBoxLayout()
+        
+        # Başlangıç tarihi
+        baslangic_label = QLabel("Başlangıç:")
+        self.baslangic_date = QDateEdit()
+        self.baslangic_date.setDate(QDate.currentDate().addMonths(-1))
+        self.baslangic_date.setCalendarPopup(True)
+        
+        # Bitiş tarihi
+        bitis_label = QLabel("Bitiş:")
+        self.bitis_date = QDateEdit()
+        self.bitis_date.setDate(QDate.currentDate())
+        self.bitis_date.setCalendarPopup(True)
+        
+        tarih_layout.addWidget(baslangic_label)
+        tarih_layout.addWidget(self.baslangic_date)
+        tarih_layout.addWidget(bitis_label)
+        tarih_layout.addWidget(self.bitis_date)
+        
+        self.tarih_grup.setLayout(tarih_layout)
+        layout.addWidget(self.tarih_grup)
+        
+        # Format seçim grup kutusu
+        format_grup = QGroupBox("Rapor Formatı")
+        format_layout = QHBoxLayout()
+        
+        self.excel_radio = QRadioButton("Excel")
+        self.excel_radio.setChecked(True)
+        self.pdf_radio = QRadioButton("PDF")
+        
+        format_layout.addWidget(self.excel_radio)
+        format_layout.addWidget(self.pdf_radio)
+        
+        format_grup.setLayout(format_layout)
+        layout.addWidget(format_grup)
+        
+        # Butonlar
+        butonlar_layout = QHBoxLayout()
+        
+        geri_btn = QPushButton("Anasayfaya Dön")
+        geri_btn.clicked.connect(self.parent.anasayfaya_don)
+        
+        rapor_btn = QPushButton("Rapor Oluştur")
+        rapor_btn.clicked.connect(self.rapor_olustur)
+        
+        butonlar_layout.addWidget(geri_btn)
+        butonlar_layout.addWidget(rapor_btn)
+        
+        layout.addLayout(butonlar_layout)
+        
+        # Alt boşluk
+        layout.addSpacerItem(QSpacerItem(20, 40, QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Expanding))
+        
+        self.rapor_tipi_combo.currentIndexChanged.connect(self.rapor_tipi_degisti)
+        self.rapor_tipi_degisti()  # İlk durum ayarı
+        
+        self.setLayout(layout)
+    
+    def rapor_tipi_degisti(self):
+        rapor_tipi = self.rapor_tipi_combo.currentText()
+        
+        # Hayvan listesi raporu için tarihe gerek yok
+        if rapor_tipi == "Hayvan Listesi":
+            self.tarih_grup.setEnabled(False)
+        else:
+            self.tarih_grup.setEnabled(True)
+    
+    def rapor_olustur(self):
+        try:
+            from PyQt6.QtWidgets import QMessageBox
+            import os
+            
+            rapor_tipi = self.rapor_tipi_combo.currentText()
+            format_tipi = 'excel' if self.excel_radio.isChecked() else 'pdf'
+            ciftlik = self.ciftlik_combo.currentData()
+            
+            rapor_dosyasi = None
+            
+            if rapor_tipi == "Hayvan Listesi":
+                rapor_dosyasi = self.report_generator.hayvan_listesi_raporu(format=format_tipi, ciftlik=ciftlik)
+            else:
+                baslangic = self.baslangic_date.date().toString("yyyy-MM-dd")
+                bitis = self.bitis_date.date().toString("yyyy-MM-dd")
+                
+                if rapor_tipi == "Sağlık Raporu":
+                    rapor_dosyasi = self.report_generator.saglik_raporu(baslangic, bitis, format=format_tipi,
+                                                                        ciftlik=ciftlik)
+                elif rapor_tipi == "Maliyet Raporu":
+                    rapor_dosyasi = self.report_generator.maliyet_raporu(baslangic, bitis, format=format_tipi,
+                                                                         ciftlik=ciftlik)
+            
+            if rapor_dosyasi:
+                QMessageBox.information(
+                    self,
+                    "Rapor Oluşturuldu",
+                    f"Rapor başarıyla oluşturuldu:\n{rapor_dosyasi}",
+                    QMessageBox.StandardButton.Ok
+                )
+                # Dosyayı aç
+                if os.name == 'nt':  # Windows
+                    os.startfile(rapor_dosyasi)
+                elif os.name == 'posix':  # macOS ve Linux
+                    import subprocess
+                    subprocess.call(('open' if os.name == 'darwin' else 'xdg-open', rapor_dosyasi))
+            else:
+                QMessageBox.warning(
+                    self,
+                    "Hata",
+                    "Rapor oluşturulurken bir hata oluştu.",
+                    QMessageBox.StandardButton.Ok
+                )
+                
+        except Exception as e:
+            from PyQt6.QtWidgets import QMessageBox
+            QMessageBox.critical(
+                self,
+                "Hata",
+                f"Rapor oluşturulurken bir hata oluştu:\n{str(e)}",
+                QMessageBox.StandardButton.Ok
+            ) 
\ No newline at end of file
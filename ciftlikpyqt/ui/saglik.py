@@ -1,14 +1,21 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
-                             QLineEdit, QPushButton, QTableWidget, QTableWidgetItem,
+                             QLineEdit, QPushButton, QTableView,
                              QMessageBox, QDateEdit, QComboBox, QFormLayout,
                              QSpinBox, QTextEdit)
 from PyQt6.QtCore import Qt, QDate
 from database import DatabaseManager
+from async_query import AsyncQueryExecutor
+from queries import SAGLIK_TABLOSU, SAGLIK_SAYFALAMA, AKTIF_KOSULU
+from paged_model import PagedQueryModel, ListToolbar
+from animal_picker import AnimalPicker
+
+ISLEM_TURLERI = ["Aşı", "Tedavi", "Kontrol", "Doğum Sonrası Bakım", "Parazit İlacı", "Vitamin", "Diğer"]
 
 class Saglik(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.parent = parent
+        self.executor = AsyncQueryExecutor.instance()
         self.init_ui()
         self.load_data()
     
@@ -25,8 +32,7 @@ class Saglik(QWidget):
         form_layout = QFormLayout()
         
         # Hayvan Seçimi
-        self.hayvan_input = QComboBox()
-        self.load_hayvanlar()
+        self.hayvan_input = AnimalPicker(AKTIF_KOSULU)
         form_layout.addRow("Hayvan:", self.hayvan_input)
         
         # İşlem Tarihi
@@ -37,10 +43,7 @@ class Saglik(QWidget):
         
         # İşlem Türü
         self.islem_turu_input = QComboBox()
-        self.islem_turu_input.addItems([
-            "Aşı", "Tedavi", "Kontrol", "Doğum Sonrası Bakım",
-            "Parazit İlacı", "Vitamin", "Diğer"
-        ])
+        self.islem_turu_input.addItems(ISLEM_TURLERI)
         form_layout.addRow("İşlem Türü:", self.islem_turu_input)
         
         # İşlem Adı
@@ -119,32 +122,29 @@ class Saglik(QWidget):
         
         layout.addLayout(button_layout)
         
-        # Tablo
-        self.table = QTableWidget()
-        self.table.setColumnCount(9)
-        self.table.setHorizontalHeaderLabels([
-            "ID", "Hayvan", "İşlem Tarihi", "İşlem Türü", "İşlem Adı",
-            "Veteriner", "İlaç", "Tekrar Tarihi", "Maliyet"
-        ])
+        # Tablo; yalnızca görünen sayfa okunur, varsayılan sıra en yeniden eskiye
+        self.model = PagedQueryModel('saglik', SAGLIK_TABLOSU, SAGLIK_SAYFALAMA, [
+            ("ID", 'id'), ("Hayvan", 'kulak_kupesi'), ("İşlem Tarihi", 'islem_tarihi'),
+            ("İşlem Türü", 'islem_turu'), ("İşlem Adı", 'islem_adi'), ("Veteriner", 'veteriner'),
+            ("İlaç", 'ilac_bilgisi'), ("Tekrar Tarihi", 'tekrar_tarihi'),
+            ("Maliyet", 'maliyet', lambda maliyet: f"{maliyet} TL" if maliyet else '')
+        ], sortable=('islem_turu',), parent=self)
+        self.model.load_failed.connect(self.yukleme_hatasi)
+        self.table = QTableView()
+        self.liste = ListToolbar(self.model, self.table)
+        self.liste.add_choice("İşlem Türü", 's.islem_turu', ISLEM_TURLERI)
+        self.liste.add_date_range("Tarih", 's.islem_tarihi')
+        layout.addWidget(self.liste)
         layout.addWidget(self.table)
         
         self.setLayout(layout)
     
-    def load_hayvanlar(self):
-        """Aktif hayvanları combobox'a yükler"""
-        query = "SELECT id, kulak_kupesi FROM hayvanlar WHERE durum = 'Aktif'"
-        hayvanlar = DatabaseManager.execute_query(query)
-        
-        self.hayvan_input.clear()
-        for hayvan in hayvanlar:
-            self.hayvan_input.addItem(f"{hayvan['kulak_kupesi']} (ID: {hayvan['id']})", hayvan['id'])
-    
     def kaydet(self):
         """Yeni sağlık kaydı oluşturur"""
         try:
             # Form verilerini al
             data = {
-                'hayvan_id': self.hayvan_input.currentData(),
+                'hayvan_id': self.hayvan_input.selected_id(),
                 'islem_tarihi': self.tarih_input.date().toString("yyyy-MM-dd"),
                 'islem_turu': self.islem_turu_input.currentText(),
                 'islem_adi': self.islem_adi_input.text(),
@@ -166,11 +166,14 @@ class Saglik(QWidget):
                 return
             
             # Veritabanına kaydet
-            saglik_id = DatabaseManager.insert_data('saglik', data)
+            with DatabaseManager.transaction() as tx:
+                saglik_id = tx.insert_data('saglik', data)
             
             if saglik_id:
+                # Tablo, kaydın değişiklik olayıyla güncellenir;
+                # yeni satır yalnızca id'siyle okunup sıralı konumuna eklenir ve seçilir
+                self.model.reveal(saglik_id)
                 QMessageBox.information(self, "Başarılı", "Sağlık kaydı başarıyla oluşturuldu!")
-                self.load_data()  # Tabloyu güncelle
                 self.temizle_form()  # Formu temizle
             else:
                 QMessageBox.critical(self, "Hata", "Kayıt oluşturulurken bir hata oluştu!")
@@ -179,30 +182,12 @@ class Saglik(QWidget):
             QMessageBox.critical(self, "Hata", f"Bir hata oluştu: {str(e)}")
     
     def load_data(self):
-        """Mevcut sağlık kayıtlarını tabloya yükler"""
-        try:
-            query = '''
-                SELECT s.*, h.kulak_kupesi
-                FROM saglik s
-                JOIN hayvanlar h ON s.hayvan_id = h.id
-                ORDER BY s.islem_tarihi DESC
-            '''
-            data = DatabaseManager.execute_query(query)
-            
-            self.table.setRowCount(len(data))
-            for i, row in enumerate(data):
-                self.table.setItem(i, 0, QTableWidgetItem(str(row['id'])))
-                self.table.setItem(i, 1, QTableWidgetItem(row['kulak_kupesi']))
-                self.table.setItem(i, 2, QTableWidgetItem(row['islem_tarihi']))
-                self.table.setItem(i, 3, QTableWidgetItem(row['islem_turu']))
-                self.table.setItem(i, 4, QTableWidgetItem(row['islem_adi']))
-                self.table.setItem(i, 5, QTableWidgetItem(row['veteriner'] or ''))
-                self.table.setItem(i, 6, QTableWidgetItem(row['ilac_bilgisi'] or ''))
-                self.table.setItem(i, 7, QTableWidgetItem(row['tekrar_tarihi'] or ''))
-                self.table.setItem(i, 8, QTableWidgetItem(f"{row['maliyet']} TL" if row['maliyet'] else ''))
-                
-        except Exception as e:
-            QMessageBox.critical(self, "Hata", f"Veriler yüklenirken bir hata oluştu: {str(e)}")
+        """Sağlık kayıtlarını ilk sayfadan yeniden okur"""
+        self.model.reload()
+    
+    def yukleme_hatasi(self, hata):
+        """Arka plan yüklemesi hata verirse kullanıcıyı bilgilendirir"""
+        QMessageBox.critical(self, "Hata", f"Veriler yüklenirken bir hata oluştu: {str(hata)}")
     
     def temizle_form(self):
         """Form alanlarını temizler"""
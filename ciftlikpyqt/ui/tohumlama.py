@@ -1,15 +1,25 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
-                             QLineEdit, QPushButton, QTableWidget, QTableWidgetItem,
+                             QLineEdit, QPushButton, QTableView,
                              QMessageBox, QDateEdit, QComboBox, QFormLayout)
-from PyQt6.QtCore import Qt, QDate
+from PyQt6.QtCore import Qt, QDate, QTimer
 from database import DatabaseManager
+from config import AKRABALIK_UYARI_ESIGI
+from inbreeding import get_engine
+from async_query import AsyncQueryExecutor
+from queries import TOHUMLAMA_TABLOSU, TOHUMLAMA_SAYFALAMA, DISI_KOSULU
+from event_bus import EventBus
+from paged_model import PagedQueryModel, ListToolbar
+from animal_picker import AnimalPicker
 
 class Tohumlama(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.parent = parent
+        self.executor = AsyncQueryExecutor.instance()
+        self.aday_katsayilari = {}  # boğa küpesi -> olası yavrunun akrabalık katsayısı
         self.init_ui()
         self.load_data()
+        EventBus.instance().table_changed.connect(self.tablo_degisti)
     
     def init_ui(self):
         layout = QVBoxLayout()
@@ -24,8 +34,7 @@ class Tohumlama(QWidget):
         form_layout = QFormLayout()
         
         # Hayvan Seçimi
-        self.hayvan_input = QComboBox()
-        self.load_hayvanlar()
+        self.hayvan_input = AnimalPicker(DISI_KOSULU)
         form_layout.addRow("Hayvan:", self.hayvan_input)
         
         # Tohumlama Tarihi
@@ -36,8 +45,17 @@ class Tohumlama(QWidget):
         
         # Boğa Bilgisi
         self.boga_input = QLineEdit()
+        self.boga_input.textChanged.connect(self.akrabalik_goster)
         form_layout.addRow("Boğa Bilgisi:", self.boga_input)
         
+        # Sürüdeki boğalar, olası yavrunun akrabalığı en düşük olandan başlayarak
+        self.boga_adaylari = QComboBox()
+        self.boga_adaylari.activated.connect(self.boga_sec)
+        form_layout.addRow("Boğa Önerileri:", self.boga_adaylari)
+        
+        self.akrabalik_label = QLabel("-")
+        form_layout.addRow("Yavru Akrabalık Katsayısı:", self.akrabalik_label)
+        
         # Yöntem
         self.yontem_input = QComboBox()
         self.yontem_input.addItems(["Suni Tohumlama", "Doğal Aşım"])
@@ -94,32 +112,65 @@ class Tohumlama(QWidget):
         
         layout.addLayout(button_layout)
         
-        # Tablo
-        self.table = QTableWidget()
-        self.table.setColumnCount(7)
-        self.table.setHorizontalHeaderLabels([
-            "ID", "Hayvan", "Tohumlama Tarihi", "Boğa Bilgisi",
-            "Yöntem", "Veteriner", "Başarı Durumu"
-        ])
+        # Tablo; yalnızca görünen sayfa okunur, varsayılan sıra en yeniden eskiye
+        self.model = PagedQueryModel('tohumlama', TOHUMLAMA_TABLOSU, TOHUMLAMA_SAYFALAMA, [
+            ("ID", 'id'), ("Hayvan", 'kulak_kupesi'), ("Tohumlama Tarihi", 'tohumlama_tarihi'),
+            ("Boğa Bilgisi", 'boga_bilgisi'), ("Yöntem", 'yontem'), ("Veteriner", 'veteriner'),
+            ("Başarı Durumu", 'basari_durumu')
+        ], parent=self)
+        self.model.load_failed.connect(self.yukleme_hatasi)
+        self.table = QTableView()
+        self.liste = ListToolbar(self.model, self.table)
+        self.liste.add_choice("Başarı Durumu", 't.basari_durumu', ["Beklemede", "Başarılı", "Başarısız"])
+        self.liste.add_date_range("Tarih", 't.tohumlama_tarihi')
+        layout.addWidget(self.liste)
         layout.addWidget(self.table)
         
         self.setLayout(layout)
+        self.hayvan_input.selection_changed.connect(self.adaylari_yukle)
+    
+    def adaylari_yukle(self):
+        """Seçili inek için sürüdeki boğaları arka planda akrabalığa göre sıralar"""
+        anne_id = self.hayvan_input.selected_id()
+        self.adaylari_doldur([])
+        if anne_id is None:
+            self.executor.cancel((id(self), 'boga_adaylari'))
+            return
+        self.executor.submit((id(self), 'boga_adaylari'), get_engine().rank_sires, anne_id,
+                             on_result=self.adaylari_doldur)
     
-    def load_hayvanlar(self):
-        """Dişi hayvanları combobox'a yükler"""
-        query = "SELECT id, kulak_kupesi FROM hayvanlar WHERE cinsiyet = 'Dişi'"
-        hayvanlar = DatabaseManager.execute_query(query)
-        
-        self.hayvan_input.clear()
-        for hayvan in hayvanlar:
-            self.hayvan_input.addItem(f"{hayvan['kulak_kupesi']} (ID: {hayvan['id']})", hayvan['id'])
+    def adaylari_doldur(self, adaylar):
+        """Sıralanan boğaları öneri listesine ekler"""
+        self.boga_adaylari.clear()
+        self.aday_katsayilari = {}
+        for aday in adaylar or []:
+            self.aday_katsayilari[aday['kulak_kupesi']] = aday['akrabalik']
+            self.boga_adaylari.addItem(f"{aday['kulak_kupesi']} (F: {aday['akrabalik']:.2%})",
+                                       aday['kulak_kupesi'])
+        self.boga_adaylari.setCurrentIndex(-1)
+        self.akrabalik_goster()
+    
+    def boga_sec(self, index):
+        """Önerilen boğayı boğa bilgisi alanına yazar"""
+        self.boga_input.setText(self.boga_adaylari.itemData(index))
+    
+    def akrabalik_goster(self):
+        """Girilen boğa sürüdeyse olası yavrunun akrabalık katsayısını gösterir"""
+        katsayi = self.aday_katsayilari.get(self.boga_input.text().strip())
+        if katsayi is None:
+            self.akrabalik_label.setText("-")
+            self.akrabalik_label.setStyleSheet("")
+            return
+        self.akrabalik_label.setText(f"{katsayi:.2%}")
+        renk = "#e74c3c" if katsayi > AKRABALIK_UYARI_ESIGI else "#27ae60"
+        self.akrabalik_label.setStyleSheet(f"color: {renk}; font-weight: bold;")
     
     def kaydet(self):
         """Yeni tohumlama kaydı oluşturur"""
         try:
             # Form verilerini al
             data = {
-                'hayvan_id': self.hayvan_input.currentData(),
+                'hayvan_id': self.hayvan_input.selected_id(),
                 'tohumlama_tarihi': self.tarih_input.date().toString("yyyy-MM-dd"),
                 'boga_bilgisi': self.boga_input.text(),
                 'yontem': self.yontem_input.currentText(),
@@ -138,11 +189,14 @@ class Tohumlama(QWidget):
                 return
             
             # Veritabanına kaydet
-            tohumlama_id = DatabaseManager.insert_data('tohumlama', data)
+            with DatabaseManager.transaction() as tx:
+                tohumlama_id = tx.insert_data('tohumlama', data)
             
             if tohumlama_id:
+                # Tablo, kaydın değişiklik olayıyla güncellenir;
+                # yeni satır yalnızca id'siyle okunup sıralı konumuna eklenir ve seçilir
+                self.model.reveal(tohumlama_id)
                 QMessageBox.information(self, "Başarılı", "Tohumlama kaydı başarıyla oluşturuldu!")
-                self.load_data()  # Tabloyu güncelle
                 self.temizle_form()  # Formu temizle
             else:
                 QMessageBox.critical(self, "Hata", "Kayıt oluşturulurken bir hata oluştu!")
@@ -151,28 +205,19 @@ class Tohumlama(QWidget):
             QMessageBox.critical(self, "Hata", f"Bir hata oluştu: {str(e)}")
     
     def load_data(self):
-        """Mevcut tohumlama kayıtlarını tabloya yükler"""
-        try:
-            query = '''
-                SELECT t.*, h.kulak_kupesi
-                FROM tohumlama t
-                JOIN hayvanlar h ON t.hayvan_id = h.id
-                ORDER BY t.tohumlama_tarihi DESC
-            '''
-            data = DatabaseManager.execute_query(query)
-            
-            self.table.setRowCount(len(data))
-            for i, row in enumerate(data):
-                self.table.setItem(i, 0, QTableWidgetItem(str(row['id'])))
-                self.table.setItem(i, 1, QTableWidgetItem(row['kulak_kupesi']))
-                self.table.setItem(i, 2, QTableWidgetItem(row['tohumlama_tarihi']))
-                self.table.setItem(i, 3, QTableWidgetItem(row['boga_bilgisi']))
-                self.table.setItem(i, 4, QTableWidgetItem(row['yontem']))
-                self.table.setItem(i, 5, QTableWidgetItem(row['veteriner'] or ''))
-                self.table.setItem(i, 6, QTableWidgetItem(row['basari_durumu']))
-                
-        except Exception as e:
-            QMessageBox.critical(self, "Hata", f"Veriler yüklenirken bir hata oluştu: {str(e)}")
+        """Tohumlama kayıtlarını ilk sayfadan yeniden okur"""
+        self.model.reload()
+    
+    def tablo_degisti(self, degisiklik):
+        """Soy ağacı değişince boğa önerilerini yeniler; tablo kendi modelince güncellenir"""
+        if degisiklik.table != 'hayvanlar':
+            return
+        # Sıralama diğer dinleyiciler (akrabalık motoru) çalıştıktan sonra yenilenir
+        QTimer.singleShot(0, self.adaylari_yukle)
+    
+    def yukleme_hatasi(self, hata):
+        """Arka plan yüklemesi hata verirse kullanıcıyı bilgilendirir"""
+        QMessageBox.critical(self, "Hata", f"Veriler yüklenirken bir hata oluştu: {str(hata)}")
     
     def temizle_form(self):
         """Form alanlarını temizler"""